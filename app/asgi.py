@@ -9,14 +9,12 @@ if TYPE_CHECKING:
 def create_app() -> Litestar:
     """Create ASGI application."""
 
-    from pathlib import Path
     from uuid import UUID
 
     from litestar import Litestar
     from litestar.di import Provide
     from litestar.plugins.flash import FlashConfig, FlashPlugin
     from litestar.plugins.sqlalchemy import SQLAlchemyPlugin
-    from litestar.stores.file import FileStore
     from litestar_granian import GranianPlugin
     from litestar_vite import VitePlugin
     from litestar_vite.inertia import InertiaPlugin
@@ -24,18 +22,36 @@ def create_app() -> Litestar:
     from app import config, deps, schemas, services
     from app.cli import CommandLinePlugin
     from app.controllers.access import AccessController, RegistrationController
+    from app.controllers.contacts import ContactController
+    from app.controllers.health import HealthController
+    from app.controllers.organizations import OrganizationController
     from app.controllers.profile import ProfileController
+    from app.controllers.reports import ReportController
     from app.controllers.site import SiteController
+    from app.controllers.system import SystemController
     from app.controllers.users import UserController
-    from config import get_settings
+    from config import crypt, get_settings
     from database import models as m
 
     settings = get_settings()
+    session_store = settings.session.get_store()
 
     return Litestar(
-        route_handlers=[AccessController, RegistrationController, ProfileController, UserController, SiteController],
+        route_handlers=[
+            AccessController,
+            RegistrationController,
+            ProfileController,
+            UserController,
+            ContactController,
+            HealthController,
+            OrganizationController,
+            ReportController,
+            SiteController,
+            SystemController,
+        ],
         csrf_config=config.csrf,
         cors_config=config.cors,
+        middleware=[config.query_timing],
         openapi_config=config.openapi,
         debug=settings.app.DEBUG,
         signature_namespace={"m": m, "services": services, "schemas": schemas, "UUID": UUID},
@@ -48,16 +64,22 @@ def create_app() -> Litestar:
             FlashPlugin(config=FlashConfig(template_config=config.templates)),
             CommandLinePlugin(),
         ],
-        stores={"session": FileStore(Path(".state/sessions"), create_directories=True)},
-        middleware=[config.session.middleware],
+        response_cache_config=config.response_cache,
+        stores={config.session.store: session_store, config.response_cache.store: services.response_cache_store},
+        lifespan=[session_store, services.rehash_queue.lifespan, services.stats_reconciler.lifespan, services.job_runner.lifespan],
+        on_shutdown=[crypt.shutdown_hashing_pool, settings.db.dispose_engines],
+        on_app_init=[deps.session_auth.on_app_init],
         dependencies={
             "current_user": Provide(deps.provide_user),
-            "users_service": Provide(deps.provide_users_service),
+            "users_service": Provide(deps.provide_users_service, sync_to_thread=False),
             "limit_offset": Provide(deps.provide_limit_offset_pagination, sync_to_thread=False),
+            "keyset_pagination": Provide(deps.provide_keyset_pagination, sync_to_thread=False),
             "updated_filter": Provide(deps.provide_updated_filter, sync_to_thread=False),
             "created_filter": Provide(deps.provide_created_filter, sync_to_thread=False),
             "id_filter": Provide(deps.provide_id_filter, sync_to_thread=False),
             "search_filter": Provide(deps.provide_search_filter, sync_to_thread=False),
+            "full_text_search": Provide(deps.provide_full_text_search, sync_to_thread=False),
+            "trashed_filter": Provide(deps.provide_trashed_filter, sync_to_thread=False),
             "order_by": Provide(deps.provide_order_by, sync_to_thread=False),
             "filters": Provide(deps.provide_filter_dependencies, sync_to_thread=False),
         },
@@ -1,9 +1,35 @@
 from __future__ import annotations
 
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar, TypeVarTuple
 
 import click
 from litestar.plugins import CLIPluginProtocol, InitPluginProtocol
+from rich_click import RichCommand
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from uuid import UUID
+
+    from app.lib.imports import Importer, ImportFormat, ImportReport
+
+T = TypeVar("T")
+PosArgsT = TypeVarTuple("PosArgsT")
+
+
+def run(func: Callable[[*PosArgsT], Awaitable[T]], *args: *PosArgsT) -> T:
+    """Run ``func`` like ``anyio.run``, then dispose every database engine, whose connection threads would keep the command from exiting."""
+    import anyio
+
+    from config import get_settings
+
+    async def _run() -> T:
+        try:
+            return await func(*args)
+        finally:
+            await get_settings().db.dispose_engines()
+
+    return anyio.run(_run)
 
 
 class CommandLinePlugin(InitPluginProtocol, CLIPluginProtocol):
@@ -57,18 +83,16 @@ class CommandLinePlugin(InitPluginProtocol, CLIPluginProtocol):
         )
         def create_user(email: str | None, name: str | None, password: str | None, superuser: bool | None) -> None:
             """Create a user."""
-            import anyio
             import click
             from rich import get_console
 
-            from app import config, deps, schemas
+            from app import config, deps, schemas, services
 
             console = get_console()
 
             async def _create_user(email: str, password: str, name: str | None, superuser: bool = False, initial_account: str | None = None) -> None:
                 obj_in = schemas.UserCreate(email=email, name=name, password=password, is_superuser=superuser)
-                async with config.alchemy.get_session() as db_session:
-                    users_service = await anext(deps.provide_users_service(db_session))
+                async with services.UserService.new(config=config.alchemy, error_messages=deps.USER_ERROR_MESSAGES) as users_service:
                     user = await users_service.create(data=obj_in.to_dict(), auto_commit=True)
                     console.print(f"User created: {user.email}")
 
@@ -79,7 +103,7 @@ class CommandLinePlugin(InitPluginProtocol, CLIPluginProtocol):
             superuser = superuser or click.prompt("Create as superuser?", show_default=True, type=click.BOOL)
             initial_account = superuser or click.prompt("Create as superuser?", show_default=True, type=click.BOOL)
 
-            anyio.run(_create_user, email, name, password, superuser, initial_account)
+            run(_create_user, email, name, password, superuser, initial_account)
 
         @user_management_app.command(name="promote-to-superuser", help="Promotes a user to application superuser")
         @click.option("--email", help="Email of the user", type=click.STRING, required=False, show_default=False)
@@ -89,16 +113,14 @@ class CommandLinePlugin(InitPluginProtocol, CLIPluginProtocol):
             Args:
                 email (str): The email address of the user to promote.
             """
-            import anyio
             from rich import get_console
 
-            from app import config, deps, schemas
+            from app import config, deps, schemas, services
 
             console = get_console()
 
             async def _promote_to_superuser(email: str) -> None:
-                async with config.alchemy.get_session() as db_session:
-                    users_service = await anext(deps.provide_users_service(db_session))
+                async with services.UserService.new(config=config.alchemy, error_messages=deps.USER_ERROR_MESSAGES) as users_service:
                     user = await users_service.get_one_or_none(email=email)
                     if user:
                         console.print(f"Promoting user: %{user.email}")
@@ -116,11 +138,10 @@ class CommandLinePlugin(InitPluginProtocol, CLIPluginProtocol):
                         console.print(f"User not found: {email}")
 
             console.rule("Promote user to superuser.")
-            anyio.run(_promote_to_superuser, email)
+            run(_promote_to_superuser, email)
 
         @database_group.command("load-fixtures")
         def load_database_fixtures() -> None:
-            import anyio
             from rich import get_console
 
             console = get_console()
@@ -144,6 +165,137 @@ class CommandLinePlugin(InitPluginProtocol, CLIPluginProtocol):
                     console.print("User fixtures loaded.")
 
             console.rule("Loading database fixtures.")
-            anyio.run(_load_database_fixtures)
+            run(_load_database_fixtures)
 
+        user_management_app.add_command(calibrate_hashing)
+        for command in (import_rows, purge_trash, reconcile_stats):
+            database_group.add_command(command)
         cli.add_command(user_management_app)
+
+
+@click.command(name="calibrate-hashing", help="Calibrate Argon2 password hashing costs for this host")
+@click.option("--target-ms", help="Target hashing latency in milliseconds", type=click.INT, default=250, show_default=True)
+@click.option("--max-memory-mib", help="Largest memory cost to consider, in MiB", type=click.INT, default=256, show_default=True)
+@click.option("--cores", help="CPU cores available for password hashing", type=click.INT, default=None, show_default=False)
+@click.option("--parallelism", help="Argon2 lanes per hash. Defaults to min(4, cores)", type=click.INT, default=None, show_default=False)
+def calibrate_hashing(target_ms: int, max_memory_mib: int, cores: int | None, parallelism: int | None) -> None:
+    """Calibrate Argon2 costs to a target latency and core budget."""
+    import os
+
+    from rich import get_console
+
+    from config import crypt
+
+    console = get_console()
+    cores = cores or os.cpu_count() or 1
+    parallelism = parallelism or min(4, cores)
+    console.rule("Calibrate password hashing.")
+    console.print(f"Target {target_ms}ms per hash, {cores} core(s), parallelism {parallelism}, at most {max_memory_mib} MiB.")
+    with console.status("Measuring Argon2 hashing cost..."):
+        time_cost, memory_cost, elapsed = crypt.calibrate_argon2(
+            target=target_ms / 1000,
+            max_memory_cost=max_memory_mib * 1024,
+            parallelism=parallelism,
+        )
+    workers = max(1, cores // parallelism)
+    console.print(f"time_cost={time_cost} memory_cost={memory_cost // 1024} MiB: {elapsed * 1000:.1f}ms per hash.")
+    console.print(f"About {workers / elapsed:.1f} hashes/second with {workers} worker(s). Add these settings to your environment:")
+    console.print(f"PASSWORD_HASH_TIME_COST={time_cost}", markup=False, highlight=False)
+    console.print(f"PASSWORD_HASH_MEMORY_COST={memory_cost}", markup=False, highlight=False)
+    console.print(f"PASSWORD_HASH_PARALLELISM={parallelism}", markup=False, highlight=False)
+    console.print(f"PASSWORD_HASH_WORKERS={workers}", markup=False, highlight=False)
+    console.print("Existing hashes are upgraded the next time each user signs in.")
+
+
+@click.command("import", cls=RichCommand, help="Stream contacts or organizations from a CSV or NDJSON file into an account.")
+@click.argument("model", type=click.Choice(["contacts", "organizations"]))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--account-id", help="Account to import into", type=click.UUID, required=True)
+@click.option("--format", "fmt", help="File format. Defaults to the file extension", type=click.Choice(["csv", "ndjson"]), default=None)
+@click.option("--chunk-size", help="Rows inserted and committed together", type=click.INT, default=None)
+def import_rows(model: str, path: Path, account_id: UUID, fmt: ImportFormat | None, chunk_size: int | None) -> None:
+    from rich import get_console
+
+    from app import config, services
+    from app.lib.imports import guess_format, read_file, run_import
+    from config import get_settings
+
+    console, settings = get_console(), get_settings()
+
+    async def _import_rows() -> ImportReport:
+        async with services.OrganizationService.new(config=config.alchemy) as organizations_service:
+            importer: Importer[Any]
+            if model == "organizations":
+                importer = services.OrganizationImporter(organizations_service, account_id)
+            else:
+                contacts_service = services.ContactService(session=organizations_service.repository.session)
+                importer = services.ContactImporter(contacts_service, organizations_service, account_id)
+            with console.status(f"Importing {model}...") as status:
+                return await run_import(
+                    importer,
+                    read_file(path),
+                    fmt or guess_format(path.name),
+                    chunk_size=chunk_size or settings.app.IMPORT_CHUNK_SIZE,
+                    max_errors=settings.app.IMPORT_MAX_ERRORS,
+                    on_progress=lambda report: status.update(f"Importing {model}: {report.created} created, {report.failed} failed"),
+                )
+
+    console.rule(f"Importing {model} from {path}.")
+    report = run(_import_rows)
+    for error in report.errors:
+        console.print(f"[red]line {error.line}:[/] {error.error}", highlight=False)
+    if report.failed > len(report.errors):
+        console.print(f"... and {report.failed - len(report.errors)} more row error(s).")
+    console.print(f"{report.created} {model} created, {report.failed} row(s) rejected.")
+
+
+@click.command("purge-trash", cls=RichCommand, help="Hard-delete contacts and organizations that have been in the trash for too long.")
+@click.option("--older-than-days", help="Days a row stays in the trash. Defaults to TRASH_RETENTION_DAYS", type=click.INT, default=None)
+@click.option("--batch-size", help="Rows deleted and committed together. Defaults to PURGE_BATCH_SIZE", type=click.INT, default=None)
+@click.option("--pause", help="Seconds to wait between batches, to leave room for other writers", type=click.FLOAT, default=0.0, show_default=True)
+def purge_trash(older_than_days: int | None, batch_size: int | None, pause: float) -> None:
+    from datetime import UTC, datetime, timedelta
+
+    import anyio
+    from rich import get_console
+
+    from app import config, services
+    from config import get_settings
+
+    console, settings = get_console(), get_settings()
+    before = datetime.now(UTC) - timedelta(days=settings.app.TRASH_RETENTION_DAYS if older_than_days is None else older_than_days)
+    limit = batch_size or settings.app.PURGE_BATCH_SIZE
+
+    async def _purge_trash() -> dict[str, int]:
+        purged: dict[str, int] = {}
+        # contacts first, so the organizations they belonged to are no longer referenced
+        for service_type in (services.ContactService, services.OrganizationService):
+            async with service_type.new(config=config.alchemy) as service:
+                purged[service.table_name] = 0
+                while deleted := await service.purge_trash(before, limit):
+                    await service.repository.session.commit()
+                    purged[service.table_name] += deleted
+                    if deleted < limit:
+                        break
+                    await anyio.sleep(pause)
+        return purged
+
+    console.rule(f"Purging rows trashed before {before:%Y-%m-%d %H:%M}.")
+    for table, count in run(_purge_trash).items():
+        console.print(f"{count} {table} row(s) purged.")
+
+
+@click.command("reconcile-stats", cls=RichCommand, help="Recount the dashboard statistics of every account, or of one, and fix any drift.")
+@click.option("--account-id", help="Only reconcile this account", type=click.UUID, default=None)
+def reconcile_stats(account_id: UUID | None) -> None:
+    from rich import get_console
+
+    from app import services
+
+    console = get_console()
+    console.rule("Reconciling dashboard statistics.")
+    corrected = run(services.stats_reconciler.reconcile, None if account_id is None else [account_id])
+    for reconciled_id, count in corrected.items():
+        if count:
+            console.print(f"[yellow]{count}[/] total(s) corrected for account {reconciled_id}")
+    console.print(f"{len(corrected)} account(s) reconciled, {sum(corrected.values())} total(s) corrected.")
@@ -1,18 +1,23 @@
 from litestar.config.cors import CORSConfig
 from litestar.config.csrf import CSRFConfig
+from litestar.config.response_cache import ResponseCacheConfig
 from litestar.contrib.jinja import JinjaTemplateEngine
+from litestar.middleware import DefineMiddleware
 from litestar.middleware.session.server_side import ServerSideSessionConfig
 from litestar.openapi.config import OpenAPIConfig
 from litestar.openapi.plugins import ScalarRenderPlugin
 from litestar.plugins.sqlalchemy import (
     AlembicAsyncConfig,
     AsyncSessionConfig,
-    SQLAlchemyAsyncConfig,
 )
 from litestar.template import TemplateConfig
 from litestar_vite import ViteConfig
 from litestar_vite.inertia import InertiaConfig
 
+from app.lib.queries import QueryTimer, QueryTimingMiddleware
+from app.lib.response_cache import CacheKeyBuilder, should_cache_response
+from app.lib.routing import RoutingSession, RoutingSQLAlchemyAsyncConfig
+from app.lib.sessions import LazyServerSideSessionConfig
 from config import get_settings
 
 settings = get_settings()
@@ -23,25 +28,43 @@ csrf = CSRFConfig(
     cookie_secure=settings.app.CSRF_COOKIE_SECURE,
     cookie_name=settings.app.CSRF_COOKIE_NAME,
     header_name=settings.app.CSRF_HEADER_NAME,
+    exclude=["^/health", "^/ready"],
 )
 cors = CORSConfig(allow_origins=settings.app.ALLOWED_CORS_ORIGINS)
-session = ServerSideSessionConfig(max_age=3600)
+session = (LazyServerSideSessionConfig if settings.session.LAZY else ServerSideSessionConfig)(
+    max_age=settings.session.MAX_AGE,
+    exclude=["^/schema", "^/health", "^/ready", f"^{settings.vite.ASSET_URL}"],
+)
+response_cache = ResponseCacheConfig(
+    default_expiration=settings.app.RESPONSE_CACHE_EXPIRATION,
+    key_builder=CacheKeyBuilder(),
+    cache_response_filter=should_cache_response,
+    store="response_cache",
+)
 openapi = OpenAPIConfig(
     title=settings.app.NAME,
     version="latest",
     use_handler_docstrings=True,
     render_plugins=[ScalarRenderPlugin(version="latest")],
 )
-alchemy = SQLAlchemyAsyncConfig(
+alchemy = RoutingSQLAlchemyAsyncConfig(
     engine_instance=settings.db.get_engine(),
+    read_engine_provider=settings.db.get_read_engine,
     before_send_handler="autocommit_include_redirects",
-    session_config=AsyncSessionConfig(expire_on_commit=False),
+    session_config=AsyncSessionConfig(expire_on_commit=False, sync_session_class=RoutingSession),
     alembic_config=AlembicAsyncConfig(
         version_table_name=settings.db.MIGRATION_DDL_VERSION_TABLE,
         script_config=settings.db.MIGRATION_CONFIG,
         script_location=settings.db.MIGRATION_PATH,
     ),
 )
+query_timer = QueryTimer(
+    sample_rate=settings.app.SQL_TIMING_SAMPLE_PERCENT / 100,
+    slow_threshold=settings.app.SLOW_QUERY_THRESHOLD_MS / 1000,
+    slow_log_size=settings.app.SLOW_QUERY_LOG_SIZE,
+)
+query_timer.instrument(*settings.db.get_engines().values())
+query_timing = DefineMiddleware(QueryTimingMiddleware, timer=query_timer, exclude=["^/health", "^/ready", f"^{settings.vite.ASSET_URL}"])
 templates = TemplateConfig(engine=JinjaTemplateEngine(directory=settings.vite.TEMPLATE_DIR))
 vite = ViteConfig(
     bundle_dir=settings.vite.BUNDLE_DIR,
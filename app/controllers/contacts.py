@@ -1,7 +1,180 @@
+"""Contact Controllers."""
+
 from __future__ import annotations
 
-from litestar import Controller
+from typing import TYPE_CHECKING, Annotated
+from uuid import UUID  # noqa: TC003
+
+from advanced_alchemy.exceptions import NotFoundError
+from advanced_alchemy.filters import LimitOffset  # noqa: TC002
+from litestar import Controller, Request, delete, get, patch, post, put
+from litestar.di import Provide
+from litestar.params import Dependency, Parameter
+from litestar.response import Stream  # noqa: TC002
+from sqlalchemy import Select  # noqa: TC002
+
+from app import deps, schemas, services
+from app.deps import TrashedFilter  # noqa: TC001
+from app.lib.batch import BatchDelete, BatchResult, BatchUpdate, check_batch_size
+from app.lib.exports import export_response
+from app.lib.imports import ImportFormat, ImportReport, guess_format, run_import
+from app.lib.pagination import page_links
+from app.lib.response_cache import CacheKeyBuilder
+from app.lib.search import FullTextSearch  # noqa: TC001
+from config import get_settings
+from database import models as m
+
+if TYPE_CHECKING:
+    from advanced_alchemy.filters import FilterTypes
+    from advanced_alchemy.service import OffsetPagination
+
+settings = get_settings()
+
+cache_key_builder = CacheKeyBuilder(tags=("contact", "organization"))
+"""Contact responses embed the organization name, so writes to either table purge them."""
 
 
 class ContactController(Controller):
-    include_in_schema = False
+    """Contact Controller."""
+
+    tags = ["Contacts"]
+    guards = [deps.requires_active_user]
+    dependencies = {
+        "order_by": Provide(deps.provide_sortable_order_by(services.ContactService.sortable_fields), sync_to_thread=False),
+        "contacts_service": Provide(deps.provide_contacts_service, sync_to_thread=False),
+        "organizations_service": Provide(deps.provide_organizations_service, sync_to_thread=False),
+        "account_ids": Provide(deps.provide_account_ids, sync_to_thread=False),
+        "account_id": Provide(deps.provide_account_id),
+    }
+
+    @get(operation_id="ListContacts", name="contacts:list", path="/api/contacts", cache=True, cache_key_builder=cache_key_builder)
+    async def list_contacts(
+        self,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        full_text_search: Annotated[FullTextSearch, Dependency(skip_validation=True)],
+        trashed_filter: Annotated[TrashedFilter, Dependency(skip_validation=True)],
+        filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
+    ) -> OffsetPagination[schemas.Contact]:
+        """List contacts with their organization."""
+        results, total = await contacts_service.list_with_organization(m.Contact.account_id.in_(account_ids), full_text_search, trashed_filter, *filters)
+        return contacts_service.to_schema(data=results, total=total, schema_type=schemas.Contact, filters=filters)
+
+    @get(operation_id="GetContact", name="contacts:get", path="/api/contacts/{contact_id:uuid}", cache=True, cache_key_builder=cache_key_builder)
+    async def get_contact(
+        self,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        contact_id: Annotated[UUID, Parameter(title="Contact ID", description="The contact to retrieve.")],
+    ) -> schemas.Contact:
+        """Get a contact."""
+        db_obj = await contacts_service.get_with_organization(m.Contact.id == contact_id, m.Contact.account_id.in_(account_ids))
+        return contacts_service.to_schema(db_obj, schema_type=schemas.Contact)
+
+    @patch(operation_id="UpdateContactBatch", name="contacts:update-batch", path="/api/contacts/batch")
+    async def update_contacts_batch(
+        self,
+        data: BatchUpdate,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+    ) -> BatchResult:
+        """Update many contacts in one transaction, with a result per item."""
+        check_batch_size(len(data.items), settings.app.BATCH_MAX_SIZE)
+        return await contacts_service.batch_update(data.items, schemas.ContactUpdate, m.Contact.account_id.in_(account_ids))
+
+    @delete(operation_id="DeleteContactBatch", name="contacts:delete-batch", path="/api/contacts/batch", status_code=200)
+    async def delete_contacts_batch(
+        self,
+        data: BatchDelete,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+    ) -> BatchResult:
+        """Move many contacts to the trash in one transaction, with a result per item."""
+        check_batch_size(len(data.ids), settings.app.BATCH_MAX_SIZE)
+        return await contacts_service.batch_trash(data.ids, m.Contact.account_id.in_(account_ids))
+
+    @put(operation_id="RestoreContactBatch", name="contacts:restore-batch", path="/api/contacts/batch/restore")
+    async def restore_contacts_batch(
+        self,
+        data: BatchDelete,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+    ) -> BatchResult:
+        """Restore many contacts from the trash in one transaction, with a result per item."""
+        check_batch_size(len(data.ids), settings.app.BATCH_MAX_SIZE)
+        return await contacts_service.batch_restore(data.ids, m.Contact.account_id.in_(account_ids))
+
+    @delete(operation_id="DeleteContact", name="contacts:delete", path="/api/contacts/{contact_id:uuid}")
+    async def delete_contact(
+        self,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        contact_id: Annotated[UUID, Parameter(title="Contact ID", description="The contact to delete.")],
+    ) -> None:
+        """Move a contact to the trash."""
+        if not await contacts_service.trash_batch({contact_id}, m.Contact.account_id.in_(account_ids)):
+            msg = "No live contact found"
+            raise NotFoundError(msg)
+
+    @put(operation_id="RestoreContact", name="contacts:restore", path="/api/contacts/{contact_id:uuid}/restore", status_code=204)
+    async def restore_contact(
+        self,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        contact_id: Annotated[UUID, Parameter(title="Contact ID", description="The contact to restore.")],
+    ) -> None:
+        """Restore a contact from the trash."""
+        if not await contacts_service.restore_batch({contact_id}, m.Contact.account_id.in_(account_ids)):
+            msg = "No trashed contact found"
+            raise NotFoundError(msg)
+
+    @get(operation_id="ExportContacts", name="contacts:export", path="/api/contacts/export")
+    async def export_contacts(
+        self,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        full_text_search: Annotated[FullTextSearch, Dependency(skip_validation=True)],
+        trashed_filter: Annotated[TrashedFilter, Dependency(skip_validation=True)],
+        filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
+        fmt: Annotated[ImportFormat, Parameter(query="format", title="File format")] = "csv",
+    ) -> Stream:
+        """Export contacts matching the list filters, streamed as rows are read."""
+        statement = contacts_service.export_statement(m.Contact.account_id.in_(account_ids), full_text_search, trashed_filter, *filters)
+        return export_response(settings.db.get_read_engine(), statement, fmt, filename="contacts", batch_size=settings.app.EXPORT_BATCH_SIZE)
+
+    @post(operation_id="ImportContacts", name="contacts:import", path="/api/contacts/import", request_max_body_size=None)
+    async def import_contacts(
+        self,
+        request: Request,
+        contacts_service: services.ContactService,
+        organizations_service: services.OrganizationService,
+        account_id: Annotated[UUID, Dependency(skip_validation=True)],
+        fmt: Annotated[ImportFormat | None, Parameter(query="format", title="File format", description="Defaults to the request content type.")] = None,
+    ) -> ImportReport:
+        """Import contacts from a CSV or NDJSON request body, streamed and inserted in chunks."""
+        return await run_import(
+            services.ContactImporter(contacts_service, organizations_service, account_id),
+            request.stream(),
+            fmt or guess_format(request.headers.get("content-type")),
+            chunk_size=settings.app.IMPORT_CHUNK_SIZE,
+            max_errors=settings.app.IMPORT_MAX_ERRORS,
+        )
+
+    @get(component="Contacts/Index", name="contacts.index", path="/contacts/", include_in_schema=False)
+    async def index(
+        self,
+        request: Request,
+        contacts_service: services.ContactService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        full_text_search: Annotated[FullTextSearch, Dependency(skip_validation=True)],
+        trashed_filter: Annotated[TrashedFilter, Dependency(skip_validation=True)],
+        limit_offset: Annotated[LimitOffset, Dependency(skip_validation=True)],
+        filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
+    ) -> dict:
+        """Serve the contact listing page."""
+        results, total = await contacts_service.list_with_organization(m.Contact.account_id.in_(account_ids), full_text_search, trashed_filter, *filters)
+        page = contacts_service.to_schema(data=results, total=total, schema_type=schemas.Contact, filters=filters)
+        return {
+            "filters": {"search": full_text_search.value, "trashed": trashed_filter.mode},
+            "contacts": {"data": page.items, "total": total, "links": page_links(request, limit_offset, total)},
+        }
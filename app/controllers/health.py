@@ -0,0 +1,79 @@
+"""Health Controllers."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from litestar import Controller, Request, Response, get
+from litestar.status_codes import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
+from sqlalchemy import text
+
+from app import config
+from app.lib.health import CachedProbe
+from app.lib.pools import pool_stats
+from config import crypt, get_settings
+
+if TYPE_CHECKING:
+    from litestar.stores.base import Store
+
+settings = get_settings()
+
+
+async def check_database() -> dict[str, Any]:
+    """A round trip to every engine reads are served from; the primary's pool is reported, not probed."""
+    engines = {name: engine for name, engine in settings.db.get_engines().items() if name != "primary"} or {"primary": settings.db.get_engine()}
+    for engine in engines.values():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    primary = pool_stats({"primary": settings.db.get_engine()})["primary"]
+    return {"engines": list(engines), "primaryTimeouts": primary.get("timeouts", 0)}
+
+
+async def check_session_store(store: Store) -> dict[str, Any]:
+    """Write, read back and delete a short-lived entry in the session store."""
+    key, value = f"health-{uuid.uuid4().hex}", b"ok"
+    await store.set(key, value, expires_in=60)
+    read = await store.get(key)
+    await store.delete(key)
+    return {"ok": read == value}
+
+
+async def check_hashing_pool() -> dict[str, Any]:
+    """Whether the password hashing executor still accepts work."""
+    pool = crypt.get_hashing_pool()
+    return {"ok": pool.saturation < 1.0, "saturation": round(pool.saturation, 3), "inFlight": pool.stats.in_flight, "capacity": pool.capacity}
+
+
+probes = {
+    "database": CachedProbe(check_database, settings.app.HEALTH_PROBE_INTERVAL, settings.app.HEALTH_PROBE_TIMEOUT),
+    "sessions": CachedProbe(check_session_store, settings.app.HEALTH_PROBE_INTERVAL, settings.app.HEALTH_PROBE_TIMEOUT),
+    "hashing": CachedProbe(check_hashing_pool, settings.app.HEALTH_PROBE_INTERVAL, settings.app.HEALTH_PROBE_TIMEOUT),
+}
+
+
+class HealthController(Controller):
+    """Probes for load balancers and orchestrators, outside authentication, sessions and CSRF."""
+
+    tags = ["Health"]
+
+    @get(operation_id="Health", name="health", path="/health", exclude_from_auth=True)
+    async def health(self) -> dict[str, Any]:
+        """Report that the application is up, with the usage of its database connection pools."""
+        return {"status": "ok", "pools": pool_stats(settings.db.get_engines())}
+
+    @get(operation_id="Ready", name="ready", path="/ready", exclude_from_auth=True)
+    async def ready(self, request: Request) -> Response[dict[str, Any]]:
+        """Report whether the database, the session store and the hashing pool can serve requests, with a ``503`` if not.
+
+        Results are at most ``HEALTH_PROBE_INTERVAL`` seconds old, however often this is called.
+        """
+        store = request.app.stores.get(config.session.store)
+        database, sessions, hashing = await asyncio.gather(probes["database"].result(), probes["sessions"].result(store), probes["hashing"].result())
+        checks = {"database": database, "sessions": sessions, "hashing": hashing}
+        ready = all(result.ok for result in checks.values())
+        return Response(
+            {"status": "ok" if ready else "unavailable", "checks": {name: result.to_dict() for name, result in checks.items()}},
+            status_code=HTTP_200_OK if ready else HTTP_503_SERVICE_UNAVAILABLE,
+        )
@@ -1,7 +1,191 @@
+"""Organization Controllers."""
+
 from __future__ import annotations
 
-from litestar import Controller
+from typing import TYPE_CHECKING, Annotated
+from uuid import UUID  # noqa: TC003
+
+from advanced_alchemy.exceptions import NotFoundError
+from advanced_alchemy.filters import LimitOffset  # noqa: TC002
+from litestar import Controller, Request, delete, get, patch, post, put
+from litestar.di import Provide
+from litestar.params import Dependency, Parameter
+from litestar.response import Stream  # noqa: TC002
+from sqlalchemy import Select  # noqa: TC002
+
+from app import deps, schemas, services
+from app.deps import TrashedFilter  # noqa: TC001
+from app.lib.batch import BatchDelete, BatchResult, BatchUpdate, check_batch_size
+from app.lib.exports import export_response
+from app.lib.imports import ImportFormat, ImportReport, guess_format, run_import
+from app.lib.pagination import page_links
+from app.lib.response_cache import CacheKeyBuilder
+from app.lib.search import FullTextSearch  # noqa: TC001
+from config import get_settings
+from database import models as m
+
+if TYPE_CHECKING:
+    from advanced_alchemy.filters import FilterTypes
+    from advanced_alchemy.service import OffsetPagination
+
+settings = get_settings()
+
+cache_key_builder = CacheKeyBuilder(tags=("organization", "contact"))
+"""Organization responses include contact counts, so writes to either table purge them."""
+typeahead_cache_key_builder = CacheKeyBuilder(tags=("organization",))
 
 
 class OrganizationController(Controller):
-    include_in_schema = False
+    """Organization Controller."""
+
+    tags = ["Organizations"]
+    guards = [deps.requires_active_user]
+    dependencies = {
+        "order_by": Provide(deps.provide_sortable_order_by(services.OrganizationService.sortable_fields), sync_to_thread=False),
+        "organizations_service": Provide(deps.provide_organizations_service, sync_to_thread=False),
+        "account_ids": Provide(deps.provide_account_ids, sync_to_thread=False),
+        "account_id": Provide(deps.provide_account_id),
+    }
+
+    @get(operation_id="ListOrganizations", name="organizations:list", path="/api/organizations", cache=True, cache_key_builder=cache_key_builder)
+    async def list_organizations(
+        self,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        full_text_search: Annotated[FullTextSearch, Dependency(skip_validation=True)],
+        trashed_filter: Annotated[TrashedFilter, Dependency(skip_validation=True)],
+        filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
+    ) -> OffsetPagination[schemas.Organization]:
+        """List organizations with their contact counts."""
+        results, total = await organizations_service.list_with_counts(m.Organization.account_id.in_(account_ids), full_text_search, trashed_filter, *filters)
+        return organizations_service.to_schema(data=results, total=total, schema_type=schemas.Organization, filters=filters)
+
+    @get(operation_id="SuggestOrganizations", name="organizations:typeahead", path="/api/organizations/typeahead", cache=True, cache_key_builder=typeahead_cache_key_builder)
+    async def suggest_organizations(
+        self,
+        organizations_service: services.OrganizationService,
+        account_id: Annotated[UUID, Dependency(skip_validation=True)],
+        prefix: Annotated[str, Parameter(query="q", required=False, max_length=255, description="Start of the name, in any case.")] = "",
+        limit: Annotated[int, Parameter(query="limit", required=False, ge=1, le=50)] = 10,
+    ) -> list[schemas.ContactOrganization]:
+        """Suggest the live organizations of an account whose name starts with ``q``, in name order, for pickers."""
+        matches = await organizations_service.names_starting_with(account_id, prefix, limit)
+        return [schemas.ContactOrganization(id=organization_id, name=name) for organization_id, name in matches]
+
+    @get(operation_id="GetOrganization", name="organizations:get", path="/api/organizations/{organization_id:uuid}", cache=True, cache_key_builder=cache_key_builder)
+    async def get_organization(
+        self,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        organization_id: Annotated[UUID, Parameter(title="Organization ID", description="The organization to retrieve.")],
+    ) -> schemas.OrganizationDetail:
+        """Get an organization and its contacts."""
+        db_obj = await organizations_service.get_with_contacts(m.Organization.id == organization_id, m.Organization.account_id.in_(account_ids))
+        return organizations_service.to_schema(db_obj, schema_type=schemas.OrganizationDetail)
+
+    @patch(operation_id="UpdateOrganizationBatch", name="organizations:update-batch", path="/api/organizations/batch")
+    async def update_organizations_batch(
+        self,
+        data: BatchUpdate,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+    ) -> BatchResult:
+        """Update many organizations in one transaction, with a result per item."""
+        check_batch_size(len(data.items), settings.app.BATCH_MAX_SIZE)
+        return await organizations_service.batch_update(data.items, schemas.OrganizationUpdate, m.Organization.account_id.in_(account_ids))
+
+    @delete(operation_id="DeleteOrganizationBatch", name="organizations:delete-batch", path="/api/organizations/batch", status_code=200)
+    async def delete_organizations_batch(
+        self,
+        data: BatchDelete,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+    ) -> BatchResult:
+        """Move many organizations to the trash in one transaction, with a result per item. Their contacts go with them."""
+        check_batch_size(len(data.ids), settings.app.BATCH_MAX_SIZE)
+        return await organizations_service.batch_trash(data.ids, m.Organization.account_id.in_(account_ids))
+
+    @put(operation_id="RestoreOrganizationBatch", name="organizations:restore-batch", path="/api/organizations/batch/restore")
+    async def restore_organizations_batch(
+        self,
+        data: BatchDelete,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+    ) -> BatchResult:
+        """Restore many organizations from the trash in one transaction, with a result per item."""
+        check_batch_size(len(data.ids), settings.app.BATCH_MAX_SIZE)
+        return await organizations_service.batch_restore(data.ids, m.Organization.account_id.in_(account_ids))
+
+    @delete(operation_id="DeleteOrganization", name="organizations:delete", path="/api/organizations/{organization_id:uuid}")
+    async def delete_organization(
+        self,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        organization_id: Annotated[UUID, Parameter(title="Organization ID", description="The organization to delete.")],
+    ) -> None:
+        """Move a organization to the trash. Their contacts go with them."""
+        if not await organizations_service.trash_batch({organization_id}, m.Organization.account_id.in_(account_ids)):
+            msg = "No live organization found"
+            raise NotFoundError(msg)
+
+    @put(operation_id="RestoreOrganization", name="organizations:restore", path="/api/organizations/{organization_id:uuid}/restore", status_code=204)
+    async def restore_organization(
+        self,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        organization_id: Annotated[UUID, Parameter(title="Organization ID", description="The organization to restore.")],
+    ) -> None:
+        """Restore a organization from the trash. Contacts trashed along with it come back too."""
+        if not await organizations_service.restore_batch({organization_id}, m.Organization.account_id.in_(account_ids)):
+            msg = "No trashed organization found"
+            raise NotFoundError(msg)
+
+    @get(operation_id="ExportOrganizations", name="organizations:export", path="/api/organizations/export")
+    async def export_organizations(
+        self,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        full_text_search: Annotated[FullTextSearch, Dependency(skip_validation=True)],
+        trashed_filter: Annotated[TrashedFilter, Dependency(skip_validation=True)],
+        filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
+        fmt: Annotated[ImportFormat, Parameter(query="format", title="File format")] = "csv",
+    ) -> Stream:
+        """Export organizations matching the list filters, streamed as rows are read."""
+        statement = organizations_service.export_statement(m.Organization.account_id.in_(account_ids), full_text_search, trashed_filter, *filters)
+        return export_response(settings.db.get_read_engine(), statement, fmt, filename="organizations", batch_size=settings.app.EXPORT_BATCH_SIZE)
+
+    @post(operation_id="ImportOrganizations", name="organizations:import", path="/api/organizations/import", request_max_body_size=None)
+    async def import_organizations(
+        self,
+        request: Request,
+        organizations_service: services.OrganizationService,
+        account_id: Annotated[UUID, Dependency(skip_validation=True)],
+        fmt: Annotated[ImportFormat | None, Parameter(query="format", title="File format", description="Defaults to the request content type.")] = None,
+    ) -> ImportReport:
+        """Import organizations from a CSV or NDJSON request body, streamed and inserted in chunks."""
+        return await run_import(
+            services.OrganizationImporter(organizations_service, account_id),
+            request.stream(),
+            fmt or guess_format(request.headers.get("content-type")),
+            chunk_size=settings.app.IMPORT_CHUNK_SIZE,
+            max_errors=settings.app.IMPORT_MAX_ERRORS,
+        )
+
+    @get(component="Organizations/Index", name="organizations.index", path="/organizations/", include_in_schema=False)
+    async def index(
+        self,
+        request: Request,
+        organizations_service: services.OrganizationService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        full_text_search: Annotated[FullTextSearch, Dependency(skip_validation=True)],
+        trashed_filter: Annotated[TrashedFilter, Dependency(skip_validation=True)],
+        limit_offset: Annotated[LimitOffset, Dependency(skip_validation=True)],
+        filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
+    ) -> dict:
+        """Serve the organization listing page."""
+        results, total = await organizations_service.list_with_counts(m.Organization.account_id.in_(account_ids), full_text_search, trashed_filter, *filters)
+        page = organizations_service.to_schema(data=results, total=total, schema_type=schemas.Organization, filters=filters)
+        return {
+            "filters": {"search": full_text_search.value, "trashed": trashed_filter.mode},
+            "organizations": {"data": page.items, "total": total, "links": page_links(request, limit_offset, total)},
+        }
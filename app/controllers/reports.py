@@ -0,0 +1,80 @@
+"""Report Controllers."""
+
+from __future__ import annotations
+
+from typing import Annotated, Any
+from uuid import UUID  # noqa: TC003
+
+from litestar import Controller, get, post
+from litestar.di import Provide
+from litestar.params import Dependency, Parameter
+from litestar.status_codes import HTTP_202_ACCEPTED
+from sqlalchemy import Select  # noqa: TC002
+
+from app import deps, schemas, services
+from database import models as m
+
+ReportLimit = Annotated[int | None, Parameter(query="limit", required=False, description="Organizations listed by the organizations report.")]
+ReportCountry = Annotated[str | None, Parameter(query="country", required=False, description="Country the countries report breaks down by region.")]
+ReportMonths = Annotated[int | None, Parameter(query="months", required=False, description="Months covered by the growth report.")]
+
+
+class ReportController(Controller):
+    """Reports, computed in the background and served from their last result until the data changes."""
+
+    tags = ["Reports"]
+    guards = [deps.requires_active_user]
+    dependencies = {
+        "report_service": Provide(deps.provide_report_service, sync_to_thread=False),
+        "account_ids": Provide(deps.provide_account_ids, sync_to_thread=False),
+        "account_id": Provide(deps.provide_account_id),
+    }
+
+    @post(operation_id="RequestReport", name="reports:request", path="/api/reports/{report:str}", status_code=HTTP_202_ACCEPTED)
+    async def request_report(
+        self,
+        report_service: services.ReportService,
+        account_id: Annotated[UUID, Dependency(skip_validation=True)],
+        report: str,
+        limit: ReportLimit = None,
+        country: ReportCountry = None,
+        months: ReportMonths = None,
+    ) -> schemas.ReportJob:
+        """Request a report of the account, computed unless its data has not changed since the last one."""
+        job = await report_service.request(account_id, report, {"limit": limit, "country": country, "months": months})
+        return report_service.to_report_job(job)
+
+    @get(operation_id="GetReportJob", name="reports:job", path="/api/reports/jobs/{job_id:uuid}")
+    async def get_report_job(
+        self,
+        report_service: services.ReportService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        job_id: Annotated[UUID, Parameter(title="Job ID", description="The report job to get.")],
+    ) -> schemas.ReportJob:
+        """Get the status of a report job, and its result once done."""
+        job = await report_service.get_report_job(job_id, m.Job.account_id.in_(account_ids))
+        return report_service.to_report_job(job)
+
+    @get(component="Reports/Index", name="reports", path="/reports/", include_in_schema=False)
+    async def index(
+        self,
+        report_service: services.ReportService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        report: Annotated[str, Parameter(query="report", required=False)] = "organizations",
+        requested_account_id: Annotated[UUID | None, Parameter(query="accountId", required=False)] = None,
+        limit: ReportLimit = None,
+        country: ReportCountry = None,
+        months: ReportMonths = None,
+    ) -> dict[str, Any]:
+        """Serve the reports page.
+
+        Viewing a report requests it, so the page shows the stored result, or the job computing it, which the page polls
+        until it is done.
+        """
+        if requested_account_id is not None:
+            account_ids = account_ids.where(m.AccountMember.account_id == requested_account_id)
+        account_id = await report_service.repository.session.scalar(account_ids.order_by(m.AccountMember.created_at).limit(1))
+        job = None
+        if account_id is not None:
+            job = report_service.to_report_job(await report_service.request(account_id, report, {"limit": limit, "country": country, "months": months}))
+        return {"reports": report_service.reports(), "report": report, "job": job}
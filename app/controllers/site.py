@@ -1,8 +1,17 @@
+from __future__ import annotations
+
+from typing import Annotated
+from uuid import UUID  # noqa: TC003
+
 from litestar import Controller, Request, get
+from litestar.di import Provide
+from litestar.params import Dependency, Parameter
 from litestar.response import File
 from litestar_vite.inertia import InertiaRedirect
+from sqlalchemy import Select  # noqa: TC002
 
-from app import config
+from app import config, deps, schemas, services
+from database import models as m
 
 
 class SiteController(Controller):
@@ -15,17 +24,32 @@ class SiteController(Controller):
             return InertiaRedirect(request, request.url_for("dashboard"))
         return InertiaRedirect(request, request.url_for("login"))
 
-    @get(component="Dashboard/Index", path="/dashboard/", name="dashboard")
-    async def dashboard(self) -> dict:
-        """Serve Dashboard Page."""
-        return {}
+    @get(
+        component="Dashboard/Index",
+        path="/dashboard/",
+        name="dashboard",
+        dependencies={
+            "account_ids": Provide(deps.provide_account_ids, sync_to_thread=False),
+            "account_stats_service": Provide(deps.provide_account_stats_service, sync_to_thread=False),
+        },
+    )
+    async def dashboard(
+        self,
+        account_stats_service: services.AccountStatService,
+        account_ids: Annotated[Select[tuple[UUID]], Dependency(skip_validation=True)],
+        requested_account_id: Annotated[UUID | None, Parameter(query="accountId", required=False)] = None,
+    ) -> schemas.DashboardStats:
+        """Serve Dashboard Page.
 
-    @get(component="Reports/Index", path="/reports/", name="reports")
-    async def reports(self) -> dict:
-        """Serve Reports Page."""
-        return {}
+        Statistics are those of ``accountId``, or of the user's first account, read from the running totals in one
+        statement that also checks the membership.
+        """
+        if requested_account_id is not None:
+            account_ids = account_ids.where(m.AccountMember.account_id == requested_account_id)
+        account_id = account_ids.order_by(m.AccountMember.created_at).limit(1).scalar_subquery()
+        return await account_stats_service.dashboard(account_id)
 
-    @get(path="/favicon.svg", name="favicon", exclude_from_auth=True, include_in_schema=False, sync_to_thread=False)
+    @get(path="/favicon.svg", name="favicon", exclude_from_auth=True, skip_session=True, include_in_schema=False, sync_to_thread=False)
     def favicon(self) -> File:
         """Serve site root."""
         return File(path=f"{config.vite.public_dir}/favicon.svg")
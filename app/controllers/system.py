@@ -0,0 +1,39 @@
+"""System Controllers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from litestar import Controller, get
+
+from app import config, deps, services
+from app.lib.pools import pool_stats
+from config import get_settings
+
+settings = get_settings()
+
+
+class SystemController(Controller):
+    """Operational insight into the running application."""
+
+    tags = ["System"]
+    guards = [deps.requires_superuser]
+
+    @get(operation_id="CacheStats", name="system:caches", path="/api/system/caches")
+    async def cache_stats(self) -> dict[str, dict[str, int | float]]:
+        """Report the hit ratios and sizes of the in-process caches."""
+        return {
+            "responses": services.response_cache_store.to_dict(),
+            "counts": services.count_cache.stats.to_dict(),
+            "users": services.user_cache.stats.to_dict(),
+        }
+
+    @get(operation_id="PoolStats", name="system:pools", path="/api/system/pools")
+    async def pools(self) -> dict[str, dict[str, Any]]:
+        """Report the usage of each database connection pool and how long checkouts have waited."""
+        return pool_stats(settings.db.get_engines())
+
+    @get(operation_id="SlowQueries", name="system:slow-queries", path="/api/system/slow-queries")
+    async def slow_queries(self) -> list[dict[str, Any]]:
+        """List the most recent statements slower than ``SLOW_QUERY_THRESHOLD_MS``, newest first, with their query plans."""
+        return [slow.to_dict() for slow in reversed(config.query_timer.slow_queries)]
@@ -5,9 +5,12 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Annotated
 
 from litestar import Controller, delete, get, patch, post
+from litestar.di import Provide
 from litestar.params import Dependency, Parameter
 
 from app import deps, schemas, services
+from app.lib.pagination import CursorPagination, KeysetPagination, paginate_keyset
+from app.lib.response_cache import CacheKeyBuilder
 
 if TYPE_CHECKING:
     from advanced_alchemy.filters import FilterTypes
@@ -19,14 +22,25 @@ class UserController(Controller):
 
     tags = ["User Accounts"]
     guards = [deps.requires_superuser]
+    dependencies = {"order_by": Provide(deps.provide_sortable_order_by(services.UserService.sortable_fields), sync_to_thread=False)}
 
-    @get(operation_id="ListUsers", name="users:list", path="/api/users", cache=60)
+    @get(operation_id="ListUsers", name="users:list", path="/api/users", cache=True, cache_key_builder=CacheKeyBuilder(tags=("users",)))
     async def list_users(self, users_service: services.UserService, filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)]) -> OffsetPagination[schemas.User]:
         """List users."""
         results, total = await users_service.list_and_count(*filters)
         return users_service.to_schema(data=results, total=total, schema_type=schemas.User, filters=filters)
 
-    @get(operation_id="GetUser", name="users:get", path="/api/users/{email:str}")
+    @get(operation_id="ListUsersByCursor", name="users:list-by-cursor", path="/api/users/cursor", cache=True, cache_key_builder=CacheKeyBuilder(tags=("users",)))
+    async def list_users_by_cursor(
+        self,
+        users_service: services.UserService,
+        keyset_pagination: Annotated[KeysetPagination, Dependency(skip_validation=True)],
+        filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)],
+    ) -> CursorPagination[schemas.User]:
+        """List users, paging with an opaque cursor instead of an offset."""
+        return await paginate_keyset(users_service, keyset_pagination, *filters, schema_type=schemas.User)
+
+    @get(operation_id="GetUser", name="users:get", path="/api/users/{email:str}", cache=True, cache_key_builder=CacheKeyBuilder(tags=("users", "user:{email}")))
     async def get_user(self, users_service: services.UserService, email: Annotated[str, Parameter(title="User Email", description="The user to retrieve.")]) -> schemas.User:
         """Get a user."""
         db_obj = await users_service.get_one(email=email)
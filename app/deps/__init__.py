@@ -1,22 +1,57 @@
-from .auth import current_user_from_session, provide_user, provide_users_service, requires_active_user, requires_superuser, requires_verified_user, session_auth
+from .accounts import provide_account_id, provide_account_ids
+from .auth import (
+    USER_ERROR_MESSAGES,
+    current_user_from_session,
+    provide_user,
+    provide_users_service,
+    requires_active_user,
+    requires_superuser,
+    requires_verified_user,
+    session_auth,
+)
+from .base import get_request_service
+from .contacts import provide_contacts_service
+from .organizations import provide_organizations_service
+from .reports import provide_report_service
 from .search import (
+    OrderByColumns,
+    TrashedFilter,
     provide_created_filter,
     provide_filter_dependencies,
+    provide_full_text_search,
     provide_id_filter,
+    provide_keyset_pagination,
     provide_limit_offset_pagination,
     provide_order_by,
     provide_search_filter,
+    provide_sortable_order_by,
+    provide_trashed_filter,
     provide_updated_filter,
 )
+from .stats import provide_account_stats_service
 
 __all__ = (
+    "USER_ERROR_MESSAGES",
+    "OrderByColumns",
+    "TrashedFilter",
     "current_user_from_session",
+    "get_request_service",
+    "provide_account_id",
+    "provide_account_ids",
+    "provide_account_stats_service",
+    "provide_contacts_service",
     "provide_created_filter",
     "provide_filter_dependencies",
+    "provide_full_text_search",
     "provide_id_filter",
+    "provide_keyset_pagination",
     "provide_limit_offset_pagination",
     "provide_order_by",
+    "provide_organizations_service",
+    "provide_report_service",
     "provide_search_filter",
+    "provide_sortable_order_by",
+    "provide_trashed_filter",
     "provide_updated_filter",
     "provide_user",
     "provide_users_service",
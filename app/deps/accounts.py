@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from uuid import UUID  # noqa: TC003
+
+from litestar.exceptions import PermissionDeniedException
+from litestar.params import Dependency, Parameter
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: TC002
+
+from database import models as m
+
+
+def provide_account_ids(current_user: m.User) -> Select[tuple[UUID]]:
+    """IDs of the accounts the current user is a member of, as a subquery for ``IN`` filters.
+
+    Scoping with a subquery keeps the membership lookup inside the listing statement, and works for cached users whose
+    ``accounts`` are no longer loadable.
+    """
+    return select(m.AccountMember.account_id).where(m.AccountMember.user_id == current_user.id)
+
+
+async def provide_account_id(
+    db_session: AsyncSession,
+    account_ids: Select[tuple[UUID]] = Dependency(skip_validation=True),
+    requested_account_id: UUID = Parameter(title="Account ID", query="accountId", description="The account to work on."),
+) -> UUID:
+    """The ``accountId`` query parameter, once the current user is known to be a member of that account."""
+    if await db_session.scalar(account_ids.where(m.AccountMember.account_id == requested_account_id)) is None:
+        msg = "You are not a member of this account."
+        raise PermissionDeniedException(detail=msg)
+    return requested_account_id
@@ -10,14 +10,20 @@ from litestar.security.session_auth import SessionAuth
 from litestar_vite.inertia import share
 
 from app import config, schemas, services
+from app.deps.base import get_request_service
+from app.lib.routing import reads_routed
 from database import models as m
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
-
+    from advanced_alchemy.exceptions import ErrorMessages
     from litestar.connection import ASGIConnection, Request
     from litestar.handlers.base import BaseRouteHandler
-    from sqlalchemy.ext.asyncio import AsyncSession
+
+USER_ERROR_MESSAGES: ErrorMessages = {
+    "duplicate_key": "A user with this email already exists",
+    "foreign_key": "A user with this email already exists",
+    "integrity": "User operation failed.",
+}
 
 
 async def provide_user(request: Request[m.User, Any, Any]) -> m.User:
@@ -25,17 +31,9 @@ async def provide_user(request: Request[m.User, Any, Any]) -> m.User:
     return request.user
 
 
-async def provide_users_service(db_session: AsyncSession) -> AsyncGenerator[services.UserService, None]:
-    """Construct repository and service objects for the request."""
-    async with services.UserService.new(
-        session=db_session,
-        error_messages={
-            "duplicate_key": "A user with this email already exists",
-            "foreign_key": "A user with this email already exists",
-            "integrity": "User operation failed.",
-        },
-    ) as service:
-        yield service
+def provide_users_service(request: ASGIConnection[Any, Any, Any, Any]) -> services.UserService:
+    """Provide the request's shared user service."""
+    return get_request_service(request, services.UserService, error_messages=USER_ERROR_MESSAGES)
 
 
 def requires_active_user(connection: ASGIConnection, _: BaseRouteHandler) -> None:
@@ -68,10 +66,19 @@ async def current_user_from_session(session: dict[str, Any], connection: ASGICon
     if (user_id := session.get("user_id")) is None:
         share(connection, "auth", {"isAuthenticated": False})
         return None
-    service = await anext(provide_users_service(config.alchemy.provide_session(connection.app.state, connection.scope)))
-    user = await service.get_one_or_none(email=user_id)
+    if (cached := services.user_cache.get(user_id)) is not None:
+        share(connection, "auth", {"isAuthenticated": True, "user": cached.schema})
+        return cached.user
+    service = provide_users_service(connection)
+    # on a reader, so that a write request does not take the writer until it writes
+    with reads_routed(service.session):
+        user = await service.get_one_or_none(email=user_id)
     if user and user.is_active:
-        share(connection, "auth", {"isAuthenticated": True, "user": service.to_schema(user, schema_type=schemas.User)})
+        cached = services.CachedUser(user=user, schema=service.to_schema(user, schema_type=schemas.User))
+        # shared by later requests, so a rollback of this one must not expire it
+        service.repository.session.expunge(user)
+        services.user_cache.set(user_id, cached)
+        share(connection, "auth", {"isAuthenticated": True, "user": cached.schema})
         return user
     share(connection, "auth", {"isAuthenticated": False})
     return None
@@ -83,6 +90,7 @@ session_auth = SessionAuth[m.User, ServerSideSessionBackend](
     exclude=[
         "^/schema",
         "^/health",
+        "^/ready",
         "^/login",
         "^/register",
     ],
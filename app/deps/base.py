@@ -0,0 +1,29 @@
+"""Request-scoped service construction."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from app import config
+
+if TYPE_CHECKING:
+    from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+    from litestar.connection import ASGIConnection
+
+ServiceT = TypeVar("ServiceT", bound="SQLAlchemyAsyncRepositoryService[Any]")
+
+SERVICES_STATE_KEY = "_request_services"
+
+
+def get_request_service(connection: ASGIConnection[Any, Any, Any, Any], service_type: type[ServiceT], **service_kwargs: Any) -> ServiceT:
+    """Return the instance of ``service_type`` shared by everything handling this request.
+
+    Services are bound to the session ``config.alchemy`` stores in the connection scope, so the auth retrieve handler
+    and every route dependency use one session, which the ``autocommit_include_redirects`` handler commits and closes.
+    """
+    registry: dict[type[Any], Any] = connection.state.setdefault(SERVICES_STATE_KEY, {})
+    service = registry.get(service_type)
+    if service is None:
+        db_session = config.alchemy.provide_session(connection.app.state, connection.scope)
+        service = registry[service_type] = service_type(session=db_session, **service_kwargs)
+    return service
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from app import services
+from app.deps.base import get_request_service
+
+if TYPE_CHECKING:
+    from litestar.connection import ASGIConnection
+
+
+def provide_organizations_service(request: ASGIConnection[Any, Any, Any, Any]) -> services.OrganizationService:
+    """Provide the request's shared organization service."""
+    return get_request_service(request, services.OrganizationService)
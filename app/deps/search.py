@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Literal
+from typing import TYPE_CHECKING, Any, Literal, cast
 from uuid import UUID
 
 from advanced_alchemy.filters import (
@@ -13,14 +14,27 @@ from advanced_alchemy.filters import (
     LimitOffset,
     OrderBy,
     SearchFilter,
+    StatementFilter,
 )
+from litestar.exceptions import ValidationException
 from litestar.params import Dependency, Parameter
+from sqlalchemy import Select
+
+from app import config
+from app.lib.pagination import KeysetPagination, decode_cursor
+from app.lib.search import FullTextSearch
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from advanced_alchemy.filters import StatementTypeT
 
 DTorNone = datetime | None
 StringOrNone = str | None
 UuidOrNone = UUID | None
 BooleanOrNone = bool | None
 SortOrderOrNone = Literal["asc", "desc"] | None
+TrashedOrNone = Literal["with", "only"] | None
 
 
 def provide_id_filter(ids: list[int] | None = Parameter(query="ids", default=None, required=False)) -> CollectionFilter[int]:
@@ -42,6 +56,12 @@ def provide_search_filter(
     return SearchFilter(field_name=field, value=search, ignore_case=ignore_case or False)  # type: ignore[arg-type]
 
 
+def provide_full_text_search(
+    text: StringOrNone = Parameter(title="Search text", query="search", default=None, required=False),
+) -> FullTextSearch:
+    return FullTextSearch(value=text, use_fts=config.alchemy.get_engine().dialect.name == "sqlite")
+
+
 def provide_order_by(
     field_name: StringOrNone = Parameter(title="Order by field", query="orderBy", default="updated_at", required=False),
     sort_order: SortOrderOrNone = Parameter(title="Field to search", query="sortOrder", default="desc", required=False),
@@ -49,6 +69,63 @@ def provide_order_by(
     return OrderBy(field_name=field_name, sort_order=sort_order)  # type: ignore[arg-type]
 
 
+@dataclass
+class OrderByColumns(OrderBy):
+    """Order by the model columns behind a whitelisted ``orderBy`` name."""
+
+    columns: tuple[str, ...] = ()
+
+    def append_to_statement(self, statement: StatementTypeT, model: Any) -> StatementTypeT:
+        if not isinstance(statement, Select):
+            return statement
+        select: Select[Any] = statement
+        for name in self.columns or (self.field_name,):
+            field = self._get_instrumented_attr(model, name)
+            select = select.order_by(field.desc() if self.sort_order == "desc" else field.asc())
+        return cast("StatementTypeT", select)
+
+
+def provide_sortable_order_by(sortable_fields: Mapping[str, tuple[str, ...]], default: str = "updated_at") -> Callable[..., OrderBy]:
+    """Build an ``order_by`` provider only accepting the ``orderBy`` names in ``sortable_fields``.
+
+    Each name maps to the columns it sorts on, which should match an index so sorting never needs a temporary b-tree.
+    """
+
+    def provide_order_by(
+        field_name: StringOrNone = Parameter(title="Order by field", query="orderBy", default=default, required=False),
+        sort_order: SortOrderOrNone = Parameter(title="Field to search", query="sortOrder", default="desc", required=False),
+    ) -> OrderBy:
+        if field_name is None or field_name not in sortable_fields:
+            msg = f"Cannot order by '{field_name}'. Expected one of: {', '.join(sortable_fields)}."
+            raise ValidationException(detail=msg)
+        return OrderByColumns(field_name=field_name, sort_order=sort_order or "desc", columns=sortable_fields[field_name])
+
+    return provide_order_by
+
+
+@dataclass
+class TrashedFilter(StatementFilter):
+    """Hide soft-deleted rows unless ``mode`` asks for them.
+
+    ``None`` keeps live rows only, which the partial ``WHERE deleted_at IS NULL`` listing indexes serve; ``"with"``
+    includes the trash and ``"only"`` shows nothing else. Models without ``deleted_at`` are left unfiltered.
+    """
+
+    mode: TrashedOrNone = None
+
+    def append_to_statement(self, statement: StatementTypeT, model: Any) -> StatementTypeT:
+        deleted_at = getattr(model, "deleted_at", None)
+        if deleted_at is None or self.mode == "with":
+            return statement
+        return cast("StatementTypeT", statement.where(deleted_at.is_not(None) if self.mode == "only" else deleted_at.is_(None)))
+
+
+def provide_trashed_filter(
+    trashed: TrashedOrNone = Parameter(title="Include trashed rows", query="trashed", default=None, required=False),
+) -> TrashedFilter:
+    return TrashedFilter(mode=trashed)
+
+
 def provide_updated_filter(
     before: DTorNone = Parameter(query="updatedBefore", default=None, required=False),
     after: DTorNone = Parameter(query="updatedAfter", default=None, required=False),
@@ -63,6 +140,22 @@ def provide_limit_offset_pagination(
     return LimitOffset(page_size, page_size * (current_page - 1))
 
 
+def provide_keyset_pagination(
+    cursor: StringOrNone = Parameter(title="Pagination cursor", query="cursor", default=None, required=False),
+    page_size: int = Parameter(query="pageSize", ge=1, default=10, required=False),
+    field_name: StringOrNone = Parameter(title="Order by field", query="orderBy", default="updated_at", required=False),
+    sort_order: SortOrderOrNone = Parameter(title="Field to search", query="sortOrder", default="desc", required=False),
+    skip_total: bool = Parameter(title="Skip the total count", query="skipTotal", default=False, required=False),
+) -> KeysetPagination:
+    if cursor is not None:
+        field_name, sort_order, direction, values = decode_cursor(cursor)
+        return KeysetPagination(page_size, field_name, sort_order, direction, values, include_total=not skip_total)
+    if field_name not in {"created_at", "updated_at"}:
+        msg = "Cursor pagination can only order by 'created_at' or 'updated_at'."
+        raise ValidationException(detail=msg)
+    return KeysetPagination(page_size, field_name, sort_order or "desc", include_total=not skip_total)  # type: ignore[arg-type]
+
+
 def provide_filter_dependencies(
     created_filter: BeforeAfter = Dependency(skip_validation=True),
     updated_filter: BeforeAfter = Dependency(skip_validation=True),
@@ -0,0 +1,77 @@
+"""Batch mutation payloads and per-item results."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, TypeVar
+from uuid import UUID  # noqa: TC003
+
+import msgspec
+from litestar.exceptions import ValidationException
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+
+T = TypeVar("T", bound=msgspec.Struct)
+
+__all__ = ("BatchDelete", "BatchItemError", "BatchResult", "BatchUpdate", "check_batch_size", "id_results", "validate_items")
+
+
+class BatchUpdate(msgspec.Struct, rename="camel"):
+    """Changes for many rows. Items are validated one by one, so a bad item does not reject the others."""
+
+    items: list[dict[str, Any]]
+
+
+class BatchDelete(msgspec.Struct, rename="camel"):
+    """Rows to delete, or to restore from the trash."""
+
+    ids: list[UUID]
+
+
+class BatchItemError(msgspec.Struct, rename="camel"):
+    index: int
+    """Position of the item in the request."""
+    error: str
+    id: UUID | None = None
+
+
+class BatchResult(msgspec.Struct, rename="camel"):
+    succeeded: list[UUID] = []
+    failed: list[BatchItemError] = []
+
+
+def check_batch_size(size: int, max_size: int) -> None:
+    """Reject batches larger than ``max_size``.
+
+    Raises:
+        ValidationException: the batch is too large.
+    """
+    if size > max_size:
+        msg = f"Batches are limited to {max_size} items, got {size}."
+        raise ValidationException(detail=msg)
+
+
+def validate_items(items: Sequence[dict[str, Any]], item_type: type[T]) -> tuple[dict[UUID, tuple[int, T]], list[BatchItemError]]:
+    """Convert each raw item to ``item_type``, keyed by its ``id``; invalid and repeated items become errors."""
+    valid: dict[UUID, tuple[int, T]] = {}
+    errors: list[BatchItemError] = []
+    for index, raw in enumerate(items):
+        try:
+            item = msgspec.convert(raw, item_type)
+        except msgspec.ValidationError as exc:
+            errors.append(BatchItemError(index=index, error=str(exc)))
+            continue
+        item_id: UUID = item.id  # type: ignore[attr-defined]
+        if item_id in valid:
+            errors.append(BatchItemError(index=index, id=item_id, error="Duplicate id in batch"))
+            continue
+        valid[item_id] = (index, item)
+    return valid, errors
+
+
+def id_results(ids: Sequence[UUID], done: Collection[UUID]) -> BatchResult:
+    """Report each of ``ids`` as succeeded when it is in ``done`` and as not found otherwise."""
+    return BatchResult(
+        succeeded=[item_id for item_id in dict.fromkeys(ids) if item_id in done],
+        failed=[BatchItemError(index=index, id=item_id, error="Not found") for index, item_id in enumerate(ids) if item_id not in done],
+    )
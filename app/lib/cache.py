@@ -0,0 +1,128 @@
+"""In-process caching primitives."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+K = TypeVar("K", bound="Hashable")
+V = TypeVar("V")
+
+__all__ = ("CacheStats", "TTLCache")
+
+
+@dataclass
+class CacheStats:
+    """Counters for a single cache instance."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, int | float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hitRatio": round(self.hit_ratio, 4),
+        }
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache where every entry also expires after ``ttl`` seconds.
+
+    With an ``index``, entries can also be dropped by the index key it gives their value, without scanning the cache.
+
+    The cache is meant to be used from the event loop thread only and does no locking.
+    """
+
+    __slots__ = ("_clock", "_data", "_index", "_indexed", "maxsize", "stats", "ttl")
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic, index: Callable[[V], Hashable] | None = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._index = index
+        self._indexed: dict[Hashable, set[K]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > self._clock()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value, or ``None`` when missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value, evicting the least recently used entries when full."""
+        if self.maxsize <= 0:
+            return
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        if self._index is not None:
+            self._indexed.setdefault(self._index(value), set()).add(key)
+        while len(self._data) > self.maxsize:
+            self._remove(next(iter(self._data)))
+            self.stats.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        """Remove a single entry and return it."""
+        if key not in self._data:
+            return None
+        self.stats.invalidations += 1
+        return self._remove(key)
+
+    def discard_indexed(self, index_key: Hashable) -> int:
+        """Remove every entry whose value has ``index_key`` as its index key and return how many were dropped."""
+        keys = list(self._indexed.get(index_key, ()))
+        for key in keys:
+            self._remove(key)
+        self.stats.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self.stats.invalidations += len(self._data)
+        self._data.clear()
+        self._indexed.clear()
+
+    def _remove(self, key: K) -> V:
+        _, value = self._data.pop(key)
+        if self._index is not None:
+            index_key = self._index(value)
+            keys = self._indexed[index_key]
+            keys.discard(key)
+            if not keys:
+                del self._indexed[index_key]
+        return value
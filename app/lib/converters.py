@@ -0,0 +1,139 @@
+"""Compiled conversion of ORM instances to msgspec structs.
+
+``msgspec.convert(obj, type, from_attributes=True)`` reads every field through the instrumented attribute and
+validates it, on every call. The converters here are generated once per ``(model, struct)`` pair: they read loaded
+columns and relationships straight from the instance ``__dict__`` and call the converters of related models, so a page
+of rows costs little more than building its structs. ORM data is already typed by its columns, so values are not
+validated again.
+
+When an attribute is not loaded, the converter falls back to reading the fields one by one: unloaded relationships get
+the field's default, as with ``msgspec.convert``, and other attributes are read normally.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+
+import msgspec
+from msgspec import inspect as mi
+from sqlalchemy import inspect
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+T = TypeVar("T", bound=msgspec.Struct)
+
+__all__ = ("get_converter", "is_mapped", "register_attributes", "to_struct", "to_structs")
+
+_attributes: dict[type[msgspec.Struct], dict[str, str]] = {}
+_converters: dict[tuple[type[Any], type[msgspec.Struct]], Callable[[Any], Any]] = {}
+
+
+def register_attributes(struct_type: type[msgspec.Struct], **attributes: str) -> None:
+    """Read the fields named as keywords from differently named model attributes, e.g. ``team_id="account_id"``."""
+    _attributes[struct_type] = attributes
+    for key in [key for key in _converters if key[1] is struct_type]:
+        del _converters[key]
+
+
+def is_mapped(obj: Any) -> bool:
+    """Whether ``obj`` is an instance of a mapped class."""
+    return hasattr(type(obj), "__mapper__")
+
+
+def _converted(info: mi.Type, target: type[Any] | None) -> tuple[str, Callable[[Any], Any]] | None:
+    """An expression converting ``v`` to a field of type ``info`` with the callable it names ``f``, or ``None`` to keep ``v``.
+
+    ``target`` is the related model when the field is read from a relationship.
+    """
+    optional = False
+    if isinstance(info, mi.UnionType):
+        types = [t for t in info.types if not isinstance(t, mi.NoneType)]
+        if len(types) == 1:
+            optional = len(types) < len(info.types)
+            info = types[0]
+    if isinstance(info, mi.ListType) and isinstance(info.item_type, mi.StructType):
+        struct_type, expression = info.item_type.cls, "[f(i) for i in v]"
+    elif isinstance(info, mi.StructType):
+        struct_type, expression = info.cls, "f(v)"
+    elif isinstance(info, mi.EnumType) and issubclass(info.cls, Enum):
+        return ("None if v is None else f(v)" if optional else "f(v)"), info.cls
+    else:
+        return None
+    convert = get_converter(target, struct_type) if target is not None else (lambda v: msgspec.convert(v, struct_type, from_attributes=True))
+    return ("None if v is None else " + expression if optional else expression), convert
+
+
+def _compile(model: type[Any], struct_type: type[msgspec.Struct]) -> Callable[[Any], Any]:
+    mapper = inspect(model)
+    renames = _attributes.get(struct_type, {})
+    namespace: dict[str, Any] = {"S": struct_type}
+    lines: list[str] = []
+    arguments: list[str] = []
+    plan: list[tuple[str, str, bool, bool, str | None]] = []
+    for index, field in enumerate(cast("mi.StructType", mi.type_info(struct_type)).fields):
+        attribute = renames.get(field.name, field.name)
+        relationship = mapper.relationships.get(attribute)
+        mapped = relationship is not None or attribute in mapper.column_attrs
+        if not mapped and not hasattr(model, attribute):
+            continue
+        value = f"d[{attribute!r}]" if mapped else f"o.{attribute}"
+        helper = None
+        if (converted := _converted(field.type, relationship.mapper.class_ if relationship is not None else None)) is not None:
+            helper = f"v{index}"
+            expression, namespace[f"f{index}"] = converted
+            lines.append(f"def {helper}(v, f=f{index}):\n    return {expression}\n")
+            value = f"{helper}({value})"
+        arguments.append(f"{field.name}={value}")
+        plan.append((field.name, attribute, mapped, relationship is not None, helper))
+
+    def slow(obj: Any) -> Any:
+        loaded = obj.__dict__
+        kwargs: dict[str, Any] = {}
+        for name, attribute, mapped, is_relationship, helper in plan:
+            if mapped and attribute in loaded:
+                value = loaded[attribute]
+            elif is_relationship:
+                continue
+            elif mapped:
+                value = getattr(obj, attribute)
+            else:
+                try:
+                    value = getattr(obj, attribute)
+                except AttributeError:
+                    continue
+            kwargs[name] = value if helper is None else namespace[helper](value)
+        return struct_type(**kwargs)
+
+    namespace["slow"] = slow
+    lines.append(f"def convert(o):\n    d = o.__dict__\n    try:\n        return S({', '.join(arguments)})\n    except KeyError:\n        return slow(o)\n")
+    exec("\n".join(lines), namespace)  # noqa: S102
+    convert: Callable[[Any], Any] = namespace["convert"]
+    return convert
+
+
+def get_converter(model: type[Any], struct_type: type[T]) -> Callable[[Any], T]:
+    """The converter of ``model`` instances to ``struct_type``, compiled on first use."""
+    key = (model, struct_type)
+    if (converter := _converters.get(key)) is None:
+        converter = _converters[key] = _compile(model, struct_type)
+    return converter
+
+
+def to_struct(obj: Any, struct_type: type[T]) -> T:
+    """Convert an ORM instance, or anything else ``msgspec.convert`` reads attributes from, to ``struct_type``."""
+    if is_mapped(obj):
+        return get_converter(type(obj), struct_type)(obj)
+    return msgspec.convert(obj, struct_type, from_attributes=True)
+
+
+def to_structs(objs: Iterable[Any], struct_type: type[T]) -> list[T]:
+    """Convert a batch of rows, compiling or looking up the converter once per model."""
+    converters: dict[type[Any], Callable[[Any], T]] = {}
+    items = []
+    for obj in objs:
+        if (converter := converters.get(model := type(obj))) is None:
+            converter = converters[model] = get_converter(model, struct_type) if is_mapped(obj) else (lambda o: msgspec.convert(o, struct_type, from_attributes=True))
+        items.append(converter(obj))
+    return items
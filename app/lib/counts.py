@@ -0,0 +1,106 @@
+"""Cached row counts, invalidated by per-table write generations."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from advanced_alchemy.filters import OrderBy, PaginationFilter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from app.lib.cache import CacheStats, TTLCache
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+
+__all__ = ("CountCache", "WriteGenerations")
+
+PENDING_WRITES_KEY = "_pending_table_writes"
+"""``Session.info`` key holding the tables written in the current transaction."""
+_OPTION_KWARGS = frozenset(
+    {"auto_expunge", "count_with_window_function", "error_messages", "execution_options", "force_basic_query_mode", "load", "order_by", "uniquify", "use_cache"},
+)
+"""Service keyword arguments that change how rows are loaded, not which rows match."""
+
+
+class WriteGenerations:
+    """A counter per table, bumped on every write to it."""
+
+    __slots__ = ("_generations",)
+
+    def __init__(self) -> None:
+        self._generations: dict[str, int] = {}
+
+    def __getitem__(self, table: str) -> int:
+        return self._generations.get(table, 0)
+
+    def bump(self, table: str) -> int:
+        self._generations[table] = generation = self[table] + 1
+        return generation
+
+
+class CountCache:
+    """Totals for ``list_and_count``, keyed by table, write generation and the normalized filter set.
+
+    Pagination and ordering filters do not change a total, so they are left out of the key and paging through the same
+    filtered list reuses one count. A write bumps the table's generation, which makes every cached count for the table
+    unreachable; stale entries then age out of the LRU. Generations are per process, so with several workers a count
+    written elsewhere may be served for up to ``ttl`` seconds.
+    """
+
+    __slots__ = ("_cache", "generations")
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.generations = WriteGenerations()
+        self._cache: TTLCache[Hashable, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def key(self, table: str, filters: Sequence[Any], kwargs: dict[str, Any]) -> tuple[str, int, tuple[str, ...]]:
+        return (table, self.generations[table], normalize_filters(filters, kwargs))
+
+    def get(self, key: Hashable) -> int | None:
+        return self._cache.get(key)
+
+    def set(self, key: Hashable, total: int) -> None:
+        self._cache.set(key, total)
+
+    def written(self, table: str, session: Session | None = None) -> None:
+        """Record a write to ``table``.
+
+        The generation is bumped right away, and once more when ``session`` commits, so a count taken by another
+        request before the commit is not kept.
+        """
+        self.generations.bump(table)
+        if session is not None:
+            session.info.setdefault(PENDING_WRITES_KEY, set()).add(table)
+
+    def listen(self) -> None:
+        """Bump the generations of tables written in a transaction once it commits."""
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    def _after_commit(self, session: Session) -> None:
+        for table in session.info.pop(PENDING_WRITES_KEY, ()):
+            self.generations.bump(table)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(PENDING_WRITES_KEY, None)
+
+
+def normalize_filters(filters: Sequence[Any], kwargs: dict[str, Any]) -> tuple[str, ...]:
+    """Return an order-independent key for the rows selected by ``filters`` and keyword column filters."""
+    parts = []
+    for f in filters:
+        if isinstance(f, (PaginationFilter, OrderBy)):
+            continue
+        if isinstance(f, ColumnElement):
+            compiled = f.compile()
+            parts.append(f"{compiled}|{sorted(compiled.params.items())!r}")
+        else:
+            parts.append(repr(f))
+    parts.extend(f"{name}={value!r}" for name, value in kwargs.items() if name not in _OPTION_KWARGS)
+    return tuple(sorted(parts))
@@ -0,0 +1,76 @@
+"""Readiness probes whose results are cached, so probing often does not add load.
+
+A probe runs its check at most once per ``interval``: callers within it get the last result, and callers arriving while
+a check runs wait for that same run. A check that raises or exceeds ``timeout`` reports the probe as failing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+__all__ = ("CachedProbe", "ProbeResult")
+
+
+@dataclass
+class ProbeResult:
+    ok: bool
+    latency: float
+    """Seconds the check took."""
+    checked_at: float
+    """``time.monotonic()`` when the check finished."""
+    error: str | None = None
+    details: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "latencyMs": round(self.latency * 1000, 3),
+            "ageMs": round((time.monotonic() - self.checked_at) * 1000, 3),
+            **({"error": self.error} if self.error is not None else {}),
+            **self.details,
+        }
+
+
+class CachedProbe:
+    """A check run at most once per ``interval`` seconds, its result shared by every caller meanwhile.
+
+    The check returns details to report, and fails the probe by raising or by returning ``ok=False`` among them.
+    """
+
+    def __init__(self, check: Callable[..., Awaitable[dict[str, Any] | None]], interval: float, timeout: float) -> None:
+        self.check = check
+        self.interval = interval
+        self.timeout = timeout
+        self.runs = 0
+        self._last: ProbeResult | None = None
+        self._running: asyncio.Future[ProbeResult] | None = None
+
+    async def result(self, *args: Any) -> ProbeResult:
+        """The last result while it is fresh, else the result of a new run of the check with ``args``."""
+        if self._last is not None and time.monotonic() - self._last.checked_at < self.interval:
+            return self._last
+        if self._running is None:
+            self._running = asyncio.ensure_future(self._run(*args))
+        return await asyncio.shield(self._running)
+
+    async def _run(self, *args: Any) -> ProbeResult:
+        self.runs += 1
+        started = time.monotonic()
+        try:
+            details = await asyncio.wait_for(self.check(*args), self.timeout) or {}
+            ok, error = bool(details.pop("ok", True)), None
+        except TimeoutError:
+            details, ok, error = {}, False, f"timed out after {self.timeout:g}s"
+        except Exception as exc:  # noqa: BLE001
+            details, ok, error = {}, False, f"{type(exc).__name__}: {exc}"
+        finally:
+            self._running = None
+        finished = time.monotonic()
+        self._last = ProbeResult(ok=ok, latency=finished - started, checked_at=finished, error=error, details=details)
+        return self._last
@@ -0,0 +1,165 @@
+"""Streaming CSV/NDJSON ingestion with bounded memory."""
+
+from __future__ import annotations
+
+import codecs
+import csv
+from typing import TYPE_CHECKING, Any, Literal, Protocol, TypeVar
+
+import msgspec
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Callable
+    from pathlib import Path
+
+T = TypeVar("T", bound=msgspec.Struct)
+ImportFormat = Literal["csv", "ndjson"]
+
+__all__ = ("ImportFormat", "ImportReport", "Importer", "RowError", "decode_rows", "guess_format", "iter_lines", "read_file", "run_import")
+
+
+class RowError(msgspec.Struct, rename="camel"):
+    line: int
+    """1-based line of the file where the row starts."""
+    error: str
+
+
+class ImportReport(msgspec.Struct, rename="camel"):
+    """Outcome of an import. Only the first ``max_errors`` row errors are kept; ``failed`` counts all of them."""
+
+    created: int = 0
+    failed: int = 0
+    errors: list[RowError] = []
+    max_errors: int = 100
+
+    def add_error(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(RowError(line=line, error=error))
+
+
+class Importer(Protocol[T]):
+    """Writes validated rows of one model."""
+
+    @property
+    def row_type(self) -> type[T]:
+        """The struct each row is decoded and validated into."""
+        ...
+
+    async def write(self, rows: list[T]) -> int:
+        """Insert ``rows`` and return how many were created."""
+        ...
+
+
+def guess_format(name: str | None) -> ImportFormat:
+    """Pick the format from a file name or content type, defaulting to CSV."""
+    name = (name or "").lower()
+    return "ndjson" if any(marker in name for marker in ("ndjson", "jsonl", "json-seq", "x-json-stream")) else "csv"
+
+
+async def read_file(path: Path, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Read ``path`` in fixed-size chunks."""
+    import anyio
+
+    async with await anyio.open_file(path, "rb") as file:
+        while chunk := await file.read(chunk_size):
+            yield chunk
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Split a UTF-8 byte stream into numbered lines, without holding more than one partial line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    number = 0
+    async for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            number += 1
+            yield number, line.removesuffix("\r")
+    if pending := pending + decoder.decode(b"", final=True):
+        yield number + 1, pending.removesuffix("\r")
+
+
+async def iter_csv_records(lines: AsyncIterable[tuple[int, str]], max_record_lines: int = 1000) -> AsyncIterator[tuple[int, list[str] | None]]:
+    """Join lines until their quotes balance, so quoted fields may span lines, and parse each record.
+
+    A record still open after ``max_record_lines`` lines is given up on and yielded as ``None``, so a stray quote cannot
+    pull the rest of the file into memory.
+    """
+    buffered: list[str] = []
+    start = quotes = 0
+    async for number, line in lines:
+        if not buffered:
+            start = number
+        buffered.append(line)
+        quotes += line.count('"')
+        if quotes % 2 and len(buffered) < max_record_lines:
+            continue
+        yield start, None if quotes % 2 else next(csv.reader(["\n".join(buffered)]))
+        buffered.clear()
+        quotes = 0
+    if buffered:
+        yield start, None
+
+
+async def decode_rows(chunks: AsyncIterable[bytes], row_type: type[T], fmt: ImportFormat) -> AsyncIterator[tuple[int, T | str]]:
+    """Yield ``(line, row)`` for every row of the stream, or ``(line, message)`` when it does not validate.
+
+    CSV files start with a header naming the fields; empty cells count as missing. NDJSON holds one object per line.
+    """
+    if fmt == "ndjson":
+        decoder = msgspec.json.Decoder(row_type)
+        async for number, line in iter_lines(chunks):
+            if not line.strip():
+                continue
+            try:
+                yield number, decoder.decode(line)
+            except msgspec.DecodeError as exc:
+                yield number, str(exc)
+        return
+    header: list[str] | None = None
+    async for number, record in iter_csv_records(iter_lines(chunks)):
+        if record is None:
+            yield number, "Unterminated quoted field"
+            continue
+        if not any(record):
+            continue
+        if header is None:
+            header = [name.strip() for name in record]
+            continue
+        try:
+            yield number, msgspec.convert({name: value for name, value in zip(header, record, strict=False) if value != ""}, row_type, strict=False)
+        except msgspec.ValidationError as exc:
+            yield number, str(exc)
+
+
+async def run_import(
+    importer: Importer[Any],
+    chunks: AsyncIterable[bytes],
+    fmt: ImportFormat,
+    *,
+    chunk_size: int,
+    max_errors: int,
+    on_progress: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """Validate and write a stream ``chunk_size`` rows at a time.
+
+    Only one chunk of rows is held at once, so memory does not grow with the size of the file.
+    """
+    report = ImportReport(max_errors=max_errors)
+    batch: list[Any] = []
+    async for line, row in decode_rows(chunks, importer.row_type, fmt):
+        if isinstance(row, str):
+            report.add_error(line, row)
+            continue
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            report.created += await importer.write(batch)
+            batch = []
+            if on_progress is not None:
+                on_progress(report)
+    if batch:
+        report.created += await importer.write(batch)
+    if on_progress is not None:
+        on_progress(report)
+    return report
@@ -0,0 +1,175 @@
+"""Keyset (cursor) pagination."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, cast
+from urllib.parse import urlencode
+from uuid import UUID
+
+import msgspec
+from advanced_alchemy.filters import LimitOffset, OrderBy, PaginationFilter
+from litestar.exceptions import ValidationException
+from litestar.serialization import decode_json, encode_json
+from sqlalchemy import Select, bindparam, tuple_
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from advanced_alchemy.filters import StatementFilter, StatementTypeT
+    from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+    from litestar import Request
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+KeysetField = Literal["created_at", "updated_at"]
+SortOrder = Literal["asc", "desc"]
+Direction = Literal["next", "prev"]
+_KEY_COUNTS: dict[str, int] = {"created_at": 0, "updated_at": 1}
+"""Number of values a cursor holds before the id, per ``order_by``."""
+
+__all__ = ("CursorPagination", "KeysetPagination", "decode_cursor", "encode_cursor", "page_links", "paginate_keyset")
+
+
+class CursorPagination(msgspec.Struct, Generic[T], rename="camel"):
+    """Container for data returned using keyset pagination."""
+
+    items: Sequence[T]
+    """List of data being sent as part of the response."""
+    limit: int
+    """Maximal number of items to send."""
+    next_cursor: str | None = None
+    """Opaque cursor for the following page, if there is one."""
+    prev_cursor: str | None = None
+    """Opaque cursor for the preceding page, if there is one."""
+    total: int | None = None
+    """Total number of items, unless the count was skipped."""
+
+
+@dataclass
+class KeysetPagination(PaginationFilter):
+    """Seek past the last row seen instead of using ``OFFSET``.
+
+    Ordering on ``created_at`` only uses the primary key: ``UUIDv7AuditBase`` ids are time ordered, so the id alone is a
+    stable, unique and indexed creation order. ``updated_at`` is paired with the id as a tie breaker.
+    """
+
+    limit: int
+    order_by: KeysetField = "updated_at"
+    sort_order: SortOrder = "desc"
+    direction: Direction = "next"
+    values: tuple[Any, ...] | None = None
+    include_total: bool = True
+
+    @property
+    def descending(self) -> bool:
+        return (self.sort_order == "desc") != (self.direction == "prev")
+
+    def columns(self, model: Any) -> list[InstrumentedAttribute[Any]]:
+        if self.order_by == "created_at":
+            return [model.id]
+        return [self._get_instrumented_attr(model, self.order_by), model.id]
+
+    def append_to_statement(self, statement: StatementTypeT, model: Any) -> StatementTypeT:
+        if not isinstance(statement, Select):
+            return statement
+        columns = self.columns(model)
+        select: Select[Any] = statement
+        if self.values is not None:
+            select = select.where(self._seek(columns, self.values))
+        ordering = [column.desc() if self.descending else column.asc() for column in columns]
+        return cast("StatementTypeT", select.order_by(*ordering).limit(self.limit + 1))
+
+    def _seek(self, columns: list[InstrumentedAttribute[Any]], values: tuple[Any, ...]) -> ColumnElement[bool]:
+        if len(columns) == 1:
+            seek: ColumnElement[bool] = columns[0] < values[0] if self.descending else columns[0] > values[0]
+            return seek
+        left = tuple_(*columns)
+        right = tuple_(*(bindparam(None, value, type_=column.type) for column, value in zip(columns, values, strict=True)))
+        return left < right if self.descending else left > right
+
+    def cursor_for(self, item: Any, direction: Direction) -> str:
+        values = [getattr(item, column.key) for column in self.columns(type(item))]
+        return encode_cursor(self.order_by, self.sort_order, direction, values)
+
+
+def encode_cursor(order_by: KeysetField, sort_order: SortOrder, direction: Direction, values: Sequence[Any]) -> str:
+    payload = {"o": order_by, "s": sort_order, "d": direction, "v": [value.hex if isinstance(value, UUID) else value for value in values]}
+    return base64.urlsafe_b64encode(encode_json(payload)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[KeysetField, SortOrder, Direction, tuple[Any, ...]]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        ValidationException: the cursor is malformed.
+    """
+    try:
+        return _parse_cursor(decode_json(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))))
+    except (binascii.Error, KeyError, TypeError, ValueError) as exc:
+        msg = "Invalid pagination cursor."
+        raise ValidationException(detail=msg) from exc
+
+
+def _parse_cursor(payload: Any) -> tuple[KeysetField, SortOrder, Direction, tuple[Any, ...]]:
+    order_by, sort_order, direction, raw = payload["o"], payload["s"], payload["d"], payload["v"]
+    if order_by not in _KEY_COUNTS or sort_order not in {"asc", "desc"} or direction not in {"next", "prev"}:
+        raise ValueError(order_by)
+    # one value per column of ``KeysetPagination.columns``, or the seek compares and binds the wrong ones
+    if not isinstance(raw, list) or len(raw) != _KEY_COUNTS[order_by] + 1:
+        raise ValueError(raw)
+    *keys, id_value = raw
+    return order_by, sort_order, direction, (*(datetime.fromisoformat(key) for key in keys), UUID(id_value))
+
+
+async def paginate_keyset(
+    service: SQLAlchemyAsyncRepositoryService[Any],
+    pagination: KeysetPagination,
+    *filters: StatementFilter | ColumnElement[bool],
+    schema_type: type[T],
+    **kwargs: Any,
+) -> CursorPagination[T]:
+    """List one page of ``service`` rows using keyset pagination.
+
+    ``LimitOffset`` and ``OrderBy`` filters are ignored, so the shared ``filters`` dependency can be passed as is.
+    """
+    filters = tuple(f for f in filters if not isinstance(f, (LimitOffset, OrderBy)))
+    rows = list(await service.list(*filters, pagination, **kwargs))
+    has_more = len(rows) > pagination.limit
+    rows = rows[: pagination.limit]
+    if pagination.direction == "prev":
+        rows.reverse()
+    total = await service.count(*filters, **kwargs) if pagination.include_total else None
+    next_cursor = prev_cursor = None
+    if rows:
+        more_after = has_more if pagination.direction == "next" else pagination.values is not None
+        more_before = has_more if pagination.direction == "prev" else pagination.values is not None
+        next_cursor = pagination.cursor_for(rows[-1], "next") if more_after else None
+        prev_cursor = pagination.cursor_for(rows[0], "prev") if more_before else None
+    return CursorPagination[T](
+        items=service.to_schema(rows, schema_type=schema_type).items if rows else [],
+        limit=pagination.limit,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        total=total,
+    )
+
+
+def page_links(request: Request[Any, Any, Any], pagination: LimitOffset, total: int, window: int = 3) -> list[dict[str, Any]]:
+    """Previous, numbered and next page links, in the shape the ``Pagination`` page component renders."""
+    pages = max(1, math.ceil(total / pagination.limit))
+    current = pagination.offset // pagination.limit + 1
+    query = {name: value for name, value in request.query_params.items() if name != "currentPage"}
+
+    def url(page: int) -> str | None:
+        return f"{request.url.path}?{urlencode({**query, 'currentPage': page})}" if 1 <= page <= pages else None
+
+    links = [{"url": url(current - 1), "label": "&laquo; Previous", "active": False}]
+    links.extend({"url": url(page), "label": str(page), "active": page == current} for page in range(max(1, current - window), min(pages, current + window) + 1))
+    links.append({"url": url(current + 1), "label": "Next &raquo;", "active": False})
+    return links
@@ -0,0 +1,44 @@
+"""Query plan inspection."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Select, literal_column, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncConnection
+    from sqlalchemy.sql.compiler import SQLCompiler
+
+__all__ = ("ExplainQueryPlan", "explain_query_plan", "needs_sort")
+
+
+class ExplainQueryPlan(Executable, ClauseElement):
+    """``EXPLAIN QUERY PLAN`` for a statement, with its parameters bound as usual (SQLite only).
+
+    The statement is wrapped in ``SELECT * FROM (...)`` so its typed result columns do not try to process the plan
+    rows; the plan still lists the steps of the wrapped query.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement: Select[Any] = select(literal_column("*")).select_from(statement.subquery())
+
+
+@compiles(ExplainQueryPlan, "sqlite")
+def _compile_explain_query_plan(element: ExplainQueryPlan, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"EXPLAIN QUERY PLAN {compiler.process(element.statement, **kw)}"
+
+
+async def explain_query_plan(connection: AsyncConnection, statement: Select[Any]) -> list[str]:
+    """Return the plan steps SQLite chose for ``statement``."""
+    result = await connection.execute(ExplainQueryPlan(statement))
+    return [row[-1] for row in result]
+
+
+def needs_sort(plan: list[str]) -> bool:
+    """Whether the plan sorts rows itself instead of reading them in index order."""
+    return any("USE TEMP B-TREE FOR" in step and "ORDER BY" in step for step in plan)
@@ -0,0 +1,90 @@
+"""Connection pool instrumentation: how long checkouts wait, how often they time out, and what the pools hold."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.pool import PoolProxiedConnection
+
+__all__ = ("InstrumentedQueuePool", "PoolStats", "pool_stats")
+
+
+@dataclass
+class PoolStats:
+    """Checkouts of a pool since it was created, kept across ``dispose()``."""
+
+    checkouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    timeouts: int = 0
+    connects: int = 0
+    overflow_peak: int = 0
+
+    def to_dict(self) -> dict[str, int | float]:
+        return {
+            "checkouts": self.checkouts,
+            "waitAvgMs": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "waitMaxMs": round(self.wait_max * 1000, 3),
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "overflowPeak": self.overflow_peak,
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """An asyncio queue pool recording in :attr:`stats` the wait of every checkout, the timeouts and the overflow."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        wait = time.perf_counter() - start
+        stats = self.stats
+        stats.checkouts += 1
+        stats.wait_total += wait
+        stats.wait_max = max(stats.wait_max, wait)
+        stats.overflow_peak = max(stats.overflow_peak, self.overflow())
+        return connection
+
+    def _create_connection(self) -> Any:
+        self.stats.connects += 1
+        return super()._create_connection()
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        pool.stats = self.stats  # type: ignore[attr-defined]
+        return pool
+
+
+def pool_stats(engines: Mapping[str, AsyncEngine]) -> dict[str, dict[str, Any]]:
+    """The live usage and checkout statistics of the pool of each named engine; engines shared under several names are reported once."""
+    report: dict[str, dict[str, Any]] = {}
+    seen: set[int] = set()
+    for name, engine in engines.items():
+        pool = engine.sync_engine.pool
+        if id(pool) in seen:
+            continue
+        seen.add(id(pool))
+        entry: dict[str, Any] = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry |= {"size": pool.size(), "inUse": pool.checkedout(), "idle": pool.checkedin(), "overflow": max(pool.overflow(), 0)}
+        if isinstance(pool, InstrumentedQueuePool):
+            entry |= pool.stats.to_dict()
+        report[name] = entry
+    return report
@@ -0,0 +1,240 @@
+"""SQL statement counting, and timing of the statements each request makes."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Self, cast
+
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.middleware import AbstractMiddleware
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from litestar.types import ASGIApp, HTTPScope, Message, Receive, Scope, Send
+    from sqlalchemy.engine import Connection, Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = ("QueryTimer", "QueryTimingMiddleware", "RequestQueries", "SlowQuery", "StatementCounter")
+
+logger = logging.getLogger("app.sql")
+slow_logger = logging.getLogger("app.sql.slow")
+
+
+class StatementCounter:
+    """Record the statements an engine sends to the database while the counter is active.
+
+    Usable as a context manager, or started and stopped around a span of work::
+
+        with StatementCounter(engine) as counter:
+            ...
+        assert counter.count == 1
+    """
+
+    __slots__ = ("_engine", "statements")
+
+    def __init__(self, engine: Engine | AsyncEngine) -> None:
+        self._engine = getattr(engine, "sync_engine", engine)
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def start(self) -> None:
+        self.statements.clear()
+        event.listen(self._engine, "before_cursor_execute", self._record)
+
+    def stop(self) -> None:
+        event.remove(self._engine, "before_cursor_execute", self._record)
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None) -> None:
+        self.stop()
+
+    def _record(self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        self.statements.append(statement)
+
+
+@dataclass
+class RequestQueries:
+    """The statements a request sent to the database, and how long they took."""
+
+    method: str
+    path: str
+    count: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.slowest:
+            self.slowest, self.slowest_statement = elapsed, statement
+
+    def server_timing(self) -> str:
+        """A ``Server-Timing`` header value: total database time with the query count, and the slowest statement."""
+        return f'db;dur={self.total * 1000:.2f};desc="{self.count} queries", db-slowest;dur={self.slowest * 1000:.2f}'
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "queries": self.count,
+            "dbMs": round(self.total * 1000, 3),
+            "slowestMs": round(self.slowest * 1000, 3),
+            "slowestStatement": self.slowest_statement,
+        }
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    elapsed: float
+    method: str | None
+    path: str | None
+    plan: list[str] = field(default_factory=list)
+    logged_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "ms": round(self.elapsed * 1000, 3),
+            "method": self.method,
+            "path": self.path,
+            "plan": self.plan,
+            "loggedAt": self.logged_at,
+        }
+
+
+_request_queries: ContextVar[RequestQueries | None] = ContextVar("request_queries", default=None)
+_STARTED_KEY = "query_timer_started"
+_EXPLAINING_KEY = "query_timer_explaining"
+_EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+_MAX_PLANS = 1000
+
+
+class QueryTimer:
+    """Times the statements of instrumented engines, attributing them to the request being served.
+
+    Only a ``sample_rate`` share of requests is attributed; the statements of the others are only timed against the
+    slow-query threshold.
+    Statements slower than ``slow_threshold`` seconds, timed or not, are logged with their plan to ``app.sql.slow``
+    and kept in :attr:`slow_queries`; the plan of a statement is captured at most once per ``explain_interval``
+    seconds.
+    """
+
+    def __init__(self, sample_rate: float, slow_threshold: float, slow_log_size: int, explain_interval: float = 300.0) -> None:
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.explain_interval = explain_interval
+        self.slow_queries: deque[SlowQuery] = deque(maxlen=slow_log_size)
+        self._plans: dict[str, tuple[float, list[str]]] = {}
+
+    def instrument(self, *engines: Engine | AsyncEngine) -> None:
+        for engine in {getattr(engine, "sync_engine", engine) for engine in engines}:
+            if not event.contains(engine, "before_cursor_execute", self._before):
+                event.listen(engine, "before_cursor_execute", self._before)
+                event.listen(engine, "after_cursor_execute", self._after)
+
+    def sample(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate  # noqa: S311
+
+    def _before(self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info[_STARTED_KEY] = time.perf_counter()
+
+    def _after(self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if conn.info.get(_EXPLAINING_KEY):
+            return
+        elapsed = time.perf_counter() - conn.info.pop(_STARTED_KEY, time.perf_counter())
+        queries = _request_queries.get()
+        if queries is not None:
+            queries.record(statement, elapsed)
+        if self.slow_threshold and elapsed >= self.slow_threshold:
+            self._log_slow(conn, statement, None if executemany else parameters, elapsed, queries)
+
+    def _explain(self, conn: Connection, statement: str, parameters: Any) -> list[str]:
+        """The plan of ``statement`` on the connection that ran it, or the one captured lately.
+
+        On PostgreSQL the ``EXPLAIN`` runs in a savepoint, so a failing one does not abort the transaction.
+        """
+        now = time.monotonic()
+        if (cached := self._plans.get(statement)) is not None and now - cached[0] < self.explain_interval:
+            return cached[1]
+        plan: list[str] = []
+        prefix = _EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if prefix is not None and parameters is not None and statement.lstrip()[:6].upper().startswith(_EXPLAINABLE):
+            conn.info[_EXPLAINING_KEY] = True
+            try:
+                with conn.begin_nested() if conn.dialect.name == "postgresql" else nullcontext():
+                    plan = [str(row[-1]) for row in conn.exec_driver_sql(prefix + statement, parameters)]
+            except Exception as exc:  # noqa: BLE001
+                plan = [f"{type(exc).__name__}: {exc}"]
+            finally:
+                conn.info[_EXPLAINING_KEY] = False
+        if len(self._plans) >= _MAX_PLANS:
+            self._plans.clear()
+        self._plans[statement] = (now, plan)
+        return plan
+
+    def _log_slow(self, conn: Connection, statement: str, parameters: Any, elapsed: float, queries: RequestQueries | None) -> None:
+        slow = SlowQuery(
+            statement=statement,
+            elapsed=elapsed,
+            method=queries.method if queries is not None else None,
+            path=queries.path if queries is not None else None,
+            plan=self._explain(conn, statement, parameters),
+        )
+        self.slow_queries.append(slow)
+        slow_logger.warning("slow query ms=%.1f path=%s statement=%s", elapsed * 1000, slow.path, " ".join(statement.split()), extra={"sql": slow.to_dict()})
+
+
+class QueryTimingMiddleware(AbstractMiddleware):
+    """Times the statements of a sampled share of requests, reported in a ``Server-Timing`` header and to ``app.sql``."""
+
+    scopes = {ScopeType.HTTP}
+
+    def __init__(self, app: ASGIApp, timer: QueryTimer, **kwargs: Any) -> None:
+        super().__init__(app, **kwargs)
+        self.timer = timer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.timer.sample():
+            await self.app(scope, receive, send)
+            return
+        http_scope = cast("HTTPScope", scope)  # ``scopes`` only lets HTTP requests through
+        queries = RequestQueries(method=http_scope["method"], path=http_scope["path"])
+        token = _request_queries.set(queries)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and queries.count:
+                MutableScopeHeaders.from_message(message).add("Server-Timing", queries.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_queries.reset(token)
+            if queries.count:
+                logger.info(
+                    "request queries method=%s path=%s queries=%d db_ms=%.1f slowest_ms=%.1f",
+                    queries.method,
+                    queries.path,
+                    queries.count,
+                    queries.total * 1000,
+                    queries.slowest * 1000,
+                    extra={"sql": queries.to_dict()},
+                )
@@ -0,0 +1,58 @@
+"""Response cache keys that know who is asking and what the response depends on."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
+
+from litestar.handlers import HTTPRouteHandler
+
+from app.lib.stores import TAG_SEPARATOR
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from litestar import Request
+    from litestar.types import HTTPScope
+
+__all__ = ("CacheKeyBuilder", "should_cache_response")
+
+
+def should_cache_response(scope: HTTPScope, status_code: int) -> bool:
+    """Only store successful responses of handlers that asked for caching.
+
+    Litestar wraps every method of a path in the cache middleware as soon as one handler of the path is cached, so
+    without this ``POST``/``DELETE`` responses would be stored too.
+    """
+    route_handler = scope["route_handler"]
+    cached = isinstance(route_handler, HTTPRouteHandler) and bool(route_handler.cache)
+    return scope["method"] in {"GET", "HEAD"} and cached and 200 <= status_code < 300
+
+
+class CacheKeyBuilder:
+    """Build response cache keys from the path, the normalized query string and, by default, the current user.
+
+    ``tags`` are templates formatted with the route's path parameters, e.g. ``("users", "user:{email}")``; they are
+    written in front of the key so a :class:`~app.lib.stores.TaggedMemoryStore` can purge the entry when any of them is
+    invalidated. Subclasses can override :meth:`scope` to partition entries differently, e.g. by account.
+    """
+
+    __slots__ = ("per_user", "tags")
+
+    def __init__(self, tags: Iterable[str] = (), *, per_user: bool = True) -> None:
+        self.tags = tuple(tags)
+        self.per_user = per_user
+
+    def __call__(self, request: Request[Any, Any, Any]) -> str:
+        query = urlencode(sorted((name, value) for name, value in request.query_params.multi_items() if value != ""))
+        key = f"{request.method}{request.url.path}?{query}|{self.scope(request)}"
+        if request.headers.get("x-inertia"):
+            key = f"{key}|inertia"
+        tags = " ".join(tag.format(**request.path_params) for tag in self.tags)
+        return f"{tags}{TAG_SEPARATOR}{key}" if tags else key
+
+    def scope(self, request: Request[Any, Any, Any]) -> str:
+        if not self.per_user:
+            return ""
+        user = request.scope.get("user")
+        return f"user={user.id}" if user is not None else "anonymous"
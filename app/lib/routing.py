@@ -0,0 +1,102 @@
+"""Routing the reads of a session to a read-only engine, a reader pool or a replica.
+
+A session whose ``info`` holds a ``read_bind`` runs its routed queries there, and its flushes and DML statements on its
+own bind. Every query of a session is routed while its ``route_reads`` is set, as for ``GET`` requests; otherwise only
+the queries made within :func:`reads_routed` are. Once a session has written, its ``read_bind`` is cleared to ``None``:
+its later reads go to the primary too, so it sees its own changes. Statements in ``text()`` are routed as reads, so
+they must not write.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from litestar.plugins.sqlalchemy import SQLAlchemyAsyncConfig
+from sqlalchemy.ext.asyncio import async_scoped_session
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from litestar.datastructures import State
+    from litestar.types import Scope
+    from sqlalchemy import Connection, Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+__all__ = (
+    "READ_BIND_KEY",
+    "READ_METHODS",
+    "ROUTE_READS_KEY",
+    "RoutingSQLAlchemyAsyncConfig",
+    "RoutingSession",
+    "reads_routed",
+    "route_reads",
+    "set_read_bind",
+    "unscoped",
+)
+
+READ_BIND_KEY = "read_bind"
+"""Session ``info`` key of the engine its reads are routed to."""
+ROUTE_READS_KEY = "route_reads"
+"""Session ``info`` key set while every query of the session is routed."""
+READ_METHODS = frozenset({"GET", "HEAD"})
+"""Methods of the requests whose sessions route every query."""
+
+
+class RoutingSession(Session):
+    """A session running its routed reads on its ``read_bind``, until it writes."""
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine | Connection:
+        read_bind: Engine | None = self.info.get(READ_BIND_KEY)
+        if read_bind is not None:
+            if self._flushing or getattr(clause, "is_dml", False):
+                self.info[READ_BIND_KEY] = None
+            elif self.info.get(ROUTE_READS_KEY):
+                return read_bind
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def unscoped(session: AsyncSession | async_scoped_session[AsyncSession]) -> AsyncSession:
+    """The session a repository works with, resolving an ``async_scoped_session`` to the session it currently scopes."""
+    return session() if isinstance(session, async_scoped_session) else session
+
+
+def set_read_bind(session: AsyncSession, engine: AsyncEngine) -> None:
+    """Make ``engine`` the engine the routed reads of ``session`` run on; nothing is routed when it is the session's own bind."""
+    session.info[READ_BIND_KEY] = engine.sync_engine if engine.sync_engine is not session.sync_session.bind else None
+
+
+def route_reads(session: AsyncSession, engine: AsyncEngine) -> None:
+    """Run every read of ``session`` on ``engine``, until it writes."""
+    set_read_bind(session, engine)
+    session.info[ROUTE_READS_KEY] = True
+
+
+@contextmanager
+def reads_routed(session: AsyncSession) -> Iterator[None]:
+    """Route the reads ``session`` makes within the block, unless it has written."""
+    routed = session.info.get(ROUTE_READS_KEY, False)
+    session.info[ROUTE_READS_KEY] = True
+    try:
+        yield
+    finally:
+        session.info[ROUTE_READS_KEY] = routed
+
+
+@dataclass
+class RoutingSQLAlchemyAsyncConfig(SQLAlchemyAsyncConfig):
+    """Provides request sessions whose reads can be routed to an engine of ``read_engine_provider``.
+
+    Every read of ``GET`` and ``HEAD`` requests is routed.
+    """
+
+    read_engine_provider: Callable[[], AsyncEngine] | None = None
+
+    def provide_session(self, state: State, scope: Scope) -> AsyncSession:
+        session = super().provide_session(state, scope)
+        if self.read_engine_provider is not None and READ_BIND_KEY not in session.info:
+            set_read_bind(session, self.read_engine_provider())
+            session.info[ROUTE_READS_KEY] = scope.get("method") in READ_METHODS
+        return session
@@ -0,0 +1,161 @@
+"""Ranked full-text search backed by SQLite FTS5."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+from advanced_alchemy.filters import StatementFilter
+from sqlalchemy import Select, column, event, func, literal_column, or_, select, table
+
+if TYPE_CHECKING:
+    from advanced_alchemy.filters import StatementTypeT
+    from sqlalchemy import ColumnElement, Connection
+
+__all__ = ("FullTextIndex", "FullTextSearch", "get_full_text_index", "register_full_text_index")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+_CREATE_KEY = "CREATE TABLE IF NOT EXISTS {key} (fts_rowid INTEGER PRIMARY KEY, id NOT NULL UNIQUE)"
+_CREATE_FTS = "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+_FTS_ROWID = "(SELECT fts_rowid FROM {key} WHERE id = {row}.id)"
+_INSERT_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+    "INSERT INTO {key} (id) VALUES (new.id); "
+    "INSERT INTO {fts} (rowid, {columns}) VALUES ({new_rowid}, {new}); END"
+)
+_DELETE_TRIGGER = "CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN DELETE FROM {fts} WHERE rowid = {old_rowid}; DELETE FROM {key} WHERE id = old.id; END"
+_UPDATE_TRIGGER = "CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN UPDATE {fts} SET {assignments} WHERE rowid = {new_rowid}; END"
+_REBUILD = (
+    "DELETE FROM {fts}",
+    "DELETE FROM {key}",
+    "INSERT INTO {key} (id) SELECT id FROM {table}",
+    "INSERT INTO {fts} (rowid, {columns}) SELECT k.fts_rowid, {selected} FROM {table} AS t JOIN {key} AS k ON k.id = t.id",
+)
+
+
+@dataclass(frozen=True)
+class FullTextIndex:
+    """An FTS5 table holding the searchable columns of ``table``, with triggers keeping it in step with the table.
+
+    FTS5 addresses rows by an integer rowid, but the tables are keyed by UUIDs and ``VACUUM`` may renumber their
+    implicit rowids. The index therefore keeps its own copy of the text, and :attr:`key_table` assigns each row's ``id``
+    a stable FTS rowid through its ``INTEGER PRIMARY KEY``.
+
+    The statements are built from the table and column names of registered models, never from user input.
+    """
+
+    table: str
+    weights: dict[str, float]
+    """Searchable columns and their ``bm25`` weights, in index column order."""
+
+    @property
+    def name(self) -> str:
+        return f"{self.table}_fts"
+
+    @property
+    def key_table(self) -> str:
+        return f"{self.table}_fts_key"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return tuple(self.weights)
+
+    def _names(self) -> dict[str, str]:
+        return {
+            "table": self.table,
+            "fts": self.name,
+            "key": self.key_table,
+            "columns": ", ".join(self.columns),
+            "new": ", ".join(f"new.{column}" for column in self.columns),
+            "selected": ", ".join(f"t.{column}" for column in self.columns),
+            "assignments": ", ".join(f"{column} = new.{column}" for column in self.columns),
+            "new_rowid": _FTS_ROWID.format(key=self.key_table, row="new"),
+            "old_rowid": _FTS_ROWID.format(key=self.key_table, row="old"),
+        }
+
+    def ddl(self) -> list[str]:
+        """Statements creating the index, its key table and the sync triggers."""
+        names = self._names()
+        return [template.format(**names) for template in (_CREATE_KEY, _CREATE_FTS, _INSERT_TRIGGER, _DELETE_TRIGGER, _UPDATE_TRIGGER)]
+
+    def rebuild(self) -> list[str]:
+        """Statements re-indexing every row of ``table``."""
+        names = self._names()
+        return [template.format(**names) for template in _REBUILD]
+
+    def drop(self) -> list[str]:
+        return [f"DROP TRIGGER IF EXISTS {self.name}_{suffix}" for suffix in ("ai", "ad", "au")] + [
+            f"DROP TABLE IF EXISTS {self.name}",
+            f"DROP TABLE IF EXISTS {self.key_table}",
+        ]
+
+
+_indexes: dict[str, FullTextIndex] = {}
+
+
+def register_full_text_index(model: Any, weights: dict[str, float]) -> FullTextIndex:
+    """Declare the searchable columns of ``model``.
+
+    The index is created along with the table by ``metadata.create_all`` on SQLite; existing databases get it from the
+    migrations.
+    """
+    index = FullTextIndex(table=model.__tablename__, weights=weights)
+    _indexes[index.table] = index
+
+    def create(target: Any, connection: Connection, **kwargs: Any) -> None:
+        if connection.dialect.name == "sqlite":
+            for statement in (*index.ddl(), *index.rebuild()):
+                connection.exec_driver_sql(statement)
+
+    event.listen(model.__table__, "after_create", create)
+    return index
+
+
+def get_full_text_index(model: Any) -> FullTextIndex | None:
+    return _indexes.get(model.__tablename__)
+
+
+def to_match_query(value: str) -> str | None:
+    """Turn free text into an FTS5 query matching rows containing every word, each as a prefix.
+
+    Only word characters are kept, so user input can never inject FTS5 query syntax.
+    """
+    tokens = _TOKEN_RE.findall(value)
+    return " ".join(f'"{token}"*' for token in tokens) or None
+
+
+@dataclass
+class FullTextSearch(StatementFilter):
+    """Match rows against every searchable column of the model, best matches first.
+
+    On SQLite the FTS5 index is used and rows are ranked with ``bm25``. Other dialects fall back to a case-insensitive
+    ``LIKE`` across the same columns. Models without a registered index are left unfiltered.
+    """
+
+    value: str | None
+    use_fts: bool = True
+
+    def append_to_statement(self, statement: StatementTypeT, model: Any) -> StatementTypeT:
+        if not self.value or not isinstance(statement, Select) or (index := get_full_text_index(model)) is None:
+            return statement
+        if not self.use_fts:
+            return cast("StatementTypeT", statement.where(self._like(model, index)))
+        if (query := to_match_query(self.value)) is None:
+            return statement
+        fts = table(index.name)
+        key = table(index.key_table, column("fts_rowid"), column("id"))
+        hits = (
+            select(key.c.id, func.bm25(literal_column(index.name), *index.weights.values()).label("rank"))
+            .select_from(fts.join(key, key.c.fts_rowid == literal_column(f"{index.name}.rowid")))
+            .where(literal_column(index.name).op("MATCH")(query))
+            .subquery(f"{index.name}_hits")
+        )
+        select_ = statement.join(hits, hits.c.id == model.id)
+        return cast("StatementTypeT", select_.order_by(None).order_by(hits.c.rank, *select_._order_by_clauses))
+
+    def _like(self, model: Any, index: FullTextIndex) -> ColumnElement[bool]:
+        """Match the text anywhere in any searchable column; ``%`` and ``_`` in it are matched literally."""
+        return or_(*(getattr(model, name).icontains(self.value, autoescape=True) for name in index.columns))
@@ -0,0 +1,115 @@
+"""Server-side sessions that only touch the store when they have to."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from litestar.middleware.session.server_side import ServerSideSessionBackend, ServerSideSessionConfig
+from litestar.types import Empty
+
+if TYPE_CHECKING:
+    from litestar.connection import ASGIConnection
+    from litestar.types import Message, ScopeSession
+
+__all__ = ("LazyServerSideSessionBackend", "LazyServerSideSessionConfig", "SessionIOStats", "get_request_session_io", "session_io_stats")
+
+TOUCHED_AT_KEY = "_touched_at"
+"""Session entry recording when the session was last written to the store."""
+STATE_KEY = "_session_io"
+"""Request state key holding the loaded snapshot and the per-request I/O counts."""
+
+
+@dataclass
+class SessionIOStats:
+    """Session store operations, either process-wide totals or the counts for a single request."""
+
+    reads: int = 0
+    writes: int = 0
+    deletes: int = 0
+    skipped_writes: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {"reads": self.reads, "writes": self.writes, "deletes": self.deletes, "skippedWrites": self.skipped_writes}
+
+
+session_io_stats = SessionIOStats()
+
+
+@dataclass
+class _RequestSession:
+    raw: bytes | None = None
+    touched_at: float | None = None
+    io: SessionIOStats = field(default_factory=SessionIOStats)
+
+
+def _request_session(connection: ASGIConnection[Any, Any, Any, Any]) -> _RequestSession:
+    return connection.state.setdefault(STATE_KEY, _RequestSession())  # type: ignore[no-any-return]
+
+
+def get_request_session_io(connection: ASGIConnection[Any, Any, Any, Any]) -> SessionIOStats:
+    """Return the session store operations performed for the current request so far."""
+    return _request_session(connection).io
+
+
+class LazyServerSideSessionBackend(ServerSideSessionBackend):
+    """Server-side session backend that skips store I/O for requests that do not need it.
+
+    * Requests without a session cookie never read from the store.
+    * Sessions are only written back when their content changed (``set_session``, ``clear_session``, flash messages,
+      ...), or when the stored copy is older than ``refresh_after`` seconds so the expiry keeps sliding.
+    * Empty sessions for anonymous requests are never persisted and no cookie is set for them.
+    """
+
+    config: LazyServerSideSessionConfig
+
+    async def load_from_connection(self, connection: ASGIConnection) -> dict[str, Any]:
+        state = _request_session(connection)
+        if not (session_id := connection.cookies.get(self.config.key)) or session_id == "null":
+            return {}
+        store = self.config.get_store_from_app(connection.scope["app"])
+        data = await self.get(session_id, store=store)
+        state.io.reads += 1
+        session_io_stats.reads += 1
+        if data is None:
+            return {}
+        session = self.deserialize_data(data)
+        state.raw = data
+        state.touched_at = session.pop(TOUCHED_AT_KEY, None)
+        return session
+
+    async def store_in_message(self, scope_session: ScopeSession, message: Message, connection: ASGIConnection) -> None:
+        state = _request_session(connection)
+        if scope_session is Empty:
+            if state.raw is None and not connection.cookies.get(self.config.key):
+                return
+            await super().store_in_message(scope_session, message, connection)
+            state.io.deletes += 1
+            session_io_stats.deletes += 1
+            return
+        if not scope_session and state.raw is None:
+            return
+        if state.raw is not None and state.touched_at is not None and not self._is_stale(state.touched_at):
+            unchanged = self.serialize_data({**scope_session, TOUCHED_AT_KEY: state.touched_at}, connection.scope) == state.raw  # type: ignore[dict-item]
+            if unchanged:
+                state.io.skipped_writes += 1
+                session_io_stats.skipped_writes += 1
+                return
+        await super().store_in_message({**scope_session, TOUCHED_AT_KEY: time.time()}, message, connection)  # type: ignore[dict-item]
+        state.io.writes += 1
+        session_io_stats.writes += 1
+
+    def _is_stale(self, touched_at: float) -> bool:
+        refresh_after = self.config.refresh_after if self.config.refresh_after is not None else self.config.max_age // 2
+        return time.time() - touched_at >= refresh_after
+
+
+@dataclass
+class LazyServerSideSessionConfig(ServerSideSessionConfig):
+    """Server-side session configuration using :class:`LazyServerSideSessionBackend`."""
+
+    _backend_class = LazyServerSideSessionBackend
+
+    refresh_after: int | None = field(default=None)
+    """Rewrite an unchanged session once it is this many seconds old. Defaults to half of ``max_age``."""
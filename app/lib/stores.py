@@ -0,0 +1,379 @@
+"""Key/value stores."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from litestar.stores.base import NamespacedStore, Store
+
+from app.lib.cache import CacheStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+__all__ = ("SQLiteStore", "TaggedMemoryStore")
+
+TAG_SEPARATOR = "\x1f"
+"""Separates the space separated tags from the rest of a :class:`TaggedMemoryStore` key."""
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS kv_store (namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL, PRIMARY KEY (namespace, key)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS ix_kv_store_expires_at ON kv_store (expires_at) WHERE expires_at IS NOT NULL",
+)
+_UPSERT = (
+    "INSERT INTO kv_store (namespace, key, value, expires_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at"
+)
+_RENEW = "UPDATE kv_store SET expires_at = ? WHERE namespace = ? AND key = ? AND expires_at IS NOT NULL"
+_DELETE = "DELETE FROM kv_store WHERE namespace = ? AND key = ?"
+_SWEEP = "DELETE FROM kv_store WHERE (namespace, key) IN (SELECT namespace, key FROM kv_store WHERE expires_at IS NOT NULL AND expires_at <= ? LIMIT ?)"
+
+# (statement, parameters) pairs queued for the next group commit
+_WriteOp = tuple[str, tuple[Any, ...]]
+
+
+def _seconds(value: int | timedelta | None) -> float | None:
+    if value is None:
+        return None
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
+
+
+class _SQLiteBackend:
+    """Connections, write batching and expiry sweeping shared by every namespace of a :class:`SQLiteStore`.
+
+    All writes go through a single writer thread. Concurrent writes are grouped into one transaction (group commit):
+    each caller waits until the batch holding its write is committed, so a batch costs one fsync however many
+    requests contributed to it. Reads use a small pool of threads, each with its own connection; under WAL they never
+    block on the writer.
+    """
+
+    def __init__(self, path: Path, readers: int, batch_size: int, sweep_interval: float, sweep_chunk_size: int, busy_timeout: float) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.sweep_interval = sweep_interval
+        self.sweep_chunk_size = sweep_chunk_size
+        self.busy_timeout = busy_timeout
+        self.readers = readers
+        self._reader_pool = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="kv-store-read")
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kv-store-write")
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._queue: list[tuple[list[_WriteOp], asyncio.Future[None]]] = []
+        self._flusher: asyncio.Task[None] | None = None
+        self._sweeper: asyncio.Task[None] | None = None
+        self._users = 0
+        self._initialized = False
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _initialize(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        self._initialized = True
+
+    async def _run(self, pool: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._initialized:
+            await asyncio.get_running_loop().run_in_executor(self._writer_pool, self._initialize)
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+    async def read(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await self._run(self._reader_pool, lambda: fn(self._connection()))
+
+    async def write(self, *ops: _WriteOp) -> None:
+        """Queue statements for the next group commit and wait until they are durable."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queue.append((list(ops), future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        await future
+
+    async def _flush(self) -> None:
+        while self._queue:
+            batch, self._queue = self._queue[: self.batch_size], self._queue[self.batch_size :]
+            try:
+                await self._run(self._writer_pool, self._commit, [op for ops, _ in batch for op in ops])
+            except Exception as exc:  # noqa: BLE001
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+    def _commit(self, ops: list[_WriteOp]) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement, params in ops:
+                conn.execute(statement, params)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _sweep_chunk(self, now: float) -> int:
+        return self._connection().execute(_SWEEP, (now, self.sweep_chunk_size)).rowcount
+
+    async def sweep(self) -> int:
+        """Purge expired entries in chunks of ``sweep_chunk_size``, yielding to other writers between chunks."""
+        purged, now = 0, time.time()
+        while True:
+            deleted: int = await self._run(self._writer_pool, self._sweep_chunk, now)
+            purged += deleted
+            if deleted < self.sweep_chunk_size:
+                return purged
+            await asyncio.sleep(0)
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            with contextlib.suppress(sqlite3.Error):
+                await self.sweep()
+
+    async def start(self) -> None:
+        self._users += 1
+        if self._sweeper is None and self.sweep_interval > 0:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self) -> None:
+        self._users -= 1
+        if self._users > 0:
+            return
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+        if self._flusher is not None:
+            await self._flusher
+        await asyncio.get_running_loop().run_in_executor(None, self._close)
+
+    def _close(self) -> None:
+        """Stop the threads and close their connections; new ones are started on next use."""
+        self._reader_pool.shutdown(wait=True)
+        self._writer_pool.shutdown(wait=True)
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._reader_pool = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix="kv-store-read")
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kv-store-write")
+        self._local = threading.local()
+        self._initialized = False
+
+
+class SQLiteStore(NamespacedStore):
+    """Store backed by a single SQLite database in WAL mode.
+
+    Expiry times are indexed, so lookups ignore expired rows without scanning and a background task purges them in
+    bounded chunks. The sweeper runs while the store is entered as an async context manager (see ``app.asgi``).
+    """
+
+    __slots__ = ("_backend",)
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        namespace: str = "",
+        readers: int = 4,
+        batch_size: int = 256,
+        sweep_interval: float = 60,
+        sweep_chunk_size: int = 1000,
+        busy_timeout: float = 5,
+        _backend: _SQLiteBackend | None = None,
+    ) -> None:
+        self.namespace = namespace
+        self._backend = _backend or _SQLiteBackend(
+            path=Path(path),
+            readers=readers,
+            batch_size=batch_size,
+            sweep_interval=sweep_interval,
+            sweep_chunk_size=sweep_chunk_size,
+            busy_timeout=busy_timeout,
+        )
+
+    @property
+    def path(self) -> Path:
+        return self._backend.path
+
+    def with_namespace(self, namespace: str) -> SQLiteStore:
+        child = f"{self.namespace}/{namespace}" if self.namespace else namespace
+        return type(self)(self._backend.path, namespace=child, _backend=self._backend)
+
+    async def __aenter__(self) -> None:
+        await self._backend.start()
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None) -> None:
+        await self._backend.stop()
+
+    async def set(self, key: str, value: str | bytes, expires_in: int | timedelta | None = None) -> None:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        ttl = _seconds(expires_in)
+        expires_at = time.time() + ttl if ttl else None
+        await self._backend.write((_UPSERT, (self.namespace, key, value, expires_at)))
+
+    async def get(self, key: str, renew_for: int | timedelta | None = None) -> bytes | None:
+        row = await self._fetch(key)
+        if row is None:
+            return None
+        value, expires_at = row
+        if (renew := _seconds(renew_for)) and expires_at is not None:
+            await self._backend.write((_RENEW, (time.time() + renew, self.namespace, key)))
+        return bytes(value)
+
+    async def _fetch(self, key: str) -> tuple[bytes, float | None] | None:
+        now, namespace = time.time(), self.namespace
+        return await self._backend.read(  # type: ignore[no-any-return]
+            lambda conn: conn.execute(
+                "SELECT value, expires_at FROM kv_store WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, now),
+            ).fetchone(),
+        )
+
+    async def delete(self, key: str) -> None:
+        await self._backend.write((_DELETE, (self.namespace, key)))
+
+    async def delete_all(self) -> None:
+        if not self.namespace:
+            await self._backend.write(("DELETE FROM kv_store", ()))
+            return
+        await self._backend.write(("DELETE FROM kv_store WHERE namespace = ? OR substr(namespace, 1, ?) = ?", (self.namespace, len(self.namespace) + 1, f"{self.namespace}/")))
+
+    async def delete_expired(self) -> int:
+        """Purge expired entries immediately and return how many were removed."""
+        return await self._backend.sweep()
+
+    async def exists(self, key: str) -> bool:
+        return await self._fetch(key) is not None
+
+    async def expires_in(self, key: str) -> int | None:
+        row = await self._fetch(key)
+        if row is None or row[1] is None:
+            return None
+        return int(row[1] - time.time())
+
+
+class TaggedMemoryStore(Store):
+    """In-memory LRU store bounded by the total size of its values, with tag based invalidation.
+
+    Keys may start with space separated tags followed by :data:`TAG_SEPARATOR` (see ``app.lib.response_cache``), so
+    callers that only know the key, like Litestar's response cache, still tag what they store. Every entry with a given
+    tag is dropped by :meth:`invalidate_tags`. Like ``TTLCache`` it is meant for the event loop thread only.
+    """
+
+    __slots__ = ("_data", "_tags", "current_bytes", "max_bytes", "max_entry_bytes", "stats")
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+        self.current_bytes = 0
+        self.stats = CacheStats()
+        self._data: OrderedDict[str, tuple[bytes, float | None, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+
+    @staticmethod
+    def _size(key: str, value: bytes) -> int:
+        return len(key) + len(value)
+
+    def _discard(self, key: str) -> None:
+        value, _, tags = self._data.pop(key)
+        self.current_bytes -= self._size(key, value)
+        for tag in tags:
+            if keys := self._tags.get(tag):
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _live(self, key: str) -> tuple[bytes, float | None, tuple[str, ...]] | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            self._discard(key)
+            self.stats.expirations += 1
+            return None
+        return entry
+
+    async def set(self, key: str, value: str | bytes, expires_in: int | timedelta | None = None) -> None:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        if key in self._data:
+            self._discard(key)
+        size = self._size(key, value)
+        if size > self.max_entry_bytes:
+            return
+        ttl = _seconds(expires_in)
+        tags = tuple(key.partition(TAG_SEPARATOR)[0].split()) if TAG_SEPARATOR in key else ()
+        self._data[key] = (value, time.monotonic() + ttl if ttl else None, tags)
+        self.current_bytes += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self.current_bytes > self.max_bytes:
+            self._discard(next(iter(self._data)))
+            self.stats.evictions += 1
+
+    async def get(self, key: str, renew_for: int | timedelta | None = None) -> bytes | None:
+        entry = self._live(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        value, expires_at, tags = entry
+        if (renew := _seconds(renew_for)) and expires_at is not None:
+            self._data[key] = (value, time.monotonic() + renew, tags)
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def delete(self, key: str) -> None:
+        if key in self._data:
+            self._discard(key)
+
+    async def delete_all(self) -> None:
+        self._data.clear()
+        self._tags.clear()
+        self.current_bytes = 0
+
+    async def exists(self, key: str) -> bool:
+        return self._live(key) is not None
+
+    async def expires_in(self, key: str) -> int | None:
+        entry = self._live(key)
+        if entry is None or entry[1] is None:
+            return None
+        return int(entry[1] - time.monotonic())
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of ``tags`` and return how many were removed."""
+        keys = {key for tag in tags for key in self._tags.get(tag, ())}
+        for key in keys:
+            self._discard(key)
+        self.stats.invalidations += len(keys)
+        return len(keys)
+
+    def to_dict(self) -> dict[str, int | float]:
+        return {**self.stats.to_dict(), "entries": len(self._data), "bytes": self.current_bytes, "maxBytes": self.max_bytes}
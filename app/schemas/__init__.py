@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from app.schemas import base
 from app.schemas.accounts import AccountAssignment, PasswordUpdate, PasswordVerify, ProfileUpdate, User, UserCreate, UserLogin, UserRegister, UserUpdate
+from app.schemas.contacts import Contact, ContactImport, ContactOrganization, ContactUpdate
+from app.schemas.dashboard import DailyActivity, DashboardStats, StatBucket
+from app.schemas.organizations import Organization, OrganizationContact, OrganizationDetail, OrganizationImport, OrganizationUpdate
+from app.schemas.reports import CountryReportParams, GrowthReportParams, OrganizationReportParams, ReportJob, ReportTable, ReportType
 
 
 class Message(base.CamelizedBaseStruct):
@@ -10,10 +14,28 @@ class Message(base.CamelizedBaseStruct):
 
 __all__ = (
     "AccountAssignment",
+    "Contact",
+    "ContactImport",
+    "ContactOrganization",
+    "ContactUpdate",
+    "CountryReportParams",
+    "DailyActivity",
+    "DashboardStats",
+    "GrowthReportParams",
     "Message",
+    "Organization",
+    "OrganizationContact",
+    "OrganizationDetail",
+    "OrganizationImport",
+    "OrganizationReportParams",
+    "OrganizationUpdate",
     "PasswordUpdate",
     "PasswordVerify",
     "ProfileUpdate",
+    "ReportJob",
+    "ReportTable",
+    "ReportType",
+    "StatBucket",
     "User",
     "UserCreate",
     "UserLogin",
@@ -1,15 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from uuid import UUID  # noqa: TC003
 
 import msgspec
 
+from app.lib.converters import register_attributes
 from app.schemas.base import CamelizedBaseStruct
 from database.models import AccountRoles
 
-if TYPE_CHECKING:
-    from uuid import UUID
-
 
 class AccountAssignment(CamelizedBaseStruct):
     team_id: UUID
@@ -18,6 +16,9 @@ class AccountAssignment(CamelizedBaseStruct):
     role: AccountRoles = AccountRoles.MEMBER
 
 
+register_attributes(AccountAssignment, team_id="account_id", team_name="account_name")
+
+
 class User(CamelizedBaseStruct):
     id: UUID
     email: str
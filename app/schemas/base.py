@@ -5,7 +5,8 @@ import msgspec
 
 class BaseStruct(msgspec.Struct):
     def to_dict(self) -> dict[str, Any]:
-        return {f: getattr(self, f) for f in self.__struct_fields__ if getattr(self, f, None) != msgspec.UNSET}
+        """The fields that are set, by name; nested structs are kept as is."""
+        return {name: value for name, value in msgspec.structs.asdict(self).items() if value is not msgspec.UNSET}
 
 
 class CamelizedBaseStruct(BaseStruct, rename="camel"):
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime  # noqa: TC003
+from typing import Annotated
+from uuid import UUID  # noqa: TC003
+
+import msgspec
+
+from app.schemas.base import BaseStruct, CamelizedBaseStruct
+
+NonEmptyStr = Annotated[str, msgspec.Meta(min_length=1, max_length=255)]
+
+
+class ContactOrganization(CamelizedBaseStruct):
+    id: UUID
+    name: str
+
+
+class Contact(CamelizedBaseStruct):
+    id: UUID
+    first_name: str
+    last_name: str
+    name: str
+    organization: ContactOrganization
+    email: str | None = None
+    phone: str | None = None
+    address: str | None = None
+    city: str | None = None
+    region: str | None = None
+    country: str | None = None
+    postal_code: str | None = None
+    deleted_at: datetime | None = None
+
+
+class ContactImport(BaseStruct):
+    """A contact row of an import file; ``organization`` is the organization's name."""
+
+    first_name: NonEmptyStr
+    last_name: NonEmptyStr
+    organization: NonEmptyStr
+    email: str | None = None
+    phone: str | None = None
+    address: str | None = None
+    city: str | None = None
+    region: str | None = None
+    country: str | None = None
+    postal_code: str | None = None
+
+
+class ContactUpdate(CamelizedBaseStruct, omit_defaults=True):
+    """Changes to one contact of a batch update."""
+
+    id: UUID
+    first_name: NonEmptyStr | msgspec.UnsetType = msgspec.UNSET
+    last_name: NonEmptyStr | msgspec.UnsetType = msgspec.UNSET
+    organization_id: UUID | msgspec.UnsetType = msgspec.UNSET
+    email: str | None | msgspec.UnsetType = msgspec.UNSET
+    phone: str | None | msgspec.UnsetType = msgspec.UNSET
+    address: str | None | msgspec.UnsetType = msgspec.UNSET
+    city: str | None | msgspec.UnsetType = msgspec.UNSET
+    region: str | None | msgspec.UnsetType = msgspec.UNSET
+    country: str | None | msgspec.UnsetType = msgspec.UNSET
+    postal_code: str | None | msgspec.UnsetType = msgspec.UNSET
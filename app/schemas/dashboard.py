@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import date  # noqa: TC003
+
+from app.schemas.base import CamelizedBaseStruct
+
+
+class StatBucket(CamelizedBaseStruct):
+    key: str
+    """Country, region or organization id the count is for."""
+    name: str | None
+    count: int
+
+
+class DailyActivity(CamelizedBaseStruct):
+    day: date
+    contacts: int = 0
+    """Live contacts created that day."""
+    organizations: int = 0
+
+
+class DashboardStats(CamelizedBaseStruct):
+    contacts: int = 0
+    organizations: int = 0
+    contacts_per_organization: float = 0.0
+    top_countries: list[StatBucket] = []
+    top_regions: list[StatBucket] = []
+    top_organizations: list[StatBucket] = []
+    activity: list[DailyActivity] = []
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime  # noqa: TC003
+from typing import Annotated
+from uuid import UUID  # noqa: TC003
+
+import msgspec
+
+from app.schemas.base import BaseStruct, CamelizedBaseStruct
+
+
+class OrganizationContact(CamelizedBaseStruct):
+    id: UUID
+    name: str
+    email: str | None = None
+    phone: str | None = None
+    city: str | None = None
+
+
+class Organization(CamelizedBaseStruct):
+    id: UUID
+    name: str
+    email: str | None = None
+    phone: str | None = None
+    address: str | None = None
+    city: str | None = None
+    region: str | None = None
+    country: str | None = None
+    postal_code: str | None = None
+    contacts_count: int = 0
+    deleted_at: datetime | None = None
+
+
+class OrganizationDetail(Organization):
+    contacts: list[OrganizationContact] = []
+
+
+class OrganizationImport(BaseStruct):
+    """An organization row of an import file."""
+
+    name: Annotated[str, msgspec.Meta(min_length=1, max_length=255)]
+    email: str | None = None
+    phone: str | None = None
+    address: str | None = None
+    city: str | None = None
+    region: str | None = None
+    country: str | None = None
+    postal_code: str | None = None
+
+
+class OrganizationUpdate(CamelizedBaseStruct, omit_defaults=True):
+    """Changes to one organization of a batch update."""
+
+    id: UUID
+    name: Annotated[str, msgspec.Meta(min_length=1, max_length=255)] | msgspec.UnsetType = msgspec.UNSET
+    email: str | None | msgspec.UnsetType = msgspec.UNSET
+    phone: str | None | msgspec.UnsetType = msgspec.UNSET
+    address: str | None | msgspec.UnsetType = msgspec.UNSET
+    city: str | None | msgspec.UnsetType = msgspec.UNSET
+    region: str | None | msgspec.UnsetType = msgspec.UNSET
+    country: str | None | msgspec.UnsetType = msgspec.UNSET
+    postal_code: str | None | msgspec.UnsetType = msgspec.UNSET
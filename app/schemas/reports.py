@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime  # noqa: TC003
+from typing import Annotated, Any
+from uuid import UUID  # noqa: TC003
+
+import msgspec
+
+from app.schemas.base import CamelizedBaseStruct
+
+
+class OrganizationReportParams(CamelizedBaseStruct):
+    limit: Annotated[int, msgspec.Meta(ge=1, le=1000)] = 100
+    """Organizations listed, those with the most contacts first."""
+
+
+class CountryReportParams(CamelizedBaseStruct):
+    country: str | None = None
+    """Break this country down by region, instead of counting every country."""
+
+
+class GrowthReportParams(CamelizedBaseStruct):
+    months: Annotated[int, msgspec.Meta(ge=1, le=120)] = 12
+    """Months covered, ending with the current one."""
+
+
+class ReportType(CamelizedBaseStruct):
+    name: str
+    title: str
+
+
+class ReportTable(CamelizedBaseStruct):
+    columns: list[str]
+    rows: list[list[Any]]
+
+
+class ReportJob(CamelizedBaseStruct):
+    """A report being computed, or computed, from one generation of an account's data."""
+
+    id: UUID
+    report: str
+    status: str
+    """``queued``, ``running``, ``done`` or ``failed``."""
+    params: dict[str, Any]
+    data_generation: int
+    created_at: datetime
+    finished_at: datetime | None = None
+    result: ReportTable | None = None
+    error: str | None = None
@@ -1,12 +1,38 @@
+from app.services.base import CountCachingService, SoftDeleteService, count_cache, invalidate_response_cache, response_cache_store
 from app.services.contacts import ContactRepository, ContactService
+from app.services.imports import ContactImporter, OrganizationImporter
+from app.services.jobs import JobRepository, JobRunner, JobService, job_runner
 from app.services.organizations import OrganizationRepository, OrganizationService
-from app.services.users import UserRepository, UserService
+from app.services.reports import ReportService
+from app.services.stats import AccountStatRepository, AccountStatService, StatsReconciler, stats_reconciler
+from app.services.users import CachedUser, PasswordRehashQueue, UserRepository, UserService, invalidate_cached_user, rehash_queue, user_cache
 
 __all__ = (
+    "AccountStatRepository",
+    "AccountStatService",
+    "CachedUser",
+    "ContactImporter",
     "ContactRepository",
     "ContactService",
+    "CountCachingService",
+    "JobRepository",
+    "JobRunner",
+    "JobService",
+    "OrganizationImporter",
     "OrganizationRepository",
     "OrganizationService",
+    "PasswordRehashQueue",
+    "ReportService",
+    "SoftDeleteService",
+    "StatsReconciler",
     "UserRepository",
     "UserService",
+    "count_cache",
+    "invalidate_cached_user",
+    "invalidate_response_cache",
+    "job_runner",
+    "rehash_queue",
+    "response_cache_store",
+    "stats_reconciler",
+    "user_cache",
 )
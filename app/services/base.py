@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, ClassVar, overload
+
+import msgspec
+from advanced_alchemy.filters import LimitOffset
+from advanced_alchemy.repository.typing import ModelT
+from advanced_alchemy.service import OffsetPagination, SQLAlchemyAsyncRepositoryService
+from sqlalchemy import delete, event, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.lib.batch import BatchItemError, BatchResult, id_results, validate_items
+from app.lib.converters import to_struct, to_structs
+from app.lib.counts import CountCache
+from app.lib.routing import reads_routed, unscoped
+from app.lib.stores import TaggedMemoryStore
+from app.services.stats import record_inserted, tracking
+from config import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+    from uuid import UUID
+
+    from advanced_alchemy.base import ModelProtocol
+    from advanced_alchemy.filters import StatementFilter
+    from advanced_alchemy.repository.typing import ModelOrRowMappingT
+    from advanced_alchemy.service.typing import ModelDTOT
+    from sqlalchemy import ColumnElement, RowMapping
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.schemas.base import BaseStruct
+
+settings = get_settings()
+
+count_cache = CountCache(maxsize=settings.app.COUNT_CACHE_SIZE, ttl=settings.app.COUNT_CACHE_TTL)
+"""Totals shared by every :class:`CountCachingService`."""
+count_cache.listen()
+
+response_cache_store = TaggedMemoryStore(max_bytes=settings.app.RESPONSE_CACHE_MAX_BYTES)
+"""Backing store of the response cache; services purge its tags when they write."""
+PENDING_TAGS_KEY = "_pending_cache_tags"
+
+
+def invalidate_response_cache(*tags: str, session: Session | None = None) -> None:
+    """Purge cached responses carrying any of ``tags``, now and again once ``session`` commits."""
+    response_cache_store.invalidate_tags(*tags)
+    if session is not None:
+        session.info.setdefault(PENDING_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _purge_committed_tags(session: Session) -> None:
+    if tags := session.info.pop(PENDING_TAGS_KEY, None):
+        response_cache_store.invalidate_tags(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tags(session: Session) -> None:
+    session.info.pop(PENDING_TAGS_KEY, None)
+
+
+class CountCachingService(SQLAlchemyAsyncRepositoryService[ModelT]):
+    """Repository service that caches ``list_and_count`` totals until the table is written to.
+
+    Writes made through the service bump the table's generation in :data:`count_cache` and purge cached responses
+    tagged with :attr:`cache_tag` or any tag from :meth:`cache_tags_for`. Unfiltered lists of tables estimated above
+    ``COUNT_APPROXIMATE_THRESHOLD`` rows report the estimate rather than an exact ``COUNT(*)``. ``get``,
+    ``count`` and ``list_and_count`` read from the read engine of the session (see :mod:`app.lib.routing`) until it writes.
+    """
+
+    cache_tag: ClassVar[str | None] = None
+    """Response cache tag covering every row of the table. Defaults to the table name."""
+
+    @property
+    def session(self) -> AsyncSession:
+        """The session of the repository; see :func:`~app.lib.routing.unscoped`."""
+        return unscoped(self.repository.session)
+
+    @property
+    def table_name(self) -> str:
+        model: Any = self.repository.model_type
+        return str(model.__tablename__)
+
+    def cache_tags_for(self, db_obj: ModelT) -> set[str]:
+        """Response cache tags of a single row."""
+        account_id = getattr(db_obj, "account_id", None)
+        return {f"account:{account_id}"} if account_id is not None else set()
+
+    def _written(self, *db_objs: ModelT) -> None:
+        session = self.session.sync_session
+        count_cache.written(self.table_name, session)
+        tags = {self.cache_tag or self.table_name}.union(*(self.cache_tags_for(db_obj) for db_obj in db_objs))
+        invalidate_response_cache(*tags, session=session)
+
+    async def get(self, *args: Any, **kwargs: Any) -> ModelT:
+        with reads_routed(self.session):
+            return await super().get(*args, **kwargs)
+
+    async def list_and_count(self, *filters: StatementFilter | ColumnElement[bool], **kwargs: Any) -> tuple[Sequence[ModelT], int]:
+        with reads_routed(self.session):
+            if kwargs.get("statement") is not None:
+                return await super().list_and_count(*filters, **kwargs)
+            key = count_cache.key(self.table_name, filters, kwargs)
+            if (total := await self._cached_total(key)) is not None:
+                kwargs.pop("force_basic_query_mode", None)
+                return await self.list(*filters, **kwargs), total
+            items, total = await super().list_and_count(*filters, **kwargs)
+            # the window function reports 0 for a page past the end, which says nothing about the total
+            if items or not any(isinstance(f, LimitOffset) and f.offset for f in filters):
+                count_cache.set(key, total)
+            return items, total
+
+    async def count(self, *filters: StatementFilter | ColumnElement[bool], **kwargs: Any) -> int:
+        """Count rows, sharing the totals :meth:`list_and_count` caches for the same filters."""
+        with reads_routed(self.session):
+            if kwargs.get("statement") is not None:
+                return await super().count(*filters, **kwargs)
+            key = count_cache.key(self.table_name, filters, kwargs)
+            if (total := await self._cached_total(key)) is None:
+                total = await super().count(*filters, **kwargs)
+                count_cache.set(key, total)
+            return total
+
+    async def _cached_total(self, key: tuple[str, int, tuple[str, ...]]) -> int | None:
+        """The cached total for ``key``, else the table estimate for an unfiltered key, else ``None``."""
+        total = count_cache.get(key)
+        if total is None and not key[2] and (total := await self.estimate_count()) is not None:
+            count_cache.set(key, total)
+        return total
+
+    @overload
+    def to_schema(
+        self,
+        data: ModelOrRowMappingT,
+        total: int | None = None,
+        filters: Sequence[StatementFilter | ColumnElement[bool]] | Sequence[StatementFilter] | None = None,
+        *,
+        schema_type: None = None,
+    ) -> ModelOrRowMappingT: ...
+
+    @overload
+    def to_schema(
+        self,
+        data: Sequence[ModelOrRowMappingT],
+        total: int | None = None,
+        filters: Sequence[StatementFilter | ColumnElement[bool]] | Sequence[StatementFilter] | None = None,
+        *,
+        schema_type: None = None,
+    ) -> OffsetPagination[ModelOrRowMappingT]: ...
+
+    @overload
+    def to_schema(
+        self,
+        data: ModelProtocol | RowMapping,
+        total: int | None = None,
+        filters: Sequence[StatementFilter | ColumnElement[bool]] | Sequence[StatementFilter] | None = None,
+        *,
+        schema_type: type[ModelDTOT],
+    ) -> ModelDTOT: ...
+
+    @overload
+    def to_schema(
+        self,
+        data: Sequence[ModelProtocol] | Sequence[RowMapping],
+        total: int | None = None,
+        filters: Sequence[StatementFilter | ColumnElement[bool]] | Sequence[StatementFilter] | None = None,
+        *,
+        schema_type: type[ModelDTOT],
+    ) -> OffsetPagination[ModelDTOT]: ...
+
+    def to_schema(self, data: Any, total: int | None = None, filters: Sequence[Any] | None = None, *, schema_type: Any = None) -> Any:
+        """Convert rows to msgspec structs with the compiled converters of :mod:`app.lib.converters`.
+
+        Other schema types are converted by the base service.
+        """
+        if schema_type is None or not issubclass(schema_type, msgspec.Struct):
+            return super().to_schema(data, total, filters, schema_type=schema_type)
+        if not isinstance(data, Sequence):
+            return to_struct(data, schema_type)
+        limit_offset = next((f for f in filters or () if isinstance(f, LimitOffset)), None) or LimitOffset(limit=len(data), offset=0)
+        return OffsetPagination(items=to_structs(data, schema_type), limit=limit_offset.limit, offset=limit_offset.offset, total=total or len(data))
+
+    async def estimate_count(self) -> int | None:
+        """Return a cheap row estimate for the whole table, or ``None`` when it is small enough to count exactly."""
+        threshold = settings.app.COUNT_APPROXIMATE_THRESHOLD
+        if threshold <= 0:
+            return None
+        session = self.session
+        dialect = session.get_bind().dialect.name
+        if dialect == "sqlite":
+            # rowids are handed out in increasing order, so the largest one bounds the row count from above
+            statement = text(f"SELECT max(rowid) FROM {self.table_name}")  # noqa: S608
+        elif dialect == "postgresql":
+            statement = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)").bindparams(table=self.table_name)
+        else:
+            return None
+        estimate = (await session.execute(statement)).scalar()
+        return int(estimate) if estimate is not None and estimate >= threshold else None
+
+    async def bulk_insert(self, rows: Sequence[dict[str, Any]]) -> int:
+        """Insert plain column dicts with one batched ``executemany``, without building ORM objects."""
+        if not rows:
+            return 0
+        await self.session.execute(insert(self.repository.model_type), rows)
+        await record_inserted(self.session, self.repository.model_type, rows)
+        self._written()
+        return len(rows)
+
+    async def batch_update(self, items: Sequence[dict[str, Any]], item_type: type[BaseStruct], *scope: ColumnElement[bool]) -> BatchResult:
+        """Validate raw ``items`` one by one as ``item_type`` and apply the valid ones in a single ``executemany``."""
+        valid, failed = validate_items(items, item_type)
+        changes = {item_id: {name: value for name, value in item.to_dict().items() if name != "id"} for item_id, (_, item) in valid.items()}
+        for item_id, error in (await self.check_changes(changes)).items():
+            failed.append(BatchItemError(index=valid[item_id][0], id=item_id, error=error))
+            del changes[item_id]
+        updated = await self.update_batch(changes, *scope)
+        failed.extend(BatchItemError(index=valid[item_id][0], id=item_id, error="Not found") for item_id in changes.keys() - updated)
+        return BatchResult(succeeded=[item_id for item_id in valid if item_id in updated], failed=sorted(failed, key=attrgetter("index")))
+
+    async def batch_delete(self, ids: Sequence[UUID], *scope: ColumnElement[bool]) -> BatchResult:
+        """Delete ``ids`` in a single statement, reporting those that were not found."""
+        return id_results(ids, await self.delete_batch(set(ids), *scope))
+
+    async def check_changes(self, changes: Mapping[UUID, dict[str, Any]]) -> dict[UUID, str]:
+        """Errors for changes that are valid on their own but not against the database, by row id."""
+        return {}
+
+    async def update_batch(self, changes: Mapping[UUID, dict[str, Any]], *scope: ColumnElement[bool]) -> set[UUID]:
+        """Apply per-row ``changes`` to the rows matching ``scope`` with one ``executemany``; return the updated ids.
+
+        Rows are not loaded: one query finds which ids are in scope, then an ORM bulk UPDATE by primary key writes all of
+        them, grouping rows that change the same columns into the same statement.
+        """
+        model: Any = self.repository.model_type
+        session = self.session
+        found = set((await session.scalars(select(model.id).where(model.id.in_(changes), *scope))).all()) if changes else set()
+        if rows := [{**changes[item_id], "id": item_id} for item_id in found if changes[item_id]]:
+            async with tracking(session, model, model.id.in_(found), columns=set().union(*rows)):
+                await session.execute(update(model), rows)
+            self._written()
+        return found
+
+    async def delete_batch(self, ids: Collection[UUID], *scope: ColumnElement[bool]) -> set[UUID]:
+        """Delete the rows among ``ids`` matching ``scope`` with one statement; return the deleted ids."""
+        if not ids:
+            return set()
+        model: Any = self.repository.model_type
+        session = self.session
+        async with tracking(session, model, model.id.in_(ids), *scope):
+            result = await session.execute(delete(model).where(model.id.in_(ids), *scope).returning(model.id))
+        if deleted := set(result.scalars().all()):
+            self._written()
+        return deleted
+
+    async def create(self, *args: Any, **kwargs: Any) -> ModelT:
+        db_obj = await super().create(*args, **kwargs)
+        self._written(db_obj)
+        return db_obj
+
+    async def create_many(self, *args: Any, **kwargs: Any) -> Sequence[ModelT]:
+        db_objs = await super().create_many(*args, **kwargs)
+        self._written(*db_objs)
+        return db_objs
+
+    async def update(self, *args: Any, **kwargs: Any) -> ModelT:
+        db_obj = await super().update(*args, **kwargs)
+        self._written(db_obj)
+        return db_obj
+
+    async def update_many(self, *args: Any, **kwargs: Any) -> Sequence[ModelT]:
+        db_objs = await super().update_many(*args, **kwargs)
+        self._written(*db_objs)
+        return db_objs
+
+    async def upsert(self, *args: Any, **kwargs: Any) -> ModelT:
+        db_obj = await super().upsert(*args, **kwargs)
+        self._written(db_obj)
+        return db_obj
+
+    async def upsert_many(self, *args: Any, **kwargs: Any) -> Sequence[ModelT]:
+        db_objs = await super().upsert_many(*args, **kwargs)
+        self._written(*db_objs)
+        return db_objs
+
+    async def delete(self, *args: Any, **kwargs: Any) -> ModelT:
+        db_obj = await super().delete(*args, **kwargs)
+        self._written(db_obj)
+        return db_obj
+
+    async def delete_many(self, *args: Any, **kwargs: Any) -> Sequence[ModelT]:
+        db_objs = await super().delete_many(*args, **kwargs)
+        self._written(*db_objs)
+        return db_objs
+
+    async def delete_where(self, *args: Any, **kwargs: Any) -> Sequence[ModelT]:
+        db_objs = await super().delete_where(*args, **kwargs)
+        self._written(*db_objs)
+        return db_objs
+
+
+class SoftDeleteService(CountCachingService[ModelT]):
+    """Service for models with a ``deleted_at`` column: deleting moves rows to the trash, from which they can be restored.
+
+    Trash and restore are single ``UPDATE ... RETURNING`` statements; tombstones are removed for good by
+    :meth:`purge_trash`, a bounded batch at a time.
+    """
+
+    async def batch_trash(self, ids: Sequence[UUID], *scope: ColumnElement[bool]) -> BatchResult:
+        """Move live rows among ``ids`` to the trash, reporting those that were not found."""
+        return id_results(ids, await self.trash_batch(set(ids), *scope))
+
+    async def batch_restore(self, ids: Sequence[UUID], *scope: ColumnElement[bool]) -> BatchResult:
+        """Restore trashed rows among ``ids``, reporting those that were not found."""
+        return id_results(ids, await self.restore_batch(set(ids), *scope))
+
+    async def trash_batch(self, ids: Collection[UUID], *scope: ColumnElement[bool]) -> set[UUID]:
+        """Set ``deleted_at`` on the live rows among ``ids`` matching ``scope``; return the trashed ids."""
+        return await self._set_deleted_at(ids, datetime.now(UTC), *scope)
+
+    async def restore_batch(self, ids: Collection[UUID], *scope: ColumnElement[bool]) -> set[UUID]:
+        """Clear ``deleted_at`` on the trashed rows among ``ids`` matching ``scope``; return the restored ids."""
+        return await self._set_deleted_at(ids, None, *scope)
+
+    async def purge_trash(self, before: datetime, limit: int, *where: ColumnElement[bool]) -> int:
+        """Hard-delete up to ``limit`` rows trashed before ``before``; return how many were deleted.
+
+        The rows are picked from the partial ``deleted_at`` index, so each call costs the same however large the table.
+        """
+        model: Any = self.repository.model_type
+        batch = select(model.id).where(model.deleted_at < before, *where).limit(limit)
+        result = await self.session.execute(delete(model).where(model.id.in_(batch)))
+        if result.rowcount:
+            self._written()
+        return int(result.rowcount or 0)
+
+    async def _set_deleted_at(self, ids: Collection[UUID], deleted_at: datetime | None, *scope: ColumnElement[bool]) -> set[UUID]:
+        """Trash the live rows among ``ids``, or restore the trashed ones when ``deleted_at`` is ``None``."""
+        if not ids:
+            return set()
+        model: Any = self.repository.model_type
+        session = self.session
+        in_state = model.deleted_at.is_(None) if deleted_at is not None else model.deleted_at.is_not(None)
+        statement = update(model).where(model.id.in_(ids), in_state, *scope).values(deleted_at=deleted_at).returning(model.id)
+        async with tracking(session, model, model.id.in_(ids), *scope):
+            changed = set((await session.execute(statement)).scalars().all())
+        if changed:
+            self._written()
+        return changed
@@ -1,14 +1,78 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any, ClassVar
+
 from advanced_alchemy.repository import SQLAlchemyAsyncRepository
-from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, raiseload
 
+from app.lib.exports import apply_filters
+from app.lib.search import register_full_text_index
+from app.services.base import SoftDeleteService
 from database import models as m
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from uuid import UUID
+
+    from advanced_alchemy.filters import StatementFilter
+    from advanced_alchemy.repository import LoadSpec
+    from sqlalchemy import ColumnElement, Select
+
+search_index = register_full_text_index(
+    m.Contact,
+    {
+        "first_name": 10.0,
+        "last_name": 10.0,
+        "email": 5.0,
+        "phone": 3.0,
+        "city": 1.0,
+        "region": 1.0,
+        "country": 1.0,
+        "postal_code": 1.0,
+        "address": 1.0,
+    },
+)
+
 
 class ContactRepository(SQLAlchemyAsyncRepository[m.Contact]):
     model_type = m.Contact
 
 
-class ContactService(SQLAlchemyAsyncRepositoryService[m.Contact]):
+class ContactService(SoftDeleteService[m.Contact]):
     repository_type = ContactRepository
+    sortable_fields: ClassVar[dict[str, tuple[str, ...]]] = {"name": ("last_name", "first_name"), "created_at": ("created_at",), "updated_at": ("updated_at",)}
+    """``orderBy`` names accepted by list endpoints, mapped to the indexed columns they sort on."""
+
+    load_with_organization: ClassVar[LoadSpec] = [joinedload(m.Contact.organization, innerjoin=True), raiseload("*")]
+    """Join each contact's organization into the same statement; any other relationship raises instead of lazy loading."""
+
+    async def list_with_organization(self, *filters: StatementFilter | ColumnElement[bool], **kwargs: Any) -> tuple[Sequence[m.Contact], int]:
+        """List contacts and their organization in a single statement, whatever the page size."""
+        return await self.list_and_count(*filters, load=self.load_with_organization, **kwargs)
+
+    async def get_with_organization(self, *filters: StatementFilter | ColumnElement[bool], **kwargs: Any) -> m.Contact:
+        """Get one contact and its organization in a single statement."""
+        return await self.get_one(*filters, load=self.load_with_organization, **kwargs)
+
+    def export_statement(self, *filters: StatementFilter | ColumnElement[bool]) -> Select[Any]:
+        """Plain columns of the filtered contacts, in the layout the import accepts, with the organization's name."""
+        c = m.Contact
+        columns = (c.id, c.first_name, c.last_name, m.Organization.name.label("organization"), c.email, c.phone, c.address, c.city, c.region, c.country, c.postal_code)
+        statement = select(*columns, c.created_at, c.updated_at).join(m.Organization, c.organization_id == m.Organization.id)
+        return apply_filters(statement, c, filters)
+
+    async def check_changes(self, changes: Mapping[UUID, dict[str, Any]]) -> dict[UUID, str]:
+        """Reject moves to an organization of another account or in the trash."""
+        moves = {contact_id: values["organization_id"] for contact_id, values in changes.items() if "organization_id" in values}
+        if not moves:
+            return {}
+        session = self.session
+        contact_accounts = dict((await session.execute(select(m.Contact.id, m.Contact.account_id).where(m.Contact.id.in_(moves)))).tuples().all())
+        live_organizations = select(m.Organization.id, m.Organization.account_id).where(m.Organization.id.in_(set(moves.values())), m.Organization.deleted_at.is_(None))
+        organization_accounts = dict((await session.execute(live_organizations)).tuples().all())
+        return {
+            contact_id: "Unknown organization"
+            for contact_id, organization_id in moves.items()
+            if contact_id in contact_accounts and organization_accounts.get(organization_id) != contact_accounts[contact_id]
+        }
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, ClassVar
+
+from app import schemas
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from app.services.contacts import ContactService
+    from app.services.organizations import OrganizationService
+
+
+class OrganizationImporter:
+    """Insert imported organizations into an account, committing after each chunk."""
+
+    row_type: ClassVar[type[schemas.OrganizationImport]] = schemas.OrganizationImport
+
+    def __init__(self, organizations_service: OrganizationService, account_id: UUID) -> None:
+        self.organizations_service = organizations_service
+        self.account_id = account_id
+
+    async def write(self, rows: list[schemas.OrganizationImport]) -> int:
+        created = await self.organizations_service.bulk_insert([{**row.to_dict(), "account_id": self.account_id} for row in rows])
+        await self.organizations_service.repository.session.commit()
+        return created
+
+
+class ContactImporter:
+    """Insert imported contacts into an account, committing after each chunk.
+
+    Organization names are resolved through a name to id map of the account, loaded once; organizations that do not
+    exist yet are created along with the first chunk that mentions them.
+    """
+
+    row_type: ClassVar[type[schemas.ContactImport]] = schemas.ContactImport
+
+    def __init__(self, contacts_service: ContactService, organizations_service: OrganizationService, account_id: UUID) -> None:
+        self.contacts_service = contacts_service
+        self.organizations_service = organizations_service
+        self.account_id = account_id
+        self.organization_ids: dict[str, UUID] | None = None
+
+    async def write(self, rows: list[schemas.ContactImport]) -> int:
+        if self.organization_ids is None:
+            self.organization_ids = await self.organizations_service.ids_by_name(self.account_id)
+        if missing := {row.organization for row in rows}.difference(self.organization_ids):
+            await self.organizations_service.bulk_insert([{"name": name, "account_id": self.account_id} for name in sorted(missing)])
+            self.organization_ids.update(await self.organizations_service.ids_by_name(self.account_id, missing))
+        values = []
+        for row in rows:
+            data = row.to_dict()
+            data["organization_id"] = self.organization_ids[data.pop("organization")]
+            data["account_id"] = self.account_id
+            values.append(data)
+        created = await self.contacts_service.bulk_insert(values)
+        await self.contacts_service.repository.session.commit()
+        return created
@@ -0,0 +1,215 @@
+"""Background jobs persisted in the ``job`` table and run by in-process workers.
+
+A job is submitted once per ``(key, data_generation)``: while one is queued, running or done, submitting the same work
+again returns it, so a finished job is the cached result of its key until the account's data changes. Workers claim
+jobs with a conditional ``UPDATE``, so a job runs once even when several processes share the database, and jobs left
+queued or running by a stopped process are picked up again at startup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+from advanced_alchemy.repository import SQLAlchemyAsyncRepository
+from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+from sqlalchemy import delete, event, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.lib.routing import route_reads, unscoped
+from config import get_settings
+from database import models as m
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable
+    from uuid import UUID
+
+    from litestar import Litestar
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    JobHandler = Callable[[AsyncSession, m.Job], Awaitable[dict[str, Any]]]
+
+__all__ = ("JobRepository", "JobRunner", "JobService", "job_key", "job_runner")
+
+settings = get_settings()
+
+_encoder = msgspec.json.Encoder(order="sorted")
+
+
+def job_key(kind: str, account_id: UUID, params: dict[str, Any]) -> str:
+    """Identify the work of a job, whatever the order its ``params`` were given in."""
+    return hashlib.sha256(b"\0".join((kind.encode(), account_id.bytes, _encoder.encode(params)))).hexdigest()
+
+
+class JobRepository(SQLAlchemyAsyncRepository[m.Job]):
+    model_type = m.Job
+
+
+class JobService(SQLAlchemyAsyncRepositoryService[m.Job]):
+    """Looks up jobs, and their results, for requests."""
+
+    repository_type = JobRepository
+
+    @property
+    def session(self) -> AsyncSession:
+        """The session of the repository; see :func:`~app.lib.routing.unscoped`."""
+        return unscoped(self.repository.session)
+
+    async def current(self, key: str, data_generation: int) -> m.Job | None:
+        """The latest job of ``key`` computed, or being computed, from ``data_generation`` that has not failed."""
+        statement = select(m.Job).where(m.Job.key == key, m.Job.data_generation == data_generation, m.Job.status != m.JobStatus.FAILED).order_by(m.Job.created_at.desc()).limit(1)
+        job: m.Job | None = await self.session.scalar(statement)
+        return job
+
+    async def submit(self, kind: str, account_id: UUID, params: dict[str, Any], data_generation: int) -> m.Job:
+        """The current job of this work, or a new one queued when the transaction commits."""
+        key = job_key(kind, account_id, params)
+        job = await self.current(key, data_generation)
+        if job is None:
+            job = await self.create(m.Job(kind=kind, key=key, account_id=account_id, params=params, data_generation=data_generation))
+            job_runner.enqueue_on_commit(self.session, job.id)
+        return job
+
+    async def get_for_accounts(self, job_id: UUID, *where: ColumnElement[bool]) -> m.Job:
+        return await self.get_one(m.Job.id == job_id, *where)
+
+
+class JobRunner:
+    """Runs jobs on ``workers`` tasks of the app's event loop, which bounds how many run at once.
+
+    Handlers are registered per ``kind`` and get their own session, committed with the result. ``completed`` and
+    ``failed`` count the jobs run by this process.
+    """
+
+    def __init__(self, workers: int, stale_after: float) -> None:
+        self.workers = workers
+        self.stale_after = stale_after
+        self.completed = 0
+        self.failed = 0
+        self._handlers: dict[str, JobHandler] = {}
+        self._queue: asyncio.Queue[UUID] | None = None
+        self._running: set[UUID] = set()
+
+    def register(self, kind: str) -> Callable[[JobHandler], JobHandler]:
+        """Decorate the coroutine computing the result of ``kind`` jobs."""
+
+        def decorator(handler: JobHandler) -> JobHandler:
+            self._handlers[kind] = handler
+            return handler
+
+        return decorator
+
+    def enqueue_on_commit(self, session: AsyncSession, job_id: UUID) -> None:
+        """Hand ``job_id`` to the workers once ``session`` commits, so they find the job; a rollback forgets it."""
+        event.listen(session.sync_session, "after_commit", lambda _: self.enqueue(job_id), once=True)
+
+    def enqueue(self, job_id: UUID) -> None:
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+    async def run(self, job_id: UUID) -> bool:
+        """Claim and run a queued job; return whether this call ran it."""
+        from app import config
+
+        now = datetime.now(UTC)
+        async with JobService.new(config=config.alchemy) as service:
+            session = service.session
+            claim = (
+                update(m.Job)
+                .where(m.Job.id == job_id, m.Job.status == m.JobStatus.QUEUED)
+                .values(status=m.JobStatus.RUNNING, started_at=now, attempts=m.Job.attempts + 1, updated_at=now)
+                .returning(m.Job)
+            )
+            job = await session.scalar(claim)
+            await session.commit()
+            if job is None:
+                return False
+            # a rollback expires ``job``
+            key, data_generation = job.key, job.data_generation
+            self._running.add(job_id)
+            route_reads(session, settings.db.get_read_engine())
+            values: dict[str, Any]
+            try:
+                values = {"status": m.JobStatus.DONE, "result": await self._handlers[job.kind](session, job), "error": None}
+                # end the handler's read transaction, which on SQLite would deadlock with another worker's write
+                await session.commit()
+            except Exception as exc:  # noqa: BLE001
+                await session.rollback()
+                values = {"status": m.JobStatus.FAILED, "error": f"{type(exc).__name__}: {exc}"}
+            finally:
+                self._running.discard(job_id)
+            now = datetime.now(UTC)
+            await session.execute(update(m.Job).where(m.Job.id == job_id).values(finished_at=now, updated_at=now, **values))
+            if values["status"] == m.JobStatus.DONE:
+                # results computed from older data of the same key are never served again
+                await session.execute(delete(m.Job).where(m.Job.key == key, m.Job.data_generation < data_generation))
+                self.completed += 1
+            else:
+                self.failed += 1
+            await session.commit()
+        return True
+
+    async def recover(self) -> list[UUID]:
+        """Queue again the jobs running for longer than ``stale_after``, and return the ids of every queued job, oldest first."""
+        from app import config
+
+        stale = datetime.now(UTC) - timedelta(seconds=self.stale_after)
+        async with JobService.new(config=config.alchemy) as service:
+            session = service.repository.session
+            await session.execute(
+                update(m.Job).where(m.Job.status == m.JobStatus.RUNNING, or_(m.Job.started_at.is_(None), m.Job.started_at < stale)).values(status=m.JobStatus.QUEUED),
+            )
+            queued = await session.scalars(select(m.Job.id).where(m.Job.status == m.JobStatus.QUEUED).order_by(m.Job.created_at))
+            job_ids = list(queued)
+            await session.commit()
+        return job_ids
+
+    async def _release(self) -> None:
+        """Hand the jobs interrupted by shutdown back to the queue, for the next start to run."""
+        from app import config
+
+        if not self._running:
+            return
+        running, self._running = self._running, set()
+        async with config.alchemy.get_engine().begin() as conn:
+            await conn.execute(
+                update(m.Job).where(m.Job.id.in_(running), m.Job.status == m.JobStatus.RUNNING).values(status=m.JobStatus.QUEUED),
+            )
+
+    async def _work(self, queue: asyncio.Queue[UUID]) -> None:
+        while True:
+            job_id = await queue.get()
+            with contextlib.suppress(SQLAlchemyError):
+                await self.run(job_id)
+            queue.task_done()
+
+    @asynccontextmanager
+    async def lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        if self.workers <= 0:
+            yield
+            return
+        queue: asyncio.Queue[UUID] = asyncio.Queue()
+        for job_id in await self.recover():
+            queue.put_nowait(job_id)
+        self._queue = queue
+        tasks = [asyncio.create_task(self._work(queue)) for _ in range(self.workers)]
+        try:
+            yield
+        finally:
+            self._queue = None
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+            with contextlib.suppress(SQLAlchemyError):
+                await self._release()
+
+
+job_runner = JobRunner(workers=settings.app.JOB_WORKERS, stale_after=settings.app.JOB_STALE_AFTER)
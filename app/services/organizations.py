@@ -1,14 +1,158 @@
 from __future__ import annotations
 
+import sys
+from typing import TYPE_CHECKING, Any, ClassVar
+
 from advanced_alchemy.repository import SQLAlchemyAsyncRepository
-from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy.orm import raiseload, selectinload, with_expression
 
+from app.lib.exports import apply_filters
+from app.lib.search import register_full_text_index
+from app.services.base import SoftDeleteService, count_cache, invalidate_response_cache
+from app.services.stats import tracking
 from database import models as m
 
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Mapping, Sequence
+    from datetime import datetime
+    from uuid import UUID
+
+    from advanced_alchemy.filters import StatementFilter
+    from advanced_alchemy.repository import LoadSpec
+    from sqlalchemy import ColumnElement, Delete, Select, Update
+
+search_index = register_full_text_index(
+    m.Organization,
+    {
+        "name": 10.0,
+        "email": 5.0,
+        "phone": 3.0,
+        "city": 1.0,
+        "region": 1.0,
+        "country": 1.0,
+        "postal_code": 1.0,
+        "address": 1.0,
+    },
+)
+
+contacts_count = select(func.count()).where(m.Contact.organization_id == m.Organization.id, m.Contact.deleted_at.is_(None)).correlate(m.Organization).scalar_subquery()
+"""Correlated count of an organization's live contacts, answered from ``ix_contact_organization_id``."""
+organization_deleted_at = select(m.Organization.deleted_at).where(m.Organization.id == m.Contact.organization_id).correlate(m.Contact).scalar_subquery()
+"""Correlated ``deleted_at`` of a contact's organization."""
+
+
+def with_name_search(values: dict[str, Any]) -> dict[str, Any]:
+    """``values`` with the ``name_search`` key of the ``name`` they set, as the ORM adds it to new and updated rows."""
+    return {**values, "name_search": m.search_key(values["name"])} if values.get("name") is not None else values
+
+
+def _successor(key: str) -> str | None:
+    """The smallest string after every string starting with ``key``, or ``None`` when there is none."""
+    for index in range(len(key) - 1, -1, -1):
+        if (code := ord(key[index]) + 1) <= sys.maxunicode:
+            # surrogates cannot be encoded, and nothing starting with ``key`` contains them
+            return key[:index] + chr(0xE000 if 0xD800 <= code <= 0xDFFF else code)
+    return None
+
 
 class OrganizationRepository(SQLAlchemyAsyncRepository[m.Organization]):
     model_type = m.Organization
 
 
-class OrganizationService(SQLAlchemyAsyncRepositoryService[m.Organization]):
+class OrganizationService(SoftDeleteService[m.Organization]):
     repository_type = OrganizationRepository
+    sortable_fields: ClassVar[dict[str, tuple[str, ...]]] = {"name": ("name",), "created_at": ("created_at",), "updated_at": ("updated_at",)}
+    """``orderBy`` names accepted by list endpoints, mapped to the indexed columns they sort on."""
+
+    load_with_counts: ClassVar[LoadSpec] = [with_expression(m.Organization.contacts_count, contacts_count), raiseload("*")]
+    """Count each organization's contacts in the listing statement; relationships raise instead of lazy loading."""
+    load_with_contacts: ClassVar[LoadSpec] = [
+        with_expression(m.Organization.contacts_count, contacts_count),
+        selectinload(m.Organization.contacts.and_(m.Contact.deleted_at.is_(None))),
+        raiseload("*"),
+    ]
+    """Load the live contacts with one extra ``IN`` query, on top of the count."""
+
+    async def list_with_counts(self, *filters: StatementFilter | ColumnElement[bool], **kwargs: Any) -> tuple[Sequence[m.Organization], int]:
+        """List organizations with their contact counts in a single statement, whatever the page size."""
+        return await self.list_and_count(*filters, load=self.load_with_counts, **kwargs)
+
+    async def get_with_contacts(self, *filters: StatementFilter | ColumnElement[bool], **kwargs: Any) -> m.Organization:
+        """Get one organization and its contacts in two statements."""
+        return await self.get_one(*filters, load=self.load_with_contacts, **kwargs)
+
+    async def ids_by_name(self, account_id: UUID, names: Iterable[str] | None = None) -> dict[str, UUID]:
+        """Map live organization names of an account to their ids, optionally only for ``names``."""
+        statement = select(m.Organization.name, m.Organization.id).where(m.Organization.account_id == account_id, m.Organization.deleted_at.is_(None))
+        if names is not None:
+            statement = statement.where(m.Organization.name.in_(names))
+        return dict((await self.session.execute(statement)).tuples().all())
+
+    @staticmethod
+    def typeahead_statement(account_id: UUID, prefix: str, limit: int) -> Select[tuple[UUID, str]]:
+        """The first ``limit`` live organizations of an account whose name starts with ``prefix``, ignoring case.
+
+        The prefix is folded like ``name_search`` and matched as the range of keys starting with it, which the
+        ``(account_id, name_search)`` index serves in order without reading the other organizations; ``LIKE`` would scan
+        them.
+        """
+        o = m.Organization
+        statement = select(o.id, o.name).where(o.account_id == account_id, o.deleted_at.is_(None)).order_by(o.name_search).limit(limit)
+        if key := m.search_key(prefix):
+            statement = statement.where(o.name_search >= key)
+            if (successor := _successor(key)) is not None:
+                statement = statement.where(o.name_search < successor)
+        return statement
+
+    async def bulk_insert(self, rows: Sequence[dict[str, Any]]) -> int:
+        return await super().bulk_insert([with_name_search(row) for row in rows])
+
+    async def update_batch(self, changes: Mapping[UUID, dict[str, Any]], *scope: ColumnElement[bool]) -> set[UUID]:
+        return await super().update_batch({item_id: with_name_search(values) for item_id, values in changes.items()}, *scope)
+
+    async def names_starting_with(self, account_id: UUID, prefix: str, limit: int) -> list[tuple[UUID, str]]:
+        return list((await self.session.execute(self.typeahead_statement(account_id, prefix, limit))).tuples())
+
+    def export_statement(self, *filters: StatementFilter | ColumnElement[bool]) -> Select[Any]:
+        """Plain columns of the filtered organizations, in the layout the import accepts."""
+        o = m.Organization
+        statement = select(o.id, o.name, o.email, o.phone, o.address, o.city, o.region, o.country, o.postal_code, o.created_at, o.updated_at)
+        return apply_filters(statement, o, filters)
+
+    async def delete_batch(self, ids: Collection[UUID], *scope: ColumnElement[bool]) -> set[UUID]:
+        """Delete organizations and, as the ORM cascade on ``Organization.contacts`` would, their contacts."""
+        if not ids:
+            return set()
+        in_scope = m.Contact.organization_id.in_(select(m.Organization.id).where(m.Organization.id.in_(ids), *scope))
+        await self._write_contacts(delete(m.Contact).where(in_scope), in_scope)
+        return await super().delete_batch(ids, *scope)
+
+    async def trash_batch(self, ids: Collection[UUID], *scope: ColumnElement[bool]) -> set[UUID]:
+        """Trash organizations and their live contacts, which take the organization's ``deleted_at``."""
+        trashed = await super().trash_batch(ids, *scope)
+        if trashed:
+            in_trashed = m.Contact.organization_id.in_(trashed)
+            await self._write_contacts(update(m.Contact).where(in_trashed, m.Contact.deleted_at.is_(None)).values(deleted_at=organization_deleted_at), in_trashed)
+        return trashed
+
+    async def restore_batch(self, ids: Collection[UUID], *scope: ColumnElement[bool]) -> set[UUID]:
+        """Restore organizations and the contacts trashed along with them, leaving contacts trashed on their own."""
+        if not ids:
+            return set()
+        in_trash = m.Contact.organization_id.in_(select(m.Organization.id).where(m.Organization.id.in_(ids), m.Organization.deleted_at.is_not(None), *scope))
+        await self._write_contacts(update(m.Contact).where(in_trash, m.Contact.deleted_at == organization_deleted_at).values(deleted_at=None), in_trash)
+        return await super().restore_batch(ids, *scope)
+
+    async def purge_trash(self, before: datetime, limit: int, *where: ColumnElement[bool]) -> int:
+        """Hard-delete old tombstones that no contact points to any more; purge contacts first."""
+        return await super().purge_trash(before, limit, ~exists().where(m.Contact.organization_id == m.Organization.id), *where)
+
+    async def _write_contacts(self, statement: Delete | Update, contacts: ColumnElement[bool]) -> None:
+        """Run a bulk write on the ``contacts`` of some organizations, keeping counts, cached responses and stats current."""
+        session = self.session
+        async with tracking(session, m.Contact, contacts):
+            result = await session.execute(statement.execution_options(synchronize_session=False))
+        if result.rowcount:
+            count_cache.written(m.Contact.__tablename__, session.sync_session)
+            invalidate_response_cache(m.Contact.__tablename__, session=session.sync_session)
@@ -0,0 +1,182 @@
+"""Reports on an account's contacts and organizations, computed by background jobs.
+
+A report is identified by its name, the account and its parameters, and computed once per data generation of the
+account (see ``app.services.stats``): viewing it again serves the stored result of its job until contacts or
+organizations of the account are written to.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING, Any, cast
+
+import msgspec
+from advanced_alchemy.exceptions import NotFoundError
+from litestar.exceptions import ValidationException
+from sqlalchemy import and_, func, select
+
+from app import schemas
+from app.services.jobs import JobService, job_runner
+from app.services.stats import data_generation
+from database import models as m
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from uuid import UUID
+
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    ReportBuilder = Callable[[AsyncSession, UUID, Any], Awaitable[schemas.ReportTable]]
+
+__all__ = ("Report", "ReportService", "get_report")
+
+
+@dataclass(frozen=True)
+class Report:
+    name: str
+    title: str
+    params_type: type[msgspec.Struct]
+    build: ReportBuilder
+
+    @property
+    def kind(self) -> str:
+        """Kind of the jobs computing this report."""
+        return f"report:{self.name}"
+
+    def parse_params(self, raw: dict[str, Any]) -> dict[str, Any]:
+        """Validate ``raw`` parameters and return them complete with defaults, the same way whatever was omitted.
+
+        Raises:
+            ValidationException: a parameter is invalid.
+        """
+        try:
+            params = msgspec.convert({name: value for name, value in raw.items() if value is not None}, self.params_type, strict=False)
+        except msgspec.ValidationError as exc:
+            raise ValidationException(detail=str(exc)) from exc
+        return cast("dict[str, Any]", msgspec.to_builtins(params))
+
+
+_reports: dict[str, Report] = {}
+
+
+def get_report(name: str) -> Report:
+    """The report called ``name``.
+
+    Raises:
+        NotFoundError: there is no such report.
+    """
+    if (report := _reports.get(name)) is None:
+        msg = f"No report named {name!r}"
+        raise NotFoundError(msg)
+    return report
+
+
+def report(name: str, title: str, params_type: type[msgspec.Struct]) -> Callable[[ReportBuilder], ReportBuilder]:
+    """Register a report, and the job computing it, built by the decorated coroutine."""
+
+    def decorator(build: ReportBuilder) -> ReportBuilder:
+        registered = _reports[name] = Report(name=name, title=title, params_type=params_type, build=build)
+
+        @job_runner.register(registered.kind)
+        async def run(session: AsyncSession, job: m.Job) -> dict[str, Any]:
+            return cast("dict[str, Any]", msgspec.to_builtins(await build(session, job.account_id, msgspec.convert(job.params, params_type))))
+
+        return build
+
+    return decorator
+
+
+@report("organizations", "Contacts by organization", schemas.OrganizationReportParams)
+async def organization_report(session: AsyncSession, account_id: UUID, params: schemas.OrganizationReportParams) -> schemas.ReportTable:
+    o, c = m.Organization, m.Contact
+    contacts = func.count(c.id)
+    statement = (
+        select(o.name, contacts, func.count(c.email), func.count(c.phone))
+        .select_from(o)
+        .outerjoin(c, and_(c.organization_id == o.id, c.deleted_at.is_(None)))
+        .where(o.account_id == account_id, o.deleted_at.is_(None))
+        .group_by(o.id, o.name)
+        .order_by(contacts.desc(), o.name)
+        .limit(params.limit)
+    )
+    rows = await session.execute(statement)
+    return schemas.ReportTable(columns=["Organization", "Contacts", "With email", "With phone"], rows=[list(row) for row in rows])
+
+
+@report("countries", "Contacts by country", schemas.CountryReportParams)
+async def country_report(session: AsyncSession, account_id: UUID, params: schemas.CountryReportParams) -> schemas.ReportTable:
+    c = m.Contact
+    where = [c.account_id == account_id, c.deleted_at.is_(None)]
+    if params.country is not None:
+        where.append(c.country == params.country)
+    column = c.country if params.country is None else c.region
+    contacts = func.count()
+    statement = select(column, contacts).where(*where).group_by(column).order_by(contacts.desc(), column)
+    rows = await session.execute(statement)
+    return schemas.ReportTable(columns=["Country" if params.country is None else "Region", "Contacts"], rows=[list(row) for row in rows])
+
+
+def _month(start: date, offset: int) -> date:
+    months = start.year * 12 + start.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+@report("growth", "Monthly growth", schemas.GrowthReportParams)
+async def growth_report(session: AsyncSession, account_id: UUID, params: schemas.GrowthReportParams, batch_size: int = 1000) -> schemas.ReportTable:
+    """Contacts and organizations created per month, counted while streaming their creation dates.
+
+    Bucketing in Python keeps the statement portable across databases, whose month truncation differs.
+    """
+    first = _month(datetime.now(UTC).date(), 1 - params.months)
+    counts = {f"{_month(first, offset):%Y-%m}": [0, 0] for offset in range(params.months)}
+    models: tuple[type[m.Contact | m.Organization], ...] = (m.Contact, m.Organization)
+    for index, model in enumerate(models):
+        statement = select(model.created_at).where(
+            model.account_id == account_id,
+            model.deleted_at.is_(None),
+            model.created_at >= datetime(first.year, first.month, 1, tzinfo=UTC),
+        )
+        async for partition in (await session.stream_scalars(statement.execution_options(yield_per=batch_size))).partitions():
+            for created_at in partition:
+                if (month := counts.get(f"{created_at:%Y-%m}")) is not None:
+                    month[index] += 1
+    return schemas.ReportTable(columns=["Month", "Contacts", "Organizations"], rows=[[month, *row] for month, row in counts.items()])
+
+
+class ReportService(JobService):
+    """Serves reports from the results of their jobs, and submits a job when the current data has none."""
+
+    @staticmethod
+    def reports() -> list[schemas.ReportType]:
+        return [schemas.ReportType(name=report.name, title=report.title) for report in _reports.values()]
+
+    async def request(self, account_id: UUID, name: str, raw_params: dict[str, Any]) -> m.Job:
+        """The job of report ``name`` for the current data of the account, submitted if there is none.
+
+        Raises:
+            NotFoundError: there is no such report.
+            ValidationException: a parameter is invalid.
+        """
+        report = get_report(name)
+        params = report.parse_params(raw_params)
+        generation = await data_generation(self.session, account_id)
+        return await self.submit(report.kind, account_id, params, generation)
+
+    async def get_report_job(self, job_id: UUID, *where: ColumnElement[bool]) -> m.Job:
+        return await self.get_for_accounts(job_id, m.Job.kind.startswith("report:"), *where)
+
+    @staticmethod
+    def to_report_job(job: m.Job) -> schemas.ReportJob:
+        return schemas.ReportJob(
+            id=job.id,
+            report=job.kind.removeprefix("report:"),
+            status=job.status,
+            params=job.params,
+            data_generation=job.data_generation,
+            created_at=job.created_at,
+            finished_at=job.finished_at,
+            result=msgspec.convert(job.result, schemas.ReportTable) if job.result is not None else None,
+            error=job.error,
+        )
@@ -0,0 +1,355 @@
+"""Per-account dashboard statistics, kept current by the services' write paths.
+
+Every live (not trashed) contact and organization adds 1 to a few ``(metric, bucket)`` totals of its account in
+``account_stat``. Writes made through the services apply the difference they make to those totals in the same
+transaction: unit-of-work writes from the attribute history at flush, bulk statements from a snapshot of the rows they
+touch, taken before and after. Reading the dashboard is then a handful of primary key and index lookups, whatever the
+number of rows behind them. :class:`StatsReconciler` recounts periodically to repair drift, e.g. from raw SQL.
+
+The same writes move the account's data generation forward, which versions results derived from its rows, such as
+reports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from advanced_alchemy.repository import SQLAlchemyAsyncRepository
+from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+from sqlalchemy import delete, event, inspect, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.lib.routing import unscoped
+from config import get_settings
+from database import models as m
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable, Collection, Iterable, Mapping
+
+    from litestar import Litestar
+    from sqlalchemy import ColumnElement, Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstrumentedAttribute, UOWTransaction
+
+__all__ = ("AccountStatService", "StatSource", "StatsReconciler", "data_generation", "get_stat_source", "record_inserted", "stats_reconciler", "tracking")
+
+settings = get_settings()
+
+StatDelta = Counter[tuple[UUID, str, str]]
+"""Changes to ``account_stat`` values, by ``(account_id, metric, bucket)``."""
+
+PER_ORGANIZATION = "organization_contacts"
+"""Metric whose buckets are organization ids."""
+DATA_GENERATION = "data_generation"
+"""Metric counting the writes to an account's live rows; anything derived from them is stale once it moves."""
+
+
+def _day(value: datetime | None) -> str:
+    return (value or datetime.now(UTC)).date().isoformat()
+
+
+@dataclass(frozen=True)
+class StatSource:
+    """What a live row of ``model`` counts towards, computed from ``columns``."""
+
+    model: type[Any]
+    columns: tuple[InstrumentedAttribute[Any], ...]
+    buckets: Callable[[Mapping[str, Any]], Iterable[tuple[str, str]]]
+
+    @property
+    def keys(self) -> frozenset[str]:
+        return frozenset(column.key for column in self.columns)
+
+    def tally(self, rows: Iterable[Mapping[Any, Any]], sign: int = 1, into: StatDelta | None = None) -> StatDelta:
+        """Add ``sign`` to every total the live ``rows`` count towards."""
+        delta = StatDelta() if into is None else into
+        for row in rows:
+            if row.get("deleted_at") is None:
+                for metric, bucket in self.buckets(row):
+                    delta[row["account_id"], metric, bucket] += sign
+        return delta
+
+    async def snapshot(self, session: AsyncSession, *where: ColumnElement[bool]) -> StatDelta:
+        """Totals contributed by the live rows matching ``where``."""
+        statement = select(*self.columns).where(self.model.deleted_at.is_(None), *where)
+        return self.tally((await session.execute(statement)).mappings())
+
+    async def accounts(self, session: AsyncSession, *where: ColumnElement[bool]) -> set[UUID]:
+        """Accounts owning live rows matching ``where``."""
+        statement = select(self.model.account_id).where(self.model.deleted_at.is_(None), *where).distinct()
+        return set((await session.scalars(statement)).all())
+
+
+_sources: dict[type[Any], StatSource] = {}
+
+
+def register_stat_source(source: StatSource) -> StatSource:
+    _sources[source.model] = source
+    return source
+
+
+def get_stat_source(model: type[Any]) -> StatSource | None:
+    return _sources.get(model)
+
+
+contact_stats = register_stat_source(
+    StatSource(
+        m.Contact,
+        (m.Contact.account_id, m.Contact.organization_id, m.Contact.country, m.Contact.region, m.Contact.created_at, m.Contact.deleted_at),
+        lambda row: (
+            ("contacts", ""),
+            ("contacts_by_country", row["country"] or ""),
+            ("contacts_by_region", row["region"] or ""),
+            (PER_ORGANIZATION, str(row["organization_id"])),
+            ("contacts_created", _day(row.get("created_at"))),
+        ),
+    ),
+)
+organization_stats = register_stat_source(
+    StatSource(
+        m.Organization,
+        (m.Organization.account_id, m.Organization.created_at, m.Organization.deleted_at),
+        lambda row: (("organizations", ""), ("organizations_created", _day(row.get("created_at")))),
+    ),
+)
+
+
+def _touch(delta: StatDelta, accounts: Iterable[UUID]) -> StatDelta:
+    """Move the data generation of ``accounts`` forward."""
+    for account_id in accounts:
+        delta[account_id, DATA_GENERATION, ""] = 1
+    return delta
+
+
+def _touched(delta: StatDelta) -> set[UUID]:
+    return {account_id for account_id, _, _ in delta}
+
+
+def _upsert(dialect: str, delta: StatDelta) -> tuple[Any, list[dict[str, Any]]] | None:
+    """An ``INSERT ... ON CONFLICT`` adding ``delta`` to the stored values, with its parameters."""
+    rows = [
+        {
+            "account_id": account_id,
+            "metric": metric,
+            "bucket": bucket,
+            "value": value,
+            "organization_id": UUID(bucket) if metric == PER_ORGANIZATION else None,
+        }
+        for (account_id, metric, bucket), value in delta.items()
+        if value
+    ]
+    if not rows or dialect not in {"sqlite", "postgresql"}:
+        # other dialects are left to the reconcile job
+        return None
+    table = m.AccountStat.__table__
+    insert = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+    statement = insert.on_conflict_do_update(index_elements=[table.c.account_id, table.c.metric, table.c.bucket], set_={"value": table.c.value + insert.excluded.value})
+    return statement, rows
+
+
+async def apply_delta(session: AsyncSession, delta: StatDelta) -> None:
+    if upsert := _upsert(session.get_bind().dialect.name, delta):
+        await session.execute(*upsert)
+
+
+async def record_inserted(session: AsyncSession, model: type[Any], rows: Collection[Mapping[str, Any]]) -> None:
+    """Count rows written by a bulk ``INSERT``."""
+    if (source := get_stat_source(model)) is not None:
+        await apply_delta(session, _touch(source.tally(rows), {row["account_id"] for row in rows}))
+
+
+@asynccontextmanager
+async def tracking(session: AsyncSession, model: type[Any], *where: ColumnElement[bool], columns: Collection[str] | None = None) -> AsyncGenerator[None, None]:
+    """Apply the difference a bulk statement makes to the totals of the rows matching ``where``.
+
+    Pass the ``columns`` the statement writes to only look up the accounts, whose data generation still moves, when
+    none of them is counted.
+    """
+    source = get_stat_source(model)
+    if source is None:
+        yield
+        return
+    if columns is not None and source.keys.isdisjoint(columns):
+        accounts = await source.accounts(session, *where)
+        yield
+        await apply_delta(session, _touch(StatDelta(), accounts))
+        return
+    before = await source.snapshot(session, *where)
+    yield
+    delta = await source.snapshot(session, *where)
+    touched = _touched(before) | _touched(delta)
+    delta.subtract(before)
+    await apply_delta(session, _touch(delta, touched))
+
+
+def _attribute_values(obj: Any, keys: Iterable[str], *, previous: bool) -> dict[str, Any]:
+    """Column values of ``obj`` before or after the pending changes, without loading anything."""
+    state = inspect(obj)
+    values = {}
+    for key in keys:
+        history = state.attrs[key].history
+        changed = history.deleted if previous else history.added
+        values[key] = changed[0] if changed else history.unchanged[0] if history.unchanged else None
+    return values
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed(session: Session, _: UOWTransaction) -> None:
+    delta, touched = StatDelta(), set()
+    for objs, signs in ((session.new, (1,)), (session.dirty, (-1, 1)), (session.deleted, (-1,))):
+        for obj in objs:
+            if (source := get_stat_source(type(obj))) is None:
+                continue
+            for sign in signs:
+                values = _attribute_values(obj, source.keys, previous=sign < 0)
+                if values["deleted_at"] is None:
+                    touched.add(values["account_id"])
+                source.tally([values], sign, delta)
+    _touch(delta, touched)
+    if upsert := _upsert(session.get_bind().dialect.name, delta):
+        session.connection().execute(*upsert)
+
+
+async def data_generation(session: AsyncSession, account_id: UUID) -> int:
+    """How many times the live rows of an account have been written to, for versioning what is derived from them."""
+    s = m.AccountStat
+    statement = select(s.value).where(s.account_id == account_id, s.metric == DATA_GENERATION, s.bucket == "")
+    return await session.scalar(statement) or 0
+
+
+class AccountStatRepository(SQLAlchemyAsyncRepository[m.AccountStat]):
+    model_type = m.AccountStat
+
+
+class AccountStatService(SQLAlchemyAsyncRepositoryService[m.AccountStat]):
+    """Reads the dashboard from, and reconciles, the ``account_stat`` totals."""
+
+    repository_type = AccountStatRepository
+    ranked: tuple[tuple[str, int], ...] = (("contacts_by_country", 10), ("contacts_by_region", 10), (PER_ORGANIZATION, 5))
+    """Metrics shown as a top list, with the number of buckets shown."""
+
+    async def dashboard(self, account_id: UUID | ColumnElement[UUID], days: int = 30) -> schemas.DashboardStats:
+        """Totals, top lists and daily activity of an account, in a single statement.
+
+        Every branch of the statement reads a primary key range or the first rows of the ``(account_id, metric, value)``
+        index, so its cost depends on how many buckets are shown, not on how many rows were counted.
+        """
+        s = m.AccountStat
+        since = (datetime.now(UTC).date() - timedelta(days=days - 1)).isoformat()
+        columns = (s.metric, s.bucket, s.bucket.label("label"), s.value)
+        branches: list[Select[Any]] = [
+            select(*columns).where(s.account_id == account_id, s.metric.in_(("contacts", "organizations"))),
+            select(*columns).where(s.account_id == account_id, s.metric.in_(("contacts_created", "organizations_created")), s.bucket >= since),
+        ]
+        for metric, limit in self.ranked:
+            top = select(s).where(s.account_id == account_id, s.metric == metric, s.value > 0).order_by(s.value.desc()).limit(limit).subquery()
+            if metric == PER_ORGANIZATION:
+                label = m.Organization.name
+                branches.append(select(top.c.metric, top.c.bucket, label, top.c.value).join(m.Organization, m.Organization.id == top.c.organization_id))
+            else:
+                branches.append(select(top.c.metric, top.c.bucket, top.c.bucket.label("label"), top.c.value))
+        rows = (await self.repository.session.execute(union_all(*branches))).all()
+        return self._to_dashboard(rows, datetime.now(UTC).date(), days)
+
+    def _to_dashboard(self, rows: Iterable[Any], today: date, days: int) -> schemas.DashboardStats:
+        totals: dict[str, int] = {}
+        ranked: dict[str, list[schemas.StatBucket]] = {metric: [] for metric, _ in self.ranked}
+        activity = {(today - timedelta(days=offset)).isoformat(): schemas.DailyActivity(day=today - timedelta(days=offset)) for offset in range(days)}
+        for metric, bucket, label, value in rows:
+            if metric in ranked:
+                ranked[metric].append(schemas.StatBucket(key=bucket, name=label or None, count=value))
+            elif metric == "contacts_created" and bucket in activity:
+                activity[bucket].contacts = value
+            elif metric == "organizations_created" and bucket in activity:
+                activity[bucket].organizations = value
+            else:
+                totals[metric] = value
+        for buckets in ranked.values():
+            buckets.sort(key=attrgetter("count"), reverse=True)
+        contacts, organizations = totals.get("contacts", 0), totals.get("organizations", 0)
+        return schemas.DashboardStats(
+            contacts=contacts,
+            organizations=organizations,
+            contacts_per_organization=round(contacts / organizations, 1) if organizations else 0.0,
+            top_countries=ranked["contacts_by_country"],
+            top_regions=ranked["contacts_by_region"],
+            top_organizations=ranked[PER_ORGANIZATION],
+            activity=sorted(activity.values(), key=attrgetter("day")),
+        )
+
+    async def reconcile(self, account_id: UUID, batch_size: int = 1000) -> int:
+        """Recount the totals of an account from its rows, fix the stored ones and return how many were wrong."""
+        session = unscoped(self.repository.session)
+        expected = StatDelta()
+        for source in _sources.values():
+            statement = select(*source.columns).where(source.model.account_id == account_id, source.model.deleted_at.is_(None))
+            async for partition in (await session.stream(statement.execution_options(yield_per=batch_size))).mappings().partitions():
+                source.tally(partition, into=expected)
+        s = m.AccountStat
+        stored = await session.execute(select(s.metric, s.bucket, s.value).where(s.account_id == account_id, s.metric != DATA_GENERATION))
+        delta = StatDelta(expected)
+        delta.subtract({(account_id, metric, bucket): value for metric, bucket, value in stored})
+        corrected = sum(1 for value in delta.values() if value)
+        await apply_delta(session, _touch(delta, [account_id] if corrected else []))
+        await session.execute(delete(s).where(s.account_id == account_id, s.value == 0))
+        return corrected
+
+
+class StatsReconciler:
+    """Recounts every account's totals when the app starts and then every ``interval`` seconds, one account per transaction.
+
+    ``corrected`` counts the totals found wrong so far. An ``interval`` of 0 disables the job.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.corrected = 0
+
+    async def reconcile(self, account_ids: Iterable[UUID] | None = None) -> dict[UUID, int]:
+        """Reconcile ``account_ids``, or every account; return the number of totals corrected per account."""
+        from app import config
+
+        corrected: dict[UUID, int] = {}
+        async with AccountStatService.new(config=config.alchemy) as service:
+            session = service.repository.session
+            if account_ids is None:
+                account_ids = (await session.scalars(select(m.Account.id))).all()
+                await session.commit()
+            for account_id in account_ids:
+                corrected[account_id] = await service.reconcile(account_id)
+                await session.commit()
+        self.corrected += sum(corrected.values())
+        return corrected
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(SQLAlchemyError):
+                await self.reconcile()
+            await asyncio.sleep(self.interval)
+
+    @asynccontextmanager
+    async def lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        if self.interval <= 0:
+            yield
+            return
+        task = asyncio.create_task(self._run())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+stats_reconciler = StatsReconciler(interval=settings.app.STATS_RECONCILE_INTERVAL)
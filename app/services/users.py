@@ -1,14 +1,146 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple, cast
 
 from advanced_alchemy.repository import SQLAlchemyAsyncRepository
-from advanced_alchemy.service import ModelDictT, SQLAlchemyAsyncRepositoryService, is_dict_with_field
+from advanced_alchemy.service import ModelDictT, is_dict_with_field
 from litestar.exceptions import PermissionDeniedException
+from sqlalchemy import bindparam, event, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
-from config import crypt
+from app.lib.cache import TTLCache
+from app.lib.routing import reads_routed
+from app.services.base import CountCachingService
+from config import crypt, get_settings
 from database import models as m
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Sequence
+    from uuid import UUID
+
+    from litestar import Litestar
+    from sqlalchemy import Table
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from app import schemas
+
+settings = get_settings()
+
+
+class CachedUser(NamedTuple):
+    """A loaded user and its pre-serialized ``schemas.User`` representation."""
+
+    user: m.User
+    schema: schemas.User
+
+
+user_cache: TTLCache[str, CachedUser] = TTLCache(maxsize=settings.app.USER_CACHE_SIZE, ttl=settings.app.USER_CACHE_TTL, index=lambda cached: cached.user.id)
+"""Identity cache for authenticated users, keyed by the ``user_id`` stored in the session and indexed by user id."""
+
+
+PENDING_USERS_KEY = "_pending_cached_users"
+
+
+def invalidate_cached_user(user_id: UUID, session: Session | None = None) -> None:
+    """Drop any cached identity for the given user, now and again once ``session`` commits.
+
+    A request reading the user before the commit would otherwise cache the old row again.
+    """
+    user_cache.discard_indexed(user_id)
+    if session is not None:
+        session.info.setdefault(PENDING_USERS_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_committed_users(session: Session) -> None:
+    if user_ids := session.info.pop(PENDING_USERS_KEY, None):
+        for user_id in user_ids:
+            user_cache.discard_indexed(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop(PENDING_USERS_KEY, None)
+
+
+class PasswordRehashQueue:
+    """Persists password hashes upgraded during login in batches, outside of the request path.
+
+    ``UserService.authenticate`` hands over the new hash returned by ``verify_and_update``; the queue writes pending
+    hashes every ``interval`` seconds, or as soon as ``batch_size`` are waiting, in a single ``executemany``. Each row
+    is only updated while it still holds the hash that was verified, so a password changed in the meantime wins.
+    """
+
+    def __init__(self, batch_size: int, interval: float) -> None:
+        self.batch_size = batch_size
+        self.interval = interval
+        self.persisted = 0
+        self._engine: AsyncEngine | None = None
+        self._pending: dict[UUID, tuple[str, str]] = {}
+        self._wakeup: asyncio.Event | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, user_id: UUID, current_hash: str, new_hash: str) -> None:
+        self._pending[user_id] = (current_hash, new_hash)
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write all pending hashes and return how many rows were updated.
+
+        Hashes that could not be written stay pending.
+        """
+        if not self._pending or self._engine is None:
+            return 0
+        pending, self._pending = self._pending, {}
+        table = cast("Table", m.User.__table__)
+        statement = update(table).where(table.c.id == bindparam("b_id"), table.c.hashed_password == bindparam("b_current")).values(hashed_password=bindparam("b_new"))
+        rows = [{"b_id": user_id, "b_current": current, "b_new": new} for user_id, (current, new) in pending.items()]
+        try:
+            async with self._engine.begin() as conn:
+                result = await conn.execute(statement, rows)
+        except SQLAlchemyError:
+            # retried with the next flush, unless the user signed in again meanwhile and submitted a newer hash
+            self._pending = pending | self._pending
+            raise
+        for user_id in pending:
+            invalidate_cached_user(user_id)
+        self.persisted += result.rowcount
+        return result.rowcount
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), timeout=self.interval)
+            wakeup.clear()
+            with contextlib.suppress(SQLAlchemyError):
+                await self.flush()
+
+    @asynccontextmanager
+    async def lifespan(self, app: Litestar) -> AsyncGenerator[None, None]:
+        from app import config
+
+        self._engine = config.alchemy.get_engine()
+        self._wakeup = asyncio.Event()
+        task = asyncio.create_task(self._run(self._wakeup))
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            self._wakeup = None
+            await self.flush()
+
+
+rehash_queue = PasswordRehashQueue(batch_size=settings.app.PASSWORD_REHASH_BATCH_SIZE, interval=settings.app.PASSWORD_REHASH_INTERVAL)
+
 
 class UserRepository(SQLAlchemyAsyncRepository[m.User]):
     """User SQLAlchemy Repository."""
@@ -16,30 +148,57 @@ class UserRepository(SQLAlchemyAsyncRepository[m.User]):
     model_type = m.User
 
 
-class UserService(SQLAlchemyAsyncRepositoryService[m.User]):
+class UserService(CountCachingService[m.User]):
     """Handles database operations for users."""
 
     repository_type = UserRepository
+    sortable_fields: ClassVar[dict[str, tuple[str, ...]]] = {"email": ("email",), "created_at": ("created_at",), "updated_at": ("updated_at",)}
+    """``orderBy`` names accepted by list endpoints, mapped to the indexed columns they sort on."""
+    cache_tag = "users"
+
+    def cache_tags_for(self, db_obj: m.User) -> set[str]:
+        return {f"user:{db_obj.email}"}
+
+    @asynccontextmanager
+    async def _reads_before_hashing(self) -> AsyncGenerator[None, None]:
+        """Run the block's reads on a reader, then end the transaction before the caller awaits a password hash.
+
+        Hashing takes long enough that holding a connection through it, let alone the single SQLite writer every write
+        queues on, serializes concurrent logins. Loaded objects stay usable: sessions do not expire them on commit.
+        """
+        with reads_routed(self.session):
+            yield
+        await self.session.commit()
 
     async def authenticate(self, username: str, password: bytes | str) -> m.User:
         """Authenticate a user."""
-        db_obj = await self.get_one_or_none(email=username)
+        async with self._reads_before_hashing():
+            db_obj = await self.get_one_or_none(email=username)
         if db_obj is None:
             msg = "User not found or password invalid"
             raise PermissionDeniedException(detail=msg)
         if db_obj.hashed_password is None:
             msg = "User not found or password invalid."
             raise PermissionDeniedException(detail=msg)
-        if not await crypt.verify_password(password, db_obj.hashed_password):
+        valid, updated_hash = await crypt.verify_and_update_password(password, db_obj.hashed_password)
+        if not valid:
             msg = "User not found or password invalid"
             raise PermissionDeniedException(detail=msg)
         if not db_obj.is_active:
             msg = "User account is inactive"
             raise PermissionDeniedException(detail=msg)
+        if updated_hash is not None:
+            rehash_queue.submit(db_obj.id, db_obj.hashed_password, updated_hash)
         return db_obj
 
     async def update_password(self, data: dict[str, Any], db_obj: m.User) -> None:
-        """Update stored user password."""
+        """Update stored user password.
+
+        ``db_obj`` may be the cached identity shared by other requests, so the row is reloaded in this session rather
+        than changed in place.
+        """
+        async with self._reads_before_hashing():
+            db_obj = await self.repository.get(db_obj.id)
         if db_obj.hashed_password is None:
             msg = "User not found or password invalid."
             raise PermissionDeniedException(detail=msg)
@@ -51,6 +210,29 @@ class UserService(SQLAlchemyAsyncRepositoryService[m.User]):
             raise PermissionDeniedException(detail=msg)
         db_obj.hashed_password = await crypt.get_password_hash(data["new_password"])
         await self.repository.update(db_obj)
+        invalidate_cached_user(db_obj.id, session=self.session.sync_session)
+
+    async def update(self, data: ModelDictT[m.User], item_id: Any | None = None, **kwargs: Any) -> m.User:
+        db_obj = await super().update(data, item_id, **kwargs)
+        invalidate_cached_user(db_obj.id, session=self.session.sync_session)
+        return db_obj
+
+    async def delete(self, item_id: Any, **kwargs: Any) -> m.User:
+        db_obj = await super().delete(item_id, **kwargs)
+        invalidate_cached_user(db_obj.id, session=self.session.sync_session)
+        return db_obj
+
+    async def delete_many(self, item_ids: list[Any], **kwargs: Any) -> Sequence[m.User]:
+        db_objs = await super().delete_many(item_ids, **kwargs)
+        for db_obj in db_objs:
+            invalidate_cached_user(db_obj.id, session=self.session.sync_session)
+        return db_objs
+
+    async def delete_where(self, *args: Any, **kwargs: Any) -> Sequence[m.User]:
+        db_objs = await super().delete_where(*args, **kwargs)
+        for db_obj in db_objs:
+            invalidate_cached_user(db_obj.id, session=self.session.sync_session)
+        return db_objs
 
     @staticmethod
     def is_superuser(user: m.User) -> bool:
@@ -6,10 +6,10 @@ from functools import lru_cache
 from pathlib import Path
 
 from config import crypt
-from config._app import AppSettings, DatabaseSettings, ServerSettings, ViteSettings
+from config._app import AppSettings, DatabaseSettings, ServerSettings, SessionSettings, ViteSettings
 from config._base import get_config_val, get_env
 
-__all__ = ("AppSettings", "DatabaseSettings", "ServerSettings", "Settings", "ViteSettings", "crypt", "get_config_val", "get_env", "get_settings")
+__all__ = ("AppSettings", "DatabaseSettings", "ServerSettings", "SessionSettings", "Settings", "ViteSettings", "crypt", "get_config_val", "get_env", "get_settings")
 
 
 @dataclass
@@ -17,6 +17,7 @@ class Settings:
     app: AppSettings = field(default_factory=AppSettings)
     server: ServerSettings = field(default_factory=ServerSettings)
     db: DatabaseSettings = field(default_factory=DatabaseSettings)
+    session: SessionSettings = field(default_factory=SessionSettings)
     vite: ViteSettings = field(default_factory=ViteSettings)
 
     @classmethod
@@ -4,14 +4,18 @@ import binascii
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from litestar.serialization import decode_json, encode_json
-from sqlalchemy import event
+from litestar.stores.file import FileStore
+from sqlalchemy import event, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from config._base import BASE_DIR, get_env
 
+if TYPE_CHECKING:
+    from litestar.stores.base import Store
+
 
 @dataclass
 class AppSettings:
@@ -24,6 +28,57 @@ class AppSettings:
     CSRF_COOKIE_NAME: str = field(default_factory=get_env("CSRF_COOKIE_NAME", "XSRF-TOKEN"))
     CSRF_HEADER_NAME: str = field(default_factory=get_env("CSRF_HEADER_NAME", "X-XSRF-TOKEN"))
     CSRF_COOKIE_SECURE: bool = field(default_factory=get_env("CSRF_COOKIE_SECURE", False))
+    USER_CACHE_SIZE: int = field(default_factory=get_env("USER_CACHE_SIZE", 1024))
+    USER_CACHE_TTL: int = field(default_factory=get_env("USER_CACHE_TTL", 60))
+    RESPONSE_CACHE_MAX_BYTES: int = field(default_factory=get_env("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    """Memory budget of cached responses; least recently used ones are evicted beyond it."""
+    RESPONSE_CACHE_EXPIRATION: int = field(default_factory=get_env("RESPONSE_CACHE_EXPIRATION", 60))
+    COUNT_CACHE_SIZE: int = field(default_factory=get_env("COUNT_CACHE_SIZE", 1024))
+    COUNT_CACHE_TTL: int = field(default_factory=get_env("COUNT_CACHE_TTL", 300))
+    """Upper bound, in seconds, on serving a total that another worker process has since changed."""
+    COUNT_APPROXIMATE_THRESHOLD: int = field(default_factory=get_env("COUNT_APPROXIMATE_THRESHOLD", 1_000_000))
+    """Unfiltered lists of tables estimated above this many rows report the estimate. ``0`` always counts exactly."""
+    IMPORT_CHUNK_SIZE: int = field(default_factory=get_env("IMPORT_CHUNK_SIZE", 1000))
+    """Rows validated, inserted and committed together by bulk imports."""
+    IMPORT_MAX_ERRORS: int = field(default_factory=get_env("IMPORT_MAX_ERRORS", 100))
+    """Row errors reported in detail by an import; further failures are only counted."""
+    EXPORT_BATCH_SIZE: int = field(default_factory=get_env("EXPORT_BATCH_SIZE", 1000))
+    """Rows fetched from the server-side cursor and encoded per chunk of an export."""
+    BATCH_MAX_SIZE: int = field(default_factory=get_env("BATCH_MAX_SIZE", 1000))
+    """Most items accepted by one batch update or delete request."""
+    TRASH_RETENTION_DAYS: int = field(default_factory=get_env("TRASH_RETENTION_DAYS", 30))
+    """Days soft-deleted rows are kept before ``database purge-trash`` removes them."""
+    PURGE_BATCH_SIZE: int = field(default_factory=get_env("PURGE_BATCH_SIZE", 500))
+    """Tombstones hard-deleted and committed together by ``database purge-trash``, keeping each write lock short."""
+    STATS_RECONCILE_INTERVAL: int = field(default_factory=get_env("STATS_RECONCILE_INTERVAL", 3600))
+    """Seconds between recounts of the dashboard statistics, which repair drift; the first runs at startup. 0 disables it."""
+    JOB_WORKERS: int = field(default_factory=get_env("JOB_WORKERS", 2))
+    """Background jobs, such as reports, run at the same time in this process. 0 leaves jobs queued."""
+    JOB_STALE_AFTER: int = field(default_factory=get_env("JOB_STALE_AFTER", 600))
+    """Seconds after which a job still marked running is assumed lost with its process and queued again at startup."""
+    PASSWORD_HASH_TIME_COST: int = field(default_factory=get_env("PASSWORD_HASH_TIME_COST", 3))
+    PASSWORD_HASH_MEMORY_COST: int = field(default_factory=get_env("PASSWORD_HASH_MEMORY_COST", 65536))
+    """Argon2 memory cost in KiB."""
+    PASSWORD_HASH_PARALLELISM: int = field(default_factory=get_env("PASSWORD_HASH_PARALLELISM", 4))
+    PASSWORD_REHASH_BATCH_SIZE: int = field(default_factory=get_env("PASSWORD_REHASH_BATCH_SIZE", 100))
+    PASSWORD_REHASH_INTERVAL: int = field(default_factory=get_env("PASSWORD_REHASH_INTERVAL", 30))
+    """Seconds between flushes of password hashes upgraded during login."""
+    PASSWORD_HASH_EXECUTOR: str = field(default_factory=get_env("PASSWORD_HASH_EXECUTOR", "thread"))
+    """Executor used for password hashing, either ``thread`` or ``process``."""
+    PASSWORD_HASH_WORKERS: int = field(default_factory=get_env("PASSWORD_HASH_WORKERS", 0))
+    """Number of hashing workers. ``0`` picks ``min(4, cpu_count)``."""
+    PASSWORD_HASH_MAX_QUEUE: int = field(default_factory=get_env("PASSWORD_HASH_MAX_QUEUE", 64))
+    """Hashing jobs allowed to wait for a worker before new ones are rejected with a 503."""
+    HEALTH_PROBE_INTERVAL: int = field(default_factory=get_env("HEALTH_PROBE_INTERVAL", 5))
+    """Seconds ``/ready`` serves the last result of each probe before running it again."""
+    HEALTH_PROBE_TIMEOUT: int = field(default_factory=get_env("HEALTH_PROBE_TIMEOUT", 2))
+    """Seconds a probe may take before it is reported as failing."""
+    SQL_TIMING_SAMPLE_PERCENT: int = field(default_factory=get_env("SQL_TIMING_SAMPLE_PERCENT", 100))
+    """Percentage of requests whose SQL statements are timed and reported in a ``Server-Timing`` header."""
+    SLOW_QUERY_THRESHOLD_MS: int = field(default_factory=get_env("SLOW_QUERY_THRESHOLD_MS", 100))
+    """Milliseconds after which a statement is logged with its query plan as slow. ``0`` disables the slow-query log."""
+    SLOW_QUERY_LOG_SIZE: int = field(default_factory=get_env("SLOW_QUERY_LOG_SIZE", 100))
+    """Number of recent slow statements kept for ``/api/system/slow-queries``."""
 
 
 @dataclass
@@ -49,6 +104,37 @@ class ViteSettings:
     ASSET_URL: str = field(default_factory=get_env("ASSET_URL", "/static/"))
 
 
+@dataclass
+class SessionSettings:
+    BACKEND: str = field(default_factory=get_env("SESSION_BACKEND", "sqlite"))
+    """Session store backend, either ``sqlite`` or ``file``."""
+    MAX_AGE: int = field(default_factory=get_env("SESSION_MAX_AGE", 3600))
+    LAZY: bool = field(default_factory=get_env("SESSION_LAZY", True))
+    """Only read the store for requests carrying a session cookie and only write back modified sessions."""
+    FILE_PATH: Path = Path(f"{BASE_DIR}/.state/sessions")
+    SQLITE_PATH: str = field(default_factory=get_env("SESSION_SQLITE_PATH", f"{BASE_DIR}/.state/sessions.sqlite3"))
+    SQLITE_READERS: int = field(default_factory=get_env("SESSION_SQLITE_READERS", 4))
+    SQLITE_BATCH_SIZE: int = field(default_factory=get_env("SESSION_SQLITE_BATCH_SIZE", 256))
+    SWEEP_INTERVAL: int = field(default_factory=get_env("SESSION_SWEEP_INTERVAL", 60))
+    SWEEP_CHUNK_SIZE: int = field(default_factory=get_env("SESSION_SWEEP_CHUNK_SIZE", 1000))
+
+    def get_store(self) -> Store:
+        if self.BACKEND == "file":
+            return FileStore(self.FILE_PATH, create_directories=True)
+        if self.BACKEND == "sqlite":
+            from app.lib.stores import SQLiteStore
+
+            return SQLiteStore(
+                self.SQLITE_PATH,
+                readers=self.SQLITE_READERS,
+                batch_size=self.SQLITE_BATCH_SIZE,
+                sweep_interval=self.SWEEP_INTERVAL,
+                sweep_chunk_size=self.SWEEP_CHUNK_SIZE,
+            )
+        msg = f"Unsupported session backend: {self.BACKEND}"
+        raise ValueError(msg)
+
+
 @dataclass
 class DatabaseSettings:
     URL: str = field(default_factory=get_env("DATABASE_URL", "sqlite+aiosqlite:///database/pingcrm.sqlite3"))
@@ -56,22 +142,79 @@ class DatabaseSettings:
     ECHO_POOL: bool = field(default_factory=get_env("DATABASE_ECHO_POOL", False))
     POOL_RECYCLE: int = field(default_factory=get_env("DATABASE_POOL_RECYCLE", 300))
     POOL_PRE_PING: bool = field(default_factory=get_env("DATABASE_PRE_POOL_PING", False))
+    POOL_SIZE: int = field(default_factory=get_env("DATABASE_POOL_SIZE", 5))
+    """Connections kept open per engine. SQLite files have a single writer and ``READ_POOL_SIZE`` readers instead."""
+    MAX_OVERFLOW: int = field(default_factory=get_env("DATABASE_MAX_OVERFLOW", 10))
+    """Connections opened beyond ``POOL_SIZE`` under load, and closed when returned."""
+    POOL_TIMEOUT: int = field(default_factory=get_env("DATABASE_POOL_TIMEOUT", 30))
+    """Seconds a checkout waits for a connection before failing."""
+    POOL_USE_LIFO: bool = field(default_factory=get_env("DATABASE_POOL_USE_LIFO", False))
+    """Reuse the most recently returned connection, which lets idle ones time out server side."""
+    READ_POOL_SIZE: int = field(default_factory=get_env("DATABASE_READ_POOL_SIZE", 4))
+    """Connections of each SQLite reader pool serving routed reads. ``0`` serves them from the writer."""
+    REPLICA_URLS: list[str] = field(default_factory=get_env("DATABASE_REPLICA_URLS", []))
+    """Read replicas of the primary at ``URL``, taking routed reads in turn instead of a reader pool of the primary."""
+    SQLITE_JOURNAL_MODE: str = field(default_factory=get_env("DATABASE_SQLITE_JOURNAL_MODE", "WAL"))
+    """With ``WAL``, readers and the writer no longer block each other."""
+    SQLITE_SYNCHRONOUS: str = field(default_factory=get_env("DATABASE_SQLITE_SYNCHRONOUS", "NORMAL"))
+    """``NORMAL`` is durable against crashes of the application in WAL mode, only a power loss can undo the last commits."""
+    SQLITE_MMAP_SIZE: int = field(default_factory=get_env("DATABASE_SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE: int = field(default_factory=get_env("DATABASE_SQLITE_CACHE_SIZE", -64_000))
+    """Page cache per connection: pages when positive, KiB when negative."""
+    SQLITE_TEMP_STORE: str = field(default_factory=get_env("DATABASE_SQLITE_TEMP_STORE", "MEMORY"))
+    SQLITE_BUSY_TIMEOUT: int = field(default_factory=get_env("DATABASE_SQLITE_BUSY_TIMEOUT", 5000))
+    """Milliseconds a connection waits for a lock before failing with ``database is locked``."""
     MIGRATION_CONFIG: str = f"{BASE_DIR}/database/migrations/alembic.ini"
     MIGRATION_PATH: str = f"{BASE_DIR}/database/migrations"
     MIGRATION_DDL_VERSION_TABLE: str = "ddl_version"
     FIXTURE_PATH: str = f"{BASE_DIR}/database/fixtures"
     _engine_instance: AsyncEngine | None = None
+    _read_engine_instances: list[AsyncEngine] | None = None
+    _read_engine_turn: int = 0
 
     @property
     def engine(self) -> AsyncEngine:
         return self.get_engine()
 
-    def get_engine(self) -> AsyncEngine:  # pragma: no cover
-        if self._engine_instance is not None:
-            return self._engine_instance
+    @property
+    def is_sqlite_file(self) -> bool:
+        """Whether the database is an SQLite file, which gets the performance profile and a pool of readers."""
+        return self._is_sqlite_file(self.URL)
+
+    @staticmethod
+    def _is_sqlite_file(url: str) -> bool:
+        parsed = make_url(url)
+        return parsed.get_backend_name() == "sqlite" and parsed.database not in {None, "", ":memory:"} and parsed.query.get("mode") != "memory"
+
+    def _sqlite_pragmas(self) -> list[str]:
+        return [
+            f"PRAGMA journal_mode={self.SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous={self.SQLITE_SYNCHRONOUS}",
+            f"PRAGMA mmap_size={self.SQLITE_MMAP_SIZE:d}",
+            f"PRAGMA cache_size={self.SQLITE_CACHE_SIZE:d}",
+            f"PRAGMA temp_store={self.SQLITE_TEMP_STORE}",
+            f"PRAGMA busy_timeout={self.SQLITE_BUSY_TIMEOUT:d}",
+        ]
+
+    def _create_engine(self, url: str, pragmas: list[str], begin: str, **options: Any) -> AsyncEngine:
+        """An engine whose connections run ``pragmas`` on connect, and whose transactions SQLAlchemy begins with ``begin``.
+
+        Unless the database is in memory, its pool is sized by the ``POOL_*`` settings, which ``options`` override, and
+        instrumented.
+        """
+        if make_url(url).get_backend_name() != "sqlite" or self._is_sqlite_file(url):
+            from app.lib.pools import InstrumentedQueuePool
 
-        self._engine_instance = create_async_engine(
-            url=self.URL,
+            options = {
+                "poolclass": InstrumentedQueuePool,
+                "pool_size": self.POOL_SIZE,
+                "max_overflow": self.MAX_OVERFLOW,
+                "pool_timeout": self.POOL_TIMEOUT,
+                "pool_use_lifo": self.POOL_USE_LIFO,
+                **options,
+            }
+        engine = create_async_engine(
+            url=url,
             future=True,
             json_serializer=encode_json,
             json_deserializer=decode_json,
@@ -79,14 +222,80 @@ class DatabaseSettings:
             echo_pool=self.ECHO_POOL,
             pool_recycle=self.POOL_RECYCLE,
             pool_pre_ping=self.POOL_PRE_PING,
+            **options,
         )
 
-        @event.listens_for(self._engine_instance.sync_engine, "connect")
+        @event.listens_for(engine.sync_engine, "connect")
         def _sqla_on_connect(dbapi_connection: Any, _: Any) -> Any:
             dbapi_connection.isolation_level = None
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
 
-        @event.listens_for(self._engine_instance.sync_engine, "begin")
+        @event.listens_for(engine.sync_engine, "begin")
         def _sqla_on_begin(dbapi_connection: Any) -> Any:
-            dbapi_connection.exec_driver_sql("BEGIN")
+            dbapi_connection.exec_driver_sql(begin)
 
+        return engine
+
+    def get_engine(self) -> AsyncEngine:  # pragma: no cover
+        """The engine of the database, and for an SQLite file its single writer.
+
+        A single connection that begins with ``BEGIN IMMEDIATE`` takes the write lock up front: writers queue in the
+        pool instead of failing with ``database is locked`` when a deferred transaction tries to upgrade its lock.
+        """
+        if self._engine_instance is not None:
+            return self._engine_instance
+
+        if self.is_sqlite_file:
+            self._engine_instance = self._create_engine(self.URL, self._sqlite_pragmas(), "BEGIN IMMEDIATE", pool_size=1, max_overflow=0)
+        else:
+            self._engine_instance = self._create_engine(self.URL, [], "BEGIN")
         return self._engine_instance
+
+    def _create_read_engine(self, url: str) -> AsyncEngine:
+        if self._is_sqlite_file(url):
+            return self._create_engine(url, [*self._sqlite_pragmas(), "PRAGMA query_only=ON"], "BEGIN", pool_size=self.READ_POOL_SIZE, max_overflow=0)
+        return self._create_engine(url, [], "BEGIN")
+
+    def get_read_engines(self) -> list[AsyncEngine]:  # pragma: no cover
+        """The engines read-only work is routed to.
+
+        These are the replicas when there are any, else a pool of ``query_only`` readers for an SQLite file, else the
+        writer.
+        """
+        if self._read_engine_instances is not None:
+            return self._read_engine_instances
+
+        if self.REPLICA_URLS:
+            self._read_engine_instances = [self._create_read_engine(url) for url in self.REPLICA_URLS]
+        elif self.is_sqlite_file and self.READ_POOL_SIZE > 0:
+            self._read_engine_instances = [self._create_read_engine(self.URL)]
+        else:
+            self._read_engine_instances = [self.get_engine()]
+        return self._read_engine_instances
+
+    def get_read_engine(self) -> AsyncEngine:  # pragma: no cover
+        """The next of :meth:`get_read_engines`, in turn."""
+        engines = self.get_read_engines()
+        self._read_engine_turn = (self._read_engine_turn + 1) % len(engines)
+        return engines[self._read_engine_turn]
+
+    def get_engines(self) -> dict[str, AsyncEngine]:
+        """Every engine by name: the ``primary``, and its ``reader`` pool or each ``replica-N``."""
+        engines = {"primary": self.get_engine()}
+        read_engines = self.get_read_engines()
+        if self.REPLICA_URLS:
+            engines |= {f"replica-{index}": engine for index, engine in enumerate(read_engines, 1)}
+        else:
+            engines["reader"] = read_engines[0]
+        return engines
+
+    async def dispose_engines(self) -> None:
+        """Close the pooled connections of every engine.
+
+        Each aiosqlite connection runs on a thread of its own, which keeps the process from exiting until it is closed.
+        """
+        for engine in self.get_engines().values():
+            await engine.dispose()
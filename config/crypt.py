@@ -2,11 +2,36 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Literal
 
+from litestar.exceptions import ServiceUnavailableException
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
 
-hasher = PasswordHash((Argon2Hasher(),))
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@lru_cache(maxsize=1)
+def get_hasher() -> PasswordHash:
+    """Password hasher configured with the Argon2 costs from settings."""
+    from config import get_settings
+
+    settings = get_settings()
+    return PasswordHash(
+        (
+            Argon2Hasher(
+                time_cost=settings.app.PASSWORD_HASH_TIME_COST,
+                memory_cost=settings.app.PASSWORD_HASH_MEMORY_COST,
+                parallelism=settings.app.PASSWORD_HASH_PARALLELISM,
+            ),
+        ),
+    )
 
 
 def get_encryption_key(secret: str) -> bytes:
@@ -16,17 +41,171 @@ def get_encryption_key(secret: str) -> bytes:
     return base64.urlsafe_b64encode(secret.encode())
 
 
+def _timed(fn: Callable[..., Any], *args: Any) -> tuple[Any, float, float]:
+    """Run ``fn`` in the worker and report when it started and finished."""
+    started = time.monotonic()
+    result = fn(*args)
+    return result, started, time.monotonic()
+
+
+def _hash(password: str | bytes) -> str:
+    return get_hasher().hash(password)
+
+
+def _verify_and_update(password: str | bytes, hashed_password: str) -> tuple[bool, str | None]:
+    return get_hasher().verify_and_update(password, hashed_password)
+
+
+@dataclass
+class HashingStats:
+    in_flight: int = 0
+    completed: int = 0
+    rejected: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    hash_time_total: float = 0.0
+    hash_time_max: float = 0.0
+
+    def to_dict(self) -> dict[str, int | float]:
+        completed = self.completed or 1
+        return {
+            "inFlight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queueWaitAvgMs": round(self.queue_wait_total / completed * 1000, 3),
+            "queueWaitMaxMs": round(self.queue_wait_max * 1000, 3),
+            "hashTimeAvgMs": round(self.hash_time_total / completed * 1000, 3),
+            "hashTimeMaxMs": round(self.hash_time_max * 1000, 3),
+        }
+
+
+class HashingPool:
+    """Dedicated executor for password hashing.
+
+    Keeps Argon2 work off the loop's default executor, so a login storm cannot starve other ``run_in_executor`` or
+    ``sync_to_thread`` calls. At most ``workers + max_queue`` jobs are accepted at once; anything beyond that is rejected
+    straight away with a ``503`` instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int, kind: Literal["thread", "process"] = "thread") -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self.stats = HashingStats()
+        self._executor: Executor | None = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def saturation(self) -> float:
+        return self.stats.in_flight / self.capacity if self.capacity else 1.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.stats.in_flight >= self.capacity:
+            self.stats.rejected += 1
+            msg = "The server is busy processing other sign-ins. Please try again shortly."
+            raise ServiceUnavailableException(detail=msg, headers={"Retry-After": "1"})
+        self.stats.in_flight += 1
+        submitted = time.monotonic()
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(self._get_executor(), _timed, fn, *args)
+        finally:
+            self.stats.in_flight -= 1
+        wait, elapsed = started - submitted, finished - started
+        self.stats.completed += 1
+        self.stats.queue_wait_total += wait
+        self.stats.queue_wait_max = max(self.stats.queue_wait_max, wait)
+        self.stats.hash_time_total += elapsed
+        self.stats.hash_time_max = max(self.stats.hash_time_max, elapsed)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool: HashingPool | None = None
+
+
+def get_hashing_pool() -> HashingPool:
+    global _pool  # noqa: PLW0603
+    if _pool is None:
+        from config import get_settings
+
+        settings = get_settings()
+        _pool = HashingPool(
+            workers=settings.app.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1),
+            max_queue=settings.app.PASSWORD_HASH_MAX_QUEUE,
+            kind="process" if settings.app.PASSWORD_HASH_EXECUTOR == "process" else "thread",  # noqa: S105 - an executor kind, not a password
+        )
+    return _pool
+
+
+def shutdown_hashing_pool() -> None:
+    """Release the hashing workers."""
+    global _pool  # noqa: PLW0603
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
 async def get_password_hash(password: str | bytes) -> str:
     """Get password hash."""
-    return await asyncio.get_running_loop().run_in_executor(None, hasher.hash, password)
+    return await get_hashing_pool().run(_hash, password)  # type: ignore[no-any-return]
 
 
 async def verify_password(plain_password: str | bytes, hashed_password: str) -> bool:
     """Verify Password."""
-    valid, _ = await asyncio.get_running_loop().run_in_executor(
-        None,
-        hasher.verify_and_update,
-        plain_password,
-        hashed_password,
-    )
-    return bool(valid)
+    valid, _ = await verify_and_update_password(plain_password, hashed_password)
+    return valid
+
+
+async def verify_and_update_password(plain_password: str | bytes, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password, also returning a new hash when the stored one uses outdated Argon2 costs."""
+    valid, updated_hash = await get_hashing_pool().run(_verify_and_update, plain_password, hashed_password)
+    return bool(valid), updated_hash
+
+
+def measure_hash_time(time_cost: int, memory_cost: int, parallelism: int, rounds: int = 3) -> float:
+    """Return the median wall time, in seconds, of hashing a password with the given Argon2 costs."""
+    candidate = Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        candidate.hash("calibration-password")
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate_argon2(target: float, max_memory_cost: int, parallelism: int, min_memory_cost: int = 19 * 1024) -> tuple[int, int, float]:
+    """Find Argon2 costs that take about ``target`` seconds per hash.
+
+    Memory is the stronger defence against GPU attacks, so the largest memory cost within ``max_memory_cost`` that
+    fits the target at a single pass is chosen first. Passes are then added while the hash stays within the target.
+
+    Returns:
+        ``(time_cost, memory_cost, seconds)`` of the chosen parameters.
+    """
+    memory_cost = max_memory_cost
+    elapsed = measure_hash_time(1, memory_cost, parallelism)
+    while elapsed > target and memory_cost // 2 >= min_memory_cost:
+        memory_cost //= 2
+        elapsed = measure_hash_time(1, memory_cost, parallelism)
+    time_cost = 1
+    while True:
+        candidate = measure_hash_time(time_cost + 1, memory_cost, parallelism)
+        if candidate > target:
+            break
+        time_cost, elapsed = time_cost + 1, candidate
+    return time_cost, memory_cost, elapsed
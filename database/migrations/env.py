@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine, async_engine_from_config
 
 if TYPE_CHECKING:
     from advanced_alchemy.alembic.commands import AlembicCommandConfig
-    from alembic.runtime.environment import EnvironmentContext
+    from alembic.runtime.environment import EnvironmentContext, NameFilterParentNames, NameFilterType
     from sqlalchemy.engine import Connection
 
 __all__ = ("do_run_migrations", "run_migrations_offline", "run_migrations_online")
@@ -61,6 +61,11 @@ def order_columns(
     )
 
 
+def include_name(name: str | None, type_: NameFilterType, parent_names: NameFilterParentNames) -> bool:
+    """Leave the FTS5 search indexes and their shadow tables out of autogenerate; migrations manage them by hand."""
+    return not (type_ == "table" and name is not None and "_fts" in name)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -82,7 +87,8 @@ def run_migrations_offline() -> None:
         version_table_pk=config.version_table_pk,
         user_module_prefix=config.user_module_prefix,
         render_as_batch=config.render_as_batch,
-        process_revision_directives=writer,  # type: ignore[arg-type]
+        process_revision_directives=writer,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -99,7 +105,8 @@ def do_run_migrations(connection: Connection) -> None:
         version_table_pk=config.version_table_pk,
         user_module_prefix=config.user_module_prefix,
         render_as_batch=config.render_as_batch,
-        process_revision_directives=writer,  # type: ignore[arg-type]
+        process_revision_directives=writer,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,76 @@
+# type: ignore
+"""Per-account statistics maintained on write
+
+Revision ID: 6d2f8b4e1c57
+Revises: 9e4b2c7a1d06
+Create Date: 2026-10-18 16:45:00.000000+00:00
+
+"""
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+from advanced_alchemy.types import EncryptedString, EncryptedText, GUID, ORA_JSONB, DateTimeUTC
+from sqlalchemy import Text  # noqa: F401
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ("downgrade", "upgrade", "schema_upgrades", "schema_downgrades", "data_upgrades", "data_downgrades")
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+
+# revision identifiers, used by Alembic.
+revision = '6d2f8b4e1c57'
+down_revision = '9e4b2c7a1d06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    op.create_table('account_stat',
+    sa.Column('account_id', sa.GUID(length=16), nullable=False),
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('bucket', sa.String(length=255), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.GUID(length=16), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], name=op.f('fk_account_stat_account_id_account'), ondelete='cascade'),
+    sa.PrimaryKeyConstraint('account_id', 'metric', 'bucket', name=op.f('pk_account_stat'))
+    )
+    with op.batch_alter_table('account_stat', schema=None) as batch_op:
+        batch_op.create_index('ix_account_stat_account_id_metric_value', ['account_id', 'metric', 'value'], unique=False)
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    with op.batch_alter_table('account_stat', schema=None) as batch_op:
+        batch_op.drop_index('ix_account_stat_account_id_metric_value')
+
+    op.drop_table('account_stat')
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
@@ -0,0 +1,112 @@
+# type: ignore
+"""Full-text search indexes for contacts and organizations
+
+Revision ID: 5f1c2a9e7b30
+Revises: d49c7401666c
+Create Date: 2026-10-18 12:30:00.000000+00:00
+
+"""
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+from advanced_alchemy.types import EncryptedString, EncryptedText, GUID, ORA_JSONB, DateTimeUTC
+from sqlalchemy import Text  # noqa: F401
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ("downgrade", "upgrade", "schema_upgrades", "schema_downgrades", "data_upgrades", "data_downgrades")
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+
+# revision identifiers, used by Alembic.
+revision = '5f1c2a9e7b30'
+down_revision = 'd49c7401666c'
+branch_labels = None
+depends_on = None
+
+# searchable columns per table, in FTS5 column order (see ``app.services.contacts`` / ``app.services.organizations``)
+FTS_COLUMNS = {
+    "contact": ("first_name", "last_name", "email", "phone", "city", "region", "country", "postal_code", "address"),
+    "organization": ("name", "email", "phone", "city", "region", "country", "postal_code", "address"),
+}
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+# the statements below are formatted with the table and column names above only
+_DROP = ("DROP TRIGGER IF EXISTS {fts}_ai", "DROP TRIGGER IF EXISTS {fts}_ad", "DROP TRIGGER IF EXISTS {fts}_au", "DROP TABLE IF EXISTS {fts}", "DROP TABLE IF EXISTS {key}")
+_KEYED = (
+    "CREATE TABLE IF NOT EXISTS {key} (fts_rowid INTEGER PRIMARY KEY, id NOT NULL UNIQUE)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    (
+        "CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        "INSERT INTO {key} (id) VALUES (new.id); "
+        "INSERT INTO {fts} (rowid, {columns}) VALUES ((SELECT fts_rowid FROM {key} WHERE id = new.id), {new}); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        "DELETE FROM {fts} WHERE rowid = (SELECT fts_rowid FROM {key} WHERE id = old.id); DELETE FROM {key} WHERE id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+        "UPDATE {fts} SET {assignments} WHERE rowid = (SELECT fts_rowid FROM {key} WHERE id = new.id); END"
+    ),
+)
+_KEYED_FILL = (
+    "INSERT INTO {key} (id) SELECT id FROM {table}",
+    "INSERT INTO {fts} (rowid, {columns}) SELECT k.fts_rowid, {selected} FROM {table} AS t JOIN {key} AS k ON k.id = t.id",
+)
+
+
+def _execute(statements: tuple[str, ...]) -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table, columns in FTS_COLUMNS.items():
+        names = {
+            "table": table,
+            "fts": f"{table}_fts",
+            "key": f"{table}_fts_key",
+            "columns": ", ".join(columns),
+            "new": ", ".join(f"new.{column}" for column in columns),
+            "selected": ", ".join(f"t.{column}" for column in columns),
+            "assignments": ", ".join(f"{column} = new.{column}" for column in columns),
+        }
+        for statement in statements:
+            op.execute(statement.format(**names))
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    # each index keeps its own copy of the text, keyed through {table}_fts_key as implicit rowids may change on VACUUM
+    _execute(_KEYED)
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    _execute(_DROP)
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+    _execute(_KEYED_FILL)
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
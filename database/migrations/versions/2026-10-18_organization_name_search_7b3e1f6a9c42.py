@@ -0,0 +1,76 @@
+# type: ignore
+"""Fold organization names into an indexed search key
+
+Revision ID: 7b3e1f6a9c42
+Revises: 2a7c5e9b3f14
+Create Date: 2026-10-18 19:30:00.000000+00:00
+
+"""
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+from advanced_alchemy.types import EncryptedString, EncryptedText, GUID, ORA_JSONB, DateTimeUTC
+from sqlalchemy import Text  # noqa: F401
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ("downgrade", "upgrade", "schema_upgrades", "schema_downgrades", "data_upgrades", "data_downgrades")
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+
+# revision identifiers, used by Alembic.
+revision = '7b3e1f6a9c42'
+down_revision = '2a7c5e9b3f14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+organization = sa.table('organization', sa.column('id'), sa.column('name', sa.String()), sa.column('name_search', sa.String()))
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    # not a batch operation: rebuilding the table on SQLite would drop its full-text search triggers
+    op.add_column('organization', sa.Column('name_search', sa.String().with_variant(sa.String(collation='C'), 'postgresql'), nullable=False, server_default=''))
+    if op.get_bind().dialect.name == 'postgresql':
+        op.alter_column('organization', 'name_search', server_default=None)
+    op.create_index('ix_organization_account_id_name_search', 'organization', ['account_id', 'name_search'], unique=False, sqlite_where=sa.text('deleted_at IS NULL'), postgresql_where=sa.text('deleted_at IS NULL'))
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    op.drop_index('ix_organization_account_id_name_search', table_name='organization')
+    op.drop_column('organization', 'name_search')
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+    from database.models import search_key
+
+    bind = op.get_bind()
+    rows = [{'_id': id_, '_name_search': search_key(name)} for id_, name in bind.execute(sa.select(organization.c.id, organization.c.name))]
+    if rows:
+        bind.execute(organization.update().where(organization.c.id == sa.bindparam('_id')).values(name_search=sa.bindparam('_name_search')), rows)
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
@@ -0,0 +1,90 @@
+# type: ignore
+"""Soft delete for organizations and contacts, with partial listing indexes
+
+Revision ID: 9e4b2c7a1d06
+Revises: 3c7e9a1d5f28
+Create Date: 2026-10-18 15:30:00.000000+00:00
+
+"""
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+from advanced_alchemy.types import EncryptedString, EncryptedText, GUID, ORA_JSONB, DateTimeUTC
+from sqlalchemy import Text  # noqa: F401
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ("downgrade", "upgrade", "schema_upgrades", "schema_downgrades", "data_upgrades", "data_downgrades")
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+
+NOT_TRASHED = sa.text('deleted_at IS NULL')
+TRASHED = sa.text('deleted_at IS NOT NULL')
+LIVE_INDEXES = {
+    'organization': {
+        'ix_organization_account_id_created_at': ['account_id', 'created_at'],
+        'ix_organization_account_id_updated_at': ['account_id', 'updated_at'],
+        'ix_organization_account_id_name': ['account_id', 'name'],
+    },
+    'contact': {
+        'ix_contact_account_id_created_at': ['account_id', 'created_at'],
+        'ix_contact_account_id_updated_at': ['account_id', 'updated_at'],
+        'ix_contact_account_id_last_name_first_name': ['account_id', 'last_name', 'first_name'],
+    },
+}
+
+# revision identifiers, used by Alembic.
+revision = '9e4b2c7a1d06'
+down_revision = '3c7e9a1d5f28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    for table, indexes in LIVE_INDEXES.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('deleted_at', sa.DateTimeUTC(timezone=True), nullable=True))
+        for name, columns in indexes.items():
+            op.drop_index(name, table_name=table)
+            op.create_index(name, table, columns, unique=False, sqlite_where=NOT_TRASHED, postgresql_where=NOT_TRASHED)
+        op.create_index(f'ix_{table}_deleted_at', table, ['deleted_at'], unique=False, sqlite_where=TRASHED, postgresql_where=TRASHED)
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    for table, indexes in LIVE_INDEXES.items():
+        op.drop_index(f'ix_{table}_deleted_at', table_name=table)
+        for name, columns in indexes.items():
+            op.drop_index(name, table_name=table)
+            op.create_index(name, table, columns, unique=False)
+        # a plain ALTER TABLE, as a batch table rebuild would drop the full-text triggers and renumber rowids
+        op.drop_column(table, 'deleted_at')
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
@@ -0,0 +1,87 @@
+# type: ignore
+"""Composite tenant/sort indexes for list ordering
+
+Revision ID: 8b2d4e6f1a93
+Revises: 5f1c2a9e7b30
+Create Date: 2026-10-18 13:10:00.000000+00:00
+
+"""
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from alembic import op
+from advanced_alchemy.types import EncryptedString, EncryptedText, GUID, ORA_JSONB, DateTimeUTC
+from sqlalchemy import Text  # noqa: F401
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = ("downgrade", "upgrade", "schema_upgrades", "schema_downgrades", "data_upgrades", "data_downgrades")
+
+sa.GUID = GUID
+sa.DateTimeUTC = DateTimeUTC
+sa.ORA_JSONB = ORA_JSONB
+sa.EncryptedString = EncryptedString
+sa.EncryptedText = EncryptedText
+
+# revision identifiers, used by Alembic.
+revision = '8b2d4e6f1a93'
+down_revision = '5f1c2a9e7b30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            schema_upgrades()
+            data_upgrades()
+
+def downgrade() -> None:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning)
+        with op.get_context().autocommit_block():
+            data_downgrades()
+            schema_downgrades()
+
+def schema_upgrades() -> None:
+    """schema upgrade migrations go here."""
+    with op.batch_alter_table('user_account', schema=None) as batch_op:
+        batch_op.create_index('ix_user_account_created_at', ['created_at'], unique=False)
+        batch_op.create_index('ix_user_account_updated_at', ['updated_at'], unique=False)
+
+    with op.batch_alter_table('organization', schema=None) as batch_op:
+        batch_op.create_index('ix_organization_account_id_created_at', ['account_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_organization_account_id_updated_at', ['account_id', 'updated_at'], unique=False)
+        batch_op.create_index('ix_organization_account_id_name', ['account_id', 'name'], unique=False)
+
+    with op.batch_alter_table('contact', schema=None) as batch_op:
+        batch_op.create_index('ix_contact_account_id_created_at', ['account_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_contact_account_id_updated_at', ['account_id', 'updated_at'], unique=False)
+        batch_op.create_index('ix_contact_account_id_last_name_first_name', ['account_id', 'last_name', 'first_name'], unique=False)
+
+def schema_downgrades() -> None:
+    """schema downgrade migrations go here."""
+    with op.batch_alter_table('contact', schema=None) as batch_op:
+        batch_op.drop_index('ix_contact_account_id_last_name_first_name')
+        batch_op.drop_index('ix_contact_account_id_updated_at')
+        batch_op.drop_index('ix_contact_account_id_created_at')
+
+    with op.batch_alter_table('organization', schema=None) as batch_op:
+        batch_op.drop_index('ix_organization_account_id_name')
+        batch_op.drop_index('ix_organization_account_id_updated_at')
+        batch_op.drop_index('ix_organization_account_id_created_at')
+
+    with op.batch_alter_table('user_account', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_account_updated_at')
+        batch_op.drop_index('ix_user_account_created_at')
+
+def data_upgrades() -> None:
+    """Add any optional data upgrade migrations here!"""
+
+def data_downgrades() -> None:
+    """Add any optional data downgrade migrations here!"""
@@ -1,18 +1,52 @@
 from __future__ import annotations
 
+import unicodedata
 from datetime import date, datetime
 from enum import Enum
+from typing import Any
 from uuid import UUID  # noqa: TC003
 
-from advanced_alchemy.base import UUIDv7AuditBase
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from advanced_alchemy.base import DefaultBase, UUIDv7AuditBase
+from advanced_alchemy.types import DateTimeUTC, JsonB
+from sqlalchemy import ForeignKey, Index, String, TextClause, UniqueConstraint, text
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship, validates
+
+NOT_TRASHED = text("deleted_at IS NULL")
+TRASHED = text("deleted_at IS NOT NULL")
+
+
+def search_key(value: str) -> str:
+    """Fold ``value`` for case-insensitive prefix matching in any script, the same way on every database."""
+    return unicodedata.normalize("NFKC", value).casefold()
+
+
+SEARCH_KEY_TYPE = String().with_variant(String(collation="C"), "postgresql")
+"""Search keys compare code point by code point, so a prefix is a contiguous range of them, on PostgreSQL too."""
+
+
+def live_index(name: str, *columns: str | TextClause) -> Index:
+    """A partial index over rows that are not in the trash, used by listings filtering on ``deleted_at IS NULL``."""
+    return Index(name, *columns, sqlite_where=NOT_TRASHED, postgresql_where=NOT_TRASHED)
+
+
+def trash_index(name: str) -> Index:
+    """A partial index over the trash only, for finding tombstones to purge."""
+    return Index(name, "deleted_at", sqlite_where=TRASHED, postgresql_where=TRASHED)
+
+
+class SoftDeleteMixin:
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTimeUTC(timezone=True), nullable=True, default=None)
+    """When the row was moved to the trash; ``None`` while it is live."""
 
 
 class User(UUIDv7AuditBase):
     __tablename__ = "user_account"
+    __table_args__ = (
+        Index("ix_user_account_created_at", "created_at"),
+        Index("ix_user_account_updated_at", "updated_at"),
+    )
 
     email: Mapped[str] = mapped_column(unique=True, index=True, nullable=False)
     name: Mapped[str | None] = mapped_column(nullable=True, default=None)
@@ -60,10 +94,19 @@ class Account(UUIDv7AuditBase):
     contacts: Mapped[list[Contact]] = relationship(back_populates="account", cascade="all, delete")
 
 
-class Organization(UUIDv7AuditBase):
+class Organization(SoftDeleteMixin, UUIDv7AuditBase):
     __tablename__ = "organization"
+    __table_args__ = (
+        live_index("ix_organization_account_id_created_at", "account_id", "created_at"),
+        live_index("ix_organization_account_id_updated_at", "account_id", "updated_at"),
+        live_index("ix_organization_account_id_name", "account_id", "name"),
+        live_index("ix_organization_account_id_name_search", "account_id", "name_search"),
+        trash_index("ix_organization_deleted_at"),
+    )
 
     name: Mapped[str]
+    name_search: Mapped[str] = mapped_column(SEARCH_KEY_TYPE, nullable=False)
+    """``name`` folded by :func:`search_key`, kept in step by :meth:`_set_name_search`."""
     email: Mapped[str | None]
     phone: Mapped[str | None]
     address: Mapped[str | None]
@@ -76,10 +119,24 @@ class Organization(UUIDv7AuditBase):
     account: Mapped[Account] = relationship(back_populates="organizations", foreign_keys="Organization.account_id", viewonly=True, innerjoin=True)
 
     contacts: Mapped[list[Contact]] = relationship(back_populates="organization", cascade="all, delete")
+    contacts_count: Mapped[int | None] = query_expression()
+    """Number of contacts, when loaded with ``with_expression``."""
+
+    @validates("name")
+    def _set_name_search(self, key: str, name: str) -> str:
+        self.name_search = search_key(name)
+        return name
 
 
-class Contact(UUIDv7AuditBase):
+class Contact(SoftDeleteMixin, UUIDv7AuditBase):
     __tablename__ = "contact"
+    __table_args__ = (
+        live_index("ix_contact_account_id_created_at", "account_id", "created_at"),
+        live_index("ix_contact_account_id_updated_at", "account_id", "updated_at"),
+        live_index("ix_contact_account_id_last_name_first_name", "account_id", "last_name", "first_name"),
+        Index("ix_contact_organization_id", "organization_id"),
+        trash_index("ix_contact_deleted_at"),
+    )
 
     first_name: Mapped[str]
     last_name: Mapped[str]
@@ -100,3 +157,55 @@ class Contact(UUIDv7AuditBase):
     @hybrid_property
     def name(self) -> str:
         return f"{self.last_name} {self.first_name}"
+
+
+class AccountStat(DefaultBase):
+    """A running total of an account, kept current by the services as contacts and organizations are written.
+
+    ``metric`` names what is counted and ``bucket`` splits it, e.g. ``("contacts_by_country", "FR")``; the services in
+    ``app.services.stats`` define both and a reconcile job repairs any drift.
+    """
+
+    __tablename__ = "account_stat"
+    __table_args__ = (Index("ix_account_stat_account_id_metric_value", "account_id", "metric", "value"),)
+
+    account_id: Mapped[UUID] = mapped_column(ForeignKey("account.id", ondelete="cascade"), primary_key=True)
+    metric: Mapped[str] = mapped_column(String(length=50), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(length=255), primary_key=True, default="")
+    value: Mapped[int] = mapped_column(default=0, nullable=False)
+    organization_id: Mapped[UUID | None] = mapped_column(nullable=True, default=None)
+    """The organization a per-organization bucket stands for, to join its name."""
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(UUIDv7AuditBase):
+    """Background work, such as a report, persisted so that it survives restarts and its result can be served again.
+
+    ``key`` identifies what is computed, e.g. a report of an account with its parameters, and ``data_generation`` the
+    state of the account's data it was computed from; ``app.services.jobs`` runs the jobs.
+    """
+
+    __tablename__ = "job"
+    __table_args__ = (
+        Index("ix_job_key_data_generation", "key", "data_generation"),
+        Index("ix_job_status_created_at", "status", "created_at"),
+    )
+
+    kind: Mapped[str] = mapped_column(String(length=50))
+    key: Mapped[str] = mapped_column(String(length=64))
+    params: Mapped[dict[str, Any]] = mapped_column(JsonB, default=dict)
+    data_generation: Mapped[int] = mapped_column(default=0)
+    status: Mapped[JobStatus] = mapped_column(String(length=20), default=JobStatus.QUEUED)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JsonB, nullable=True, default=None)
+    error: Mapped[str | None] = mapped_column(default=None)
+    attempts: Mapped[int] = mapped_column(default=0)
+    started_at: Mapped[datetime | None] = mapped_column(DateTimeUTC(timezone=True), nullable=True, default=None)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTimeUTC(timezone=True), nullable=True, default=None)
+
+    account_id: Mapped[UUID] = mapped_column(ForeignKey("account.id", ondelete="cascade"), nullable=False)
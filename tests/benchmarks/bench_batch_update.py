@@ -0,0 +1,100 @@
+"""Benchmark batch contact updates against one service call per contact.
+
+``N`` contacts get a new city through ``ContactService.update`` calls committed together, as a loop over the single-row
+API would, then ``N`` other contacts get one through ``PATCH /api/contacts/batch`` requests of ``BATCH_MAX_SIZE`` items.
+
+The application runs against a throwaway SQLite database. Settings come from the environment as usual.
+
+Run with ``python -m tests.benchmarks.bench_batch_update [N]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+CONTACTS = 10_000
+EMAIL, PASSWORD = "batch@example.com", "batch-password"
+
+
+async def seed(size: int) -> list[UUID]:
+    """Create a user owning an account of ``size`` contacts; return the contact ids."""
+    from advanced_alchemy.base import orm_registry
+    from sqlalchemy import select
+
+    from app import config, services
+    from database import models as m
+
+    async with config.alchemy.get_engine().begin() as conn:
+        await conn.run_sync(orm_registry.metadata.create_all)
+    async with services.UserService.new(config=config.alchemy) as service:
+        user = await service.create({"email": EMAIL, "password": PASSWORD, "name": "Batch", "is_active": True})
+        organization = m.Organization(name="Batch Inc.")
+        account = m.Account(name="Batch", organizations=[organization])
+        service.repository.session.add(m.AccountMember(user_id=user.id, account=account, role=m.AccountRoles.ADMIN, is_owner=True))
+        await service.repository.session.flush()
+        columns = {"account_id": account.id, "organization_id": organization.id, "country": "FR", "region": None}
+        rows = [{**columns, "first_name": f"First {i}", "last_name": f"Last {i}"} for i in range(size)]
+        await services.ContactService(session=service.repository.session).bulk_insert(rows)
+        await service.repository.session.commit()
+        return list(await service.repository.session.scalars(select(m.Contact.id).order_by(m.Contact.id)))
+
+
+async def update_batches(app: object, ids: list[UUID], batch_size: int) -> float:
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver.local") as client:
+        await client.get("/login/", headers={"X-Inertia": "true"})
+        headers = {"X-Inertia": "true", "X-XSRF-TOKEN": client.cookies["XSRF-TOKEN"]}
+        await client.post("/login/", json={"username": EMAIL, "password": PASSWORD}, headers=headers)
+        headers["X-XSRF-TOKEN"] = client.cookies["XSRF-TOKEN"]
+        started = time.perf_counter()
+        for start in range(0, len(ids), batch_size):
+            items = [{"id": str(contact_id), "city": "Batch"} for contact_id in ids[start : start + batch_size]]
+            response = await client.patch("/api/contacts/batch", json={"items": items}, headers=headers)
+            response.raise_for_status()
+            assert not response.json().get("failed"), response.text
+        return time.perf_counter() - started
+
+
+async def update_singles(ids: list[UUID]) -> float:
+    from app import config, services
+
+    async with services.ContactService.new(config=config.alchemy) as service:
+        started = time.perf_counter()
+        for contact_id in ids:
+            await service.update({"city": "Single"}, item_id=contact_id)
+        await service.repository.session.commit()
+        return time.perf_counter() - started
+
+
+async def main(size: int) -> None:
+    from app.asgi import create_app
+    from config import get_settings
+
+    ids = await seed(2 * size)
+    singles = await update_singles(ids[size:])
+    batch_size = get_settings().app.BATCH_MAX_SIZE
+    app = create_app()
+    async with app.lifespan():  # disposes the engines on exit
+        batches = await update_batches(app, ids[:size], batch_size)
+    print(f"{size:,} updates as {-(-size // batch_size)} batch requests: {batches:.2f} s")  # noqa: T201
+    print(f"{size:,} updates as single service calls: {singles:.2f} s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(directory) / 'bench.sqlite3'}"
+        os.environ["SESSION_SQLITE_PATH"] = str(Path(directory) / "sessions.sqlite3")
+        os.environ.setdefault("VITE_USE_SERVER_LIFESPAN", "false")
+        os.environ.setdefault("VITE_DEV_MODE", "false")
+        asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else CONTACTS))
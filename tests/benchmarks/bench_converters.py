@@ -0,0 +1,84 @@
+"""Benchmark converting ORM rows to msgspec structs through the compiled converters and through the base service.
+
+One account is filled with ``N`` organizations and ten times as many contacts. A page of contacts with their organization,
+a single contact and every organization with its contact count are then converted by ``CountCachingService.to_schema``
+and by ``SQLAlchemyAsyncRepositoryService.to_schema``, whose ``msgspec.convert`` it replaces. Both must encode to the
+same JSON.
+
+The services run against a throwaway SQLite database. Settings come from the environment as usual.
+
+Run with ``python -m tests.benchmarks.bench_converters [N]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+ORGANIZATIONS = 2_500
+PAGE = 500
+NUMBER = 100
+
+
+def compare(name: str, new: Callable[[], Any], old: Callable[[], Any], number: int) -> None:
+    assert msgspec.json.encode(new()) == msgspec.json.encode(old()), name
+    new_time, old_time = (timeit.timeit(convert, number=number) / number for convert in (new, old))
+    print(f"{name:<40} old {old_time * 1e6:9.1f} us  new {new_time * 1e6:9.1f} us")  # noqa: T201
+
+
+async def main(size: int) -> None:
+    from advanced_alchemy.base import orm_registry
+
+    from app import config, schemas, services
+    from database import models as m
+
+    async with config.alchemy.get_engine().begin() as conn:
+        await conn.run_sync(orm_registry.metadata.create_all)
+    async with services.OrganizationService.new(config=config.alchemy) as organizations:
+        session = organizations.repository.session
+        account = m.Account(name="Converters")
+        session.add(account)
+        await session.flush()
+        await organizations.bulk_insert([{"name": f"Organization {i}", "account_id": account.id, "city": "Paris"} for i in range(size)])
+        organization_ids = list((await organizations.ids_by_name(account.id)).values())
+        contacts = services.ContactService(session=session)
+        columns = {"account_id": account.id, "email": "contact@example.com", "country": "FR", "region": None}
+        await contacts.bulk_insert([{**columns, "first_name": f"First {i}", "last_name": f"Last {i}", "organization_id": organization_ids[i % size]} for i in range(10 * size)])
+        await session.commit()
+        page = list(await session.scalars(select(m.Contact).options(joinedload(m.Contact.organization)).limit(PAGE)))
+        listed, _ = await organizations.list_with_counts(m.Organization.account_id == account.id)
+    await config.alchemy.get_engine().dispose()
+
+    base = SQLAlchemyAsyncRepositoryService
+    compare(
+        f"{len(page)} contacts with their organization",
+        lambda: contacts.to_schema(page, total=len(page), schema_type=schemas.Contact),
+        lambda: base.to_schema(contacts, page, total=len(page), schema_type=schemas.Contact),
+        NUMBER,
+    )
+    compare("one contact", lambda: contacts.to_schema(page[0], schema_type=schemas.Contact), lambda: base.to_schema(contacts, page[0], schema_type=schemas.Contact), 100 * NUMBER)
+    compare(
+        f"{len(listed)} organizations with contact counts",
+        lambda: organizations.to_schema(listed, schema_type=schemas.Organization),
+        lambda: base.to_schema(organizations, listed, schema_type=schemas.Organization),
+        NUMBER,
+    )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(directory) / 'bench.sqlite3'}"
+        asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else ORGANIZATIONS))
@@ -0,0 +1,112 @@
+"""Benchmark the dashboard's maintained statistics against the GROUP BY queries they replace, at growing account sizes.
+
+One account of ``ORGANIZATIONS`` organizations is filled with contacts spread over countries and regions. At each size
+the dashboard is read ``READS`` times, and the live per-country, per-region and per-organization counts are run a few
+times. Finally some contacts are moved, trashed and deleted through the bulk paths, and the account is reconciled; the
+number of totals it had to fix should be 0.
+
+The services run against a throwaway SQLite database. Settings come from the environment as usual.
+
+Run with ``python -m tests.benchmarks.bench_dashboard [N ...]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, select
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+SIZES = (1_000, 10_000, 100_000, 300_000)
+ORGANIZATIONS = 500
+READS = 30
+INSERT_BATCH = 10_000
+COUNTRIES = ("FR", "DE", "US", "GB", "ES", "IT")
+
+
+async def live_counts(session: AsyncSession, account_id: UUID) -> None:
+    """The per-country, per-region and per-organization counts, computed from the contacts."""
+    from database import models as m
+
+    live = (m.Contact.account_id == account_id, m.Contact.deleted_at.is_(None))
+    for column in (m.Contact.country, m.Contact.region, m.Contact.organization_id):
+        await session.execute(select(column, func.count()).where(*live).group_by(column))
+
+
+async def main(sizes: tuple[int, ...]) -> None:
+    from advanced_alchemy.base import orm_registry
+
+    from app import config, services
+    from database import models as m
+
+    async with config.alchemy.get_engine().begin() as conn:
+        await conn.run_sync(orm_registry.metadata.create_all)
+    async with services.OrganizationService.new(config=config.alchemy) as organizations:
+        session = organizations.session
+        account = m.Account(name="Dashboard")
+        session.add(account)
+        await session.flush()
+        account_id = account.id
+        await organizations.bulk_insert([{"name": f"Organization {i}", "account_id": account_id} for i in range(ORGANIZATIONS)])
+        organization_ids = list((await organizations.ids_by_name(account_id)).values())
+        contacts = services.ContactService(session=session)
+        stats = services.AccountStatService(session=session)
+        await session.commit()
+        total = 0
+        for size in sizes:
+            while total < size:
+                count = min(INSERT_BATCH, size - total)
+                rows = [
+                    {
+                        "first_name": "First",
+                        "last_name": "Last",
+                        "account_id": account_id,
+                        "organization_id": random.choice(organization_ids),  # noqa: S311
+                        "country": random.choice(COUNTRIES),  # noqa: S311
+                        "region": f"Region {random.randrange(200)}",  # noqa: S311
+                    }
+                    for _ in range(count)
+                ]
+                await contacts.bulk_insert(rows)
+                await session.commit()
+                total += count
+            reads = []
+            for _ in range(READS):
+                started = time.perf_counter()
+                await stats.dashboard(account_id)
+                reads.append(time.perf_counter() - started)
+            counts = []
+            for _ in range(3):
+                started = time.perf_counter()
+                await live_counts(session, account_id)
+                counts.append(time.perf_counter() - started)
+            await session.commit()
+            print(f"{total:>9,} contacts: dashboard {statistics.median(reads) * 1000:6.1f} ms  live GROUP BYs {statistics.median(counts) * 1000:7.1f} ms")  # noqa: T201
+
+        contact_ids = list(await session.scalars(select(m.Contact.id).where(m.Contact.account_id == account_id).limit(300)))
+        moves = {contact_id: {"organization_id": random.choice(organization_ids), "country": "NL"} for contact_id in contact_ids[:100]}  # noqa: S311
+        await contacts.update_batch(moves, m.Contact.account_id == account_id)
+        await contacts.trash_batch(contact_ids[100:200], m.Contact.account_id == account_id)
+        await contacts.delete_batch(contact_ids[200:], m.Contact.account_id == account_id)
+        await session.commit()
+        print(f"reconcile fixed {await stats.reconcile(account_id)} drifted total(s)")  # noqa: T201
+        await session.commit()
+    await config.alchemy.get_engine().dispose()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(directory) / 'bench.sqlite3'}"
+        asyncio.run(main(tuple(int(arg) for arg in sys.argv[1:]) or SIZES))
@@ -0,0 +1,80 @@
+"""Benchmark login latency under a storm of concurrent sign-ins.
+
+``N`` clients each fetch the login page for a CSRF token, then all post their credentials at once. Logins rejected by
+the hashing pool (``503``) are counted apart, as their latency only measures how fast the pool turns work away.
+
+The application runs against a throwaway SQLite database. Settings come from the environment as usual, e.g.
+``PASSWORD_HASH_WORKERS`` and ``PASSWORD_HASH_MAX_QUEUE``.
+
+Run with ``python -m tests.benchmarks.bench_login [N]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+CONCURRENCY = 200
+EMAIL, PASSWORD = "storm@example.com", "storm-password"
+
+
+async def seed() -> None:
+    from advanced_alchemy.base import orm_registry
+
+    from app import config, services
+
+    async with config.alchemy.get_engine().begin() as conn:
+        await conn.run_sync(orm_registry.metadata.create_all)
+    async with services.UserService.new(config=config.alchemy) as service:
+        await service.create({"email": EMAIL, "password": PASSWORD, "name": "Storm", "is_active": True}, auto_commit=True)
+
+
+async def login(app: object, barrier: asyncio.Barrier) -> tuple[int, float]:
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver.local") as client:
+        await client.get("/login/", headers={"X-Inertia": "true"})
+        headers = {"X-Inertia": "true", "X-XSRF-TOKEN": client.cookies["XSRF-TOKEN"]}
+        await barrier.wait()
+        started = time.perf_counter()
+        response = await client.post("/login/", json={"username": EMAIL, "password": PASSWORD}, headers=headers)
+        return response.status_code, time.perf_counter() - started
+
+
+async def main(concurrency: int) -> None:
+    from app.asgi import create_app
+    from config import crypt
+
+    await seed()
+    app = create_app()
+    async with app.lifespan():
+        barrier = asyncio.Barrier(concurrency)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(login(app, barrier) for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+        pool = crypt.get_hashing_pool()  # the app shuts its pool down on exit
+    accepted = sorted(latency for status, latency in results if status < 400)
+    rejected = [status for status, _ in results if status >= 400]
+    print(f"{concurrency} logins, {pool.workers} hashing workers, queue {pool.max_queue}, {wall:.2f} s")  # noqa: T201
+    if len(accepted) > 1:
+        quantiles = statistics.quantiles(accepted, n=100)
+        print(  # noqa: T201
+            f"accepted {len(accepted)}: p50 {quantiles[49] * 1000:.0f} ms  p95 {quantiles[94] * 1000:.0f} ms  p99 {quantiles[98] * 1000:.0f} ms  max {accepted[-1] * 1000:.0f} ms",
+        )
+    print(f"rejected {len(rejected)}: {sorted(set(rejected))}")  # noqa: T201
+    print(f"hashing {pool.stats.to_dict() if pool.stats.completed else {}}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(directory) / 'bench.sqlite3'}"
+        os.environ["SESSION_SQLITE_PATH"] = str(Path(directory) / "sessions.sqlite3")
+        os.environ.setdefault("VITE_USE_SERVER_LIFESPAN", "false")
+        os.environ.setdefault("VITE_DEV_MODE", "false")
+        asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else CONCURRENCY))
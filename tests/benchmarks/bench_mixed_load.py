@@ -0,0 +1,117 @@
+"""Benchmark reads and writes running together against one SQLite database.
+
+An account of ``CONTACTS`` contacts is seeded, then for ``SECONDS`` seconds ``READERS`` clients page and search through
+``GET /contacts/`` while ``WRITERS`` clients update 10 random contacts at a time through ``PATCH /api/contacts/batch``.
+Requests that fail, e.g. with ``database is locked``, are counted by status code.
+
+The application runs in this process against a throwaway SQLite database, with the stats reconciler and the job workers
+turned off. Settings come from the environment as usual.
+
+Run with ``python -m tests.benchmarks.bench_mixed_load [READERS WRITERS]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from uuid import UUID
+
+READERS, WRITERS = 16, 4
+SECONDS = 10.0
+CONTACTS, ORGANIZATIONS = 20_000, 200
+EMAIL, PASSWORD = "mixed@example.com", "mixed-password"
+SEARCHES = ("First 1", "Last 2", "Paris", "Organization 3", "")
+CITIES = ("Paris", "Berlin", "Rome")
+
+
+async def seed() -> list[UUID]:
+    """Create a user owning an account of ``CONTACTS`` contacts; return the contact ids."""
+    from advanced_alchemy.base import orm_registry
+    from sqlalchemy import select
+
+    from app import config, services
+    from database import models as m
+
+    async with config.alchemy.get_engine().begin() as conn:
+        await conn.run_sync(orm_registry.metadata.create_all)
+    async with services.UserService.new(config=config.alchemy) as service:
+        session = service.repository.session
+        user = await service.create({"email": EMAIL, "password": PASSWORD, "name": "Mixed", "is_active": True})
+        account = m.Account(name="Mixed")
+        session.add(m.AccountMember(user_id=user.id, account=account, role=m.AccountRoles.ADMIN, is_owner=True))
+        await session.flush()
+        organizations = services.OrganizationService(session=session)
+        await organizations.bulk_insert([{"name": f"Organization {i}", "account_id": account.id} for i in range(ORGANIZATIONS)])
+        organization_ids = list((await organizations.ids_by_name(account.id)).values())
+        columns = {"account_id": account.id, "country": "FR", "region": None}
+        rows = [
+            {**columns, "first_name": f"First {i}", "last_name": f"Last {i}", "organization_id": organization_ids[i % ORGANIZATIONS], "city": CITIES[i % len(CITIES)]}
+            for i in range(CONTACTS)
+        ]
+        await services.ContactService(session=session).bulk_insert(rows)
+        await session.commit()
+        return list(await session.scalars(select(m.Contact.id).limit(2_000)))
+
+
+async def main(readers: int, writers: int) -> None:
+    from app.asgi import create_app
+
+    contact_ids = [str(contact_id) for contact_id in await seed()]
+    app = create_app()
+    latencies: dict[str, list[float]] = {"reads": [], "writes": []}
+    errors: Counter[int] = Counter()
+    async with app.lifespan(), httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver.local") as client:  # type: ignore[arg-type]
+        await client.get("/login/", headers={"X-Inertia": "true"})
+        await client.post("/login/", json={"username": EMAIL, "password": PASSWORD}, headers={"X-Inertia": "true", "X-XSRF-TOKEN": client.cookies["XSRF-TOKEN"]})
+        headers = {"X-XSRF-TOKEN": client.cookies["XSRF-TOKEN"]}
+        stop = time.perf_counter() + SECONDS
+
+        async def timed(kind: str, request: Awaitable[httpx.Response]) -> None:
+            started = time.perf_counter()
+            response = await request
+            latencies[kind].append(time.perf_counter() - started)
+            if response.status_code != httpx.codes.OK:
+                errors[response.status_code] += 1
+
+        async def reader() -> None:
+            while time.perf_counter() < stop:
+                params: dict[str, str | int] = {"search": random.choice(SEARCHES), "page": random.randint(1, 20)}  # noqa: S311
+                await timed("reads", client.get("/contacts/", params=params, headers={"X-Inertia": "true"}))
+
+        async def writer() -> None:
+            while time.perf_counter() < stop:
+                items = [{"id": contact_id, "city": random.choice(("Oslo", "Lima", "Kyiv"))} for contact_id in random.sample(contact_ids, 10)]  # noqa: S311
+                await timed("writes", client.patch("/api/contacts/batch", json={"items": items}, headers=headers))
+
+        await asyncio.gather(*(reader() for _ in range(readers)), *(writer() for _ in range(writers)))
+    print(f"{readers} readers, {writers} writers, {SECONDS:.0f} s")  # noqa: T201
+    for kind, values in latencies.items():
+        if values:
+            values.sort()
+            p50, p99 = values[len(values) // 2], values[int(len(values) * 0.99)]
+            print(f"{kind:<6} {len(values) / SECONDS:6.1f}/s  p50 {p50 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms")  # noqa: T201
+    print(f"errors {dict(errors)}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(directory) / 'bench.sqlite3'}"
+        os.environ["SESSION_SQLITE_PATH"] = str(Path(directory) / "sessions.sqlite3")
+        os.environ["STATS_RECONCILE_INTERVAL"] = "0"
+        os.environ["JOB_WORKERS"] = "0"
+        os.environ.setdefault("VITE_USE_SERVER_LIFESPAN", "false")
+        os.environ.setdefault("VITE_DEV_MODE", "false")
+        readers, writers = (int(sys.argv[1]), int(sys.argv[2])) if len(sys.argv) > 2 else (READERS, WRITERS)
+        asyncio.run(main(readers, writers))
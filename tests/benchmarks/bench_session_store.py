@@ -0,0 +1,110 @@
+"""Benchmark the SQLite session store against litestar's ``FileStore`` at growing session counts.
+
+Each store is pre-filled with ``N`` sessions, a tenth of them already expired, then measured on random reads, writes
+from concurrent requests and one expiry sweep. Pre-filling bypasses the stores' APIs so large sizes stay quick to set up.
+
+Run with ``python -m tests.benchmarks.bench_session_store [N ...]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from litestar.stores.base import StorageObject
+from litestar.stores.file import FileStore
+
+from app.lib.stores import SQLiteStore
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+SIZES = (10_000, 100_000, 1_000_000)
+VALUE = os.urandom(300)
+"""About the size of a serialized session holding a user id, CSRF state and flash messages."""
+OPERATIONS = 5_000
+CONCURRENCY = 32
+
+
+def key(index: int) -> str:
+    return f"session-{index:08d}"
+
+
+def prefill_file(path: Path, size: int) -> None:
+    now = datetime.now(tz=UTC)
+    path.mkdir(parents=True, exist_ok=True)
+    for index in range(size):
+        expires_at = now - timedelta(minutes=1) if index % 10 == 0 else now + timedelta(hours=1)
+        (path / key(index)).write_bytes(StorageObject(expires_at=expires_at, data=VALUE).to_bytes())
+
+
+async def prefill_sqlite(store: SQLiteStore, size: int) -> None:
+    await store.set("warmup", b"")
+    now = time.time()
+    conn = sqlite3.connect(store.path, isolation_level=None)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO kv_store (namespace, key, value, expires_at) VALUES ('', ?, ?, ?)",
+        ((key(index), VALUE, now - 60 if index % 10 == 0 else now + 3600) for index in range(size)),
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+async def timed(operation: Callable[[int], Awaitable[object]], size: int) -> tuple[float, list[float]]:
+    """Run ``OPERATIONS`` calls on random keys from ``CONCURRENCY`` tasks; return the wall time and each latency."""
+    latencies: list[float] = []
+    remaining = iter(range(OPERATIONS))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            await operation(random.randrange(size))  # noqa: S311
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return time.perf_counter() - started, latencies
+
+
+def report(name: str, size: int, operation: str, wall: float, latencies: list[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(  # noqa: T201
+        f"{name:<7} {size:>9,} {operation:<6} {len(latencies) / wall:>9,.0f} ops/s  p50 {quantiles[49] * 1000:7.2f} ms  p99 {quantiles[98] * 1000:7.2f} ms",
+    )
+
+
+async def measure(name: str, store: FileStore | SQLiteStore, size: int) -> None:
+    wall, latencies = await timed(lambda index: store.get(key(index)), size)
+    report(name, size, "get", wall, latencies)
+    wall, latencies = await timed(lambda index: store.set(key(index), VALUE, expires_in=3600), size)
+    report(name, size, "set", wall, latencies)
+    started = time.perf_counter()
+    await store.delete_expired()
+    print(f"{name:<7} {size:>9,} sweep  {time.perf_counter() - started:>9.2f} s")  # noqa: T201
+
+
+async def main(sizes: tuple[int, ...]) -> None:
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            file_store = FileStore(Path(directory) / "files")
+            await asyncio.to_thread(prefill_file, Path(directory) / "files", size)
+            await measure("file", file_store, size)
+        with tempfile.TemporaryDirectory() as directory:
+            sqlite_store = SQLiteStore(Path(directory) / "sessions.sqlite3", sweep_interval=0)
+            async with sqlite_store:
+                await prefill_sqlite(sqlite_store, size)
+                await measure("sqlite", sqlite_store, size)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(tuple(int(arg) for arg in sys.argv[1:]) or SIZES))
@@ -0,0 +1,123 @@
+"""Benchmark the organization typeahead on a large account.
+
+One account gets ``N`` organizations named from random words. Prefixes of 1 to 3 characters taken from those names are
+then looked up through ``OrganizationService.names_starting_with``, through the same query matching ``name ILIKE 'q%'``
+instead, and through ``GET /api/organizations/typeahead``, which includes the session, auth and response cache layers.
+
+The application runs against a throwaway SQLite database. Settings come from the environment as usual.
+
+Run with ``python -m tests.benchmarks.bench_typeahead [N]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+from sqlalchemy import select
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from uuid import UUID
+
+ORGANIZATIONS = 100_000
+PREFIXES = 300
+LIMIT = 10
+EMAIL, PASSWORD = "typeahead@example.com", "typeahead-password"
+
+
+async def seed(size: int, rng: random.Random) -> tuple[UUID, list[str]]:
+    """Create a user owning an account of ``size`` organizations; return the account id and the organization names."""
+    from advanced_alchemy.base import orm_registry
+
+    from app import config, services
+    from database import models as m
+
+    async with config.alchemy.get_engine().begin() as conn:
+        await conn.run_sync(orm_registry.metadata.create_all)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))).capitalize() for _ in range(5_000)]
+    names = [f"{rng.choice(words)} {rng.choice(words)} {i}" for i in range(size)]
+    async with services.UserService.new(config=config.alchemy) as service:
+        user = await service.create({"email": EMAIL, "password": PASSWORD, "name": "Typeahead", "is_active": True})
+        account = m.Account(name="Typeahead")
+        service.repository.session.add(m.AccountMember(user_id=user.id, account=account, role=m.AccountRoles.ADMIN, is_owner=True))
+        await service.repository.session.flush()
+        await services.OrganizationService(session=service.repository.session).bulk_insert([{"name": name, "account_id": account.id} for name in names])
+        await service.repository.session.commit()
+        return account.id, names
+
+
+async def timed(lookup: Callable[[str], Awaitable[object]], prefixes: list[str]) -> list[float]:
+    latencies = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        await lookup(prefix)
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def report(name: str, latencies: list[float]) -> None:
+    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+    print(f"{name:<8} p50 {p50 * 1000:6.2f} ms  p99 {p99 * 1000:6.2f} ms  max {latencies[-1] * 1000:6.2f} ms")  # noqa: T201
+
+
+async def query(account_id: UUID, prefixes: list[str]) -> None:
+    from app import config, services
+    from database import models as m
+
+    o = m.Organization
+    async with services.OrganizationService.new(config=config.alchemy) as service:
+        session = service.repository.session
+        report("service", await timed(lambda prefix: service.names_starting_with(account_id, prefix.lower(), LIMIT), prefixes))
+
+        def ilike(prefix: str) -> Awaitable[object]:
+            live = (o.account_id == account_id, o.deleted_at.is_(None))
+            return session.execute(select(o.id, o.name).where(*live, o.name.ilike(f"{prefix}%")).order_by(o.name).limit(LIMIT))
+
+        report("ilike", await timed(ilike, prefixes))
+
+
+async def http(app: object, account_id: UUID, prefixes: list[str]) -> None:
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver.local") as client:
+        await client.get("/login/", headers={"X-Inertia": "true"})
+        headers = {"X-Inertia": "true", "X-XSRF-TOKEN": client.cookies["XSRF-TOKEN"]}
+        await client.post("/login/", json={"username": EMAIL, "password": PASSWORD}, headers=headers)
+
+        async def suggest(prefix: str) -> None:
+            response = await client.get("/api/organizations/typeahead", params={"accountId": str(account_id), "q": prefix, "limit": LIMIT})
+            response.raise_for_status()
+
+        report("http", await timed(suggest, prefixes))
+
+
+async def main(size: int) -> None:
+    from app.asgi import create_app
+
+    rng = random.Random(1)  # noqa: S311
+    account_id, names = await seed(size, rng)
+    # distinct prefixes, so the response cache never answers
+    prefixes = sorted({name[:length] for name in rng.sample(names, min(PREFIXES, size)) for length in (1, 2, 3)})
+    rng.shuffle(prefixes)
+    print(f"{size:,} organizations, {len(prefixes)} prefixes")  # noqa: T201
+    await query(account_id, prefixes)
+    app = create_app()
+    async with app.lifespan():  # disposes the engines on exit
+        await http(app, account_id, prefixes)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(directory) / 'bench.sqlite3'}"
+        os.environ["SESSION_SQLITE_PATH"] = str(Path(directory) / "sessions.sqlite3")
+        os.environ.setdefault("VITE_USE_SERVER_LIFESPAN", "false")
+        os.environ.setdefault("VITE_DEV_MODE", "false")
+        asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else ORGANIZATIONS))
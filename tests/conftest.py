@@ -0,0 +1,45 @@
+"""Fixtures running the application's services against a throwaway SQLite database."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from config import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+STATE_DIR = Path(tempfile.mkdtemp(prefix="pingcrm-tests-"))
+os.environ["VITE_USE_SERVER_LIFESPAN"] = "false"
+os.environ["VITE_DEV_MODE"] = "false"
+settings = get_settings()
+# set after loading, so a developer's ``.env`` cannot point the tests at a real database
+settings.db.URL = f"sqlite+aiosqlite:///{STATE_DIR / 'test.sqlite3'}"
+settings.db.REPLICA_URLS = []
+settings.session.SQLITE_PATH = str(STATE_DIR / "sessions.sqlite3")
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def engine() -> AsyncIterator[AsyncEngine]:
+    """The primary engine, with every table created from the models."""
+    from advanced_alchemy.base import orm_registry
+
+    from app import config
+
+    engine = config.alchemy.get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(orm_registry.metadata.create_all)
+    yield engine
+    await settings.db.dispose_engines()
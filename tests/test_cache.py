@@ -0,0 +1,51 @@
+"""Entries dropped by their index key must be exactly those indexed under it, whatever else removed entries before."""
+
+from __future__ import annotations
+
+from app.lib.cache import TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def owner_of(value: str) -> str:
+    return value.split(":", 1)[0]
+
+
+def test_discard_indexed_drops_every_key_of_the_index_key() -> None:
+    cache: TTLCache[str, str] = TTLCache(maxsize=10, ttl=60, index=owner_of)
+    cache.set("old@example.com", "alice:1")
+    cache.set("new@example.com", "alice:2")
+    cache.set("bob@example.com", "bob:1")
+    assert cache.discard_indexed("alice") == 2
+    assert cache.discard_indexed("alice") == 0
+    assert "bob@example.com" in cache
+    assert len(cache) == 1
+    assert cache.stats.invalidations == 2
+
+
+def test_overwritten_entries_move_to_their_new_index_key() -> None:
+    cache: TTLCache[str, str] = TTLCache(maxsize=10, ttl=60, index=owner_of)
+    cache.set("shared@example.com", "alice:1")
+    cache.set("shared@example.com", "bob:1")
+    assert cache.discard_indexed("alice") == 0
+    assert cache.discard_indexed("bob") == 1
+
+
+def test_evicted_and_expired_entries_leave_the_index() -> None:
+    clock = Clock()
+    cache: TTLCache[str, str] = TTLCache(maxsize=2, ttl=60, clock=clock, index=owner_of)
+    cache.set("a", "alice:1")
+    cache.set("b", "bob:1")
+    cache.set("c", "carol:1")
+    assert cache.discard_indexed("alice") == 0
+    clock.now = 61
+    assert cache.get("b") is None
+    assert cache.discard_indexed("bob") == 0
+    assert cache.discard_indexed("carol") == 1
+    assert len(cache) == 0
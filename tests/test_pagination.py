@@ -0,0 +1,48 @@
+"""Cursors come from clients, so anything but a cursor this app encoded must be rejected as a bad request."""
+
+from __future__ import annotations
+
+import base64
+from datetime import UTC, datetime
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from litestar.exceptions import ValidationException
+from litestar.serialization import encode_json
+
+from app.lib.pagination import decode_cursor, encode_cursor
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=UTC)
+
+
+def forge(payload: Any) -> str:
+    return base64.urlsafe_b64encode(encode_json(payload)).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    ("order_by", "values"),
+    [pytest.param("created_at", [uuid4()], id="created_at"), pytest.param("updated_at", [NOW, uuid4()], id="updated_at")],
+)
+def test_cursor_round_trips(order_by: Any, values: list[Any]) -> None:
+    assert decode_cursor(encode_cursor(order_by, "desc", "next", values)) == (order_by, "desc", "next", tuple(values))
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        pytest.param(forge({"o": "updated_at", "s": "desc", "d": "next", "v": [NOW.isoformat(), NOW.isoformat(), uuid4().hex]}), id="updated_at-3-values"),
+        pytest.param(forge({"o": "updated_at", "s": "desc", "d": "next", "v": [uuid4().hex]}), id="updated_at-1-value"),
+        pytest.param(forge({"o": "created_at", "s": "desc", "d": "next", "v": [NOW.isoformat(), uuid4().hex]}), id="created_at-2-values"),
+        pytest.param(forge({"o": "created_at", "s": "desc", "d": "next", "v": []}), id="no-values"),
+        pytest.param(forge({"o": "created_at", "s": "desc", "d": "next", "v": uuid4().hex}), id="values-not-a-list"),
+        pytest.param(forge({"o": "name", "s": "desc", "d": "next", "v": [uuid4().hex]}), id="unknown-field"),
+        pytest.param(forge({"o": "created_at", "s": "desc", "d": "next", "v": ["not a uuid"]}), id="bad-id"),
+        pytest.param(forge({"o": "updated_at", "s": "desc", "d": "next"}), id="missing-values"),
+        pytest.param("not base64!", id="not-base64"),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(ValidationException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
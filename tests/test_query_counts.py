@@ -0,0 +1,91 @@
+"""List and detail queries must issue a fixed number of statements, whatever the page size.
+
+A lazy load slipping into a listing shows up here as one more statement per row.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from advanced_alchemy.filters import LimitOffset
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import deps, schemas, services
+from app.lib.queries import StatementCounter
+from database import models as m
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+pytestmark = pytest.mark.anyio
+
+ROWS = 50
+
+
+@pytest.fixture(scope="module")
+async def seeded(engine: AsyncEngine) -> dict[str, UUID]:
+    """An account with ``ROWS`` contacts spread over a fifth as many organizations."""
+    async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+        # ``Contact.account`` and ``Contact.organization`` are view-only, so rows are attached from the owning side
+        organizations = [m.Organization(name=f"Organization {i}") for i in range(ROWS // 5)]
+        contacts = [m.Contact(first_name=f"First {i}", last_name=f"Last {i}") for i in range(ROWS)]
+        for i, contact in enumerate(contacts):
+            organizations[i % len(organizations)].contacts.append(contact)
+        account = m.Account(name="query counts", organizations=organizations, contacts=contacts)
+        session.add(account)
+        await session.commit()
+        return {"account": account.id, "contact": contacts[0].id, "organization": organizations[0].id}
+
+
+@pytest.fixture
+async def session(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    """A session starting from an empty identity map, as a request does, with its transaction already begun."""
+    async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+        await session.connection()
+        yield session
+
+
+async def list_contacts(session: AsyncSession, ids: dict[str, UUID], limit: int) -> object:
+    service = services.ContactService(session=session)
+    results, total = await service.list_with_organization(m.Contact.account_id == ids["account"], deps.TrashedFilter(), LimitOffset(limit, 0))
+    return service.to_schema(results, total, schema_type=schemas.Contact)
+
+
+async def list_organizations(session: AsyncSession, ids: dict[str, UUID], limit: int) -> object:
+    service = services.OrganizationService(session=session)
+    results, total = await service.list_with_counts(m.Organization.account_id == ids["account"], deps.TrashedFilter(), LimitOffset(limit, 0))
+    return service.to_schema(results, total, schema_type=schemas.Organization)
+
+
+async def get_contact(session: AsyncSession, ids: dict[str, UUID], _: int) -> object:
+    service = services.ContactService(session=session)
+    return service.to_schema(await service.get_with_organization(m.Contact.id == ids["contact"]), schema_type=schemas.Contact)
+
+
+async def get_organization(session: AsyncSession, ids: dict[str, UUID], _: int) -> object:
+    service = services.OrganizationService(session=session)
+    return service.to_schema(await service.get_with_contacts(m.Organization.id == ids["organization"]), schema_type=schemas.OrganizationDetail)
+
+
+async def dashboard(session: AsyncSession, ids: dict[str, UUID], _: int) -> object:
+    return await services.AccountStatService(session=session).dashboard(ids["account"])
+
+
+@pytest.mark.parametrize(
+    ("check", "budget", "limit"),
+    [
+        *(pytest.param(list_contacts, 1, limit, id=f"list-contacts-{limit}") for limit in (1, 10, ROWS)),
+        *(pytest.param(list_organizations, 1, limit, id=f"list-organizations-{limit}") for limit in (1, 10, ROWS)),
+        pytest.param(get_contact, 1, 1, id="get-contact"),
+        pytest.param(get_organization, 2, 1, id="get-organization"),
+        pytest.param(dashboard, 1, 1, id="dashboard"),
+    ],
+)
+async def test_statement_budget(engine: AsyncEngine, session: AsyncSession, seeded: dict[str, UUID], check: Any, budget: int, limit: int) -> None:
+    with StatementCounter(engine) as counter:
+        await check(session, seeded, limit)
+    assert counter.count == budget, counter.statements
@@ -0,0 +1,41 @@
+"""Upgraded password hashes must survive a failed write of their batch."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.services.users import PasswordRehashQueue
+from database import models as m
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_flush_keeps_the_batch(engine: AsyncEngine, tmp_path: Path) -> None:
+    verified, upgraded = "verified-hash", "upgraded-hash"
+    async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+        user = m.User(email="rehash@example.com", name="Rehash", hashed_password=verified)
+        session.add(user)
+        await session.commit()
+    queue = PasswordRehashQueue(batch_size=10, interval=60)
+    queue.submit(user.id, verified, upgraded)
+    # a database the queue cannot open
+    queue._engine = unreachable = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db.sqlite3'}")
+    with pytest.raises(SQLAlchemyError):
+        await queue.flush()
+    await unreachable.dispose()
+    assert len(queue) == 1
+
+    queue._engine = engine
+    assert await queue.flush() == 1
+    async with AsyncSession(bind=engine) as session:
+        assert await session.scalar(select(m.User.hashed_password).where(m.User.id == user.id)) == upgraded
@@ -0,0 +1,44 @@
+"""Every ``orderBy`` a list endpoint accepts must be served by an index, never by sorting rows."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Literal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app import deps, services
+from app.lib.plans import explain_query_plan, needs_sort
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+pytestmark = pytest.mark.anyio
+
+SORTS = [
+    pytest.param(service_type, name, columns, sort_order, id=f"{service_type.repository_type.model_type.__tablename__}-{name}-{sort_order}")
+    for service_type in (services.UserService, services.ContactService, services.OrganizationService)
+    for name, columns in service_type.sortable_fields.items()
+    for sort_order in ("asc", "desc")
+]
+
+
+@pytest.mark.parametrize(("service_type", "name", "columns", "sort_order"), SORTS)
+async def test_sort_is_index_backed(engine: AsyncEngine, service_type: Any, name: str, columns: tuple[str, ...], sort_order: Literal["asc", "desc"]) -> None:
+    model = service_type.repository_type.model_type
+    # listings hide the trash by default, which is what the partial indexes cover
+    statement = deps.TrashedFilter().append_to_statement(select(model), model)
+    if hasattr(model, "account_id"):
+        statement = statement.where(model.account_id == uuid4())
+    order_by = deps.OrderByColumns(field_name=name, sort_order=sort_order, columns=columns)
+    async with engine.connect() as conn:
+        plan = await explain_query_plan(conn, order_by.append_to_statement(statement, model).limit(10))
+    assert not needs_sort(plan), plan
+
+
+async def test_organization_typeahead_is_index_backed(engine: AsyncEngine) -> None:
+    statement = services.OrganizationService.typeahead_statement(uuid4(), "acme", 10)
+    async with engine.connect() as conn:
+        plan = await explain_query_plan(conn, statement)
+    assert not needs_sort(plan), plan
@@ -0,0 +1,51 @@
+"""The organization typeahead must match name prefixes ignoring case in any script, however the rows were written."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import services
+from database import models as m
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(scope="module")
+async def account_id(engine: AsyncEngine) -> UUID:
+    """An account with organizations created through the ORM, a bulk insert and a batch rename."""
+    async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+        organizations = [m.Organization(name=name) for name in ("Ärzte Zentrum", "arzt Praxis", "Straße AG", "Ωmega")]
+        account = m.Account(name="typeahead", organizations=organizations)
+        session.add(account)
+        await session.commit()
+        service = services.OrganizationService(session=session)
+        await service.bulk_insert([{"name": "ÄRZTEKAMMER", "account_id": account.id}])
+        await service.update_batch({organizations[1].id: {"name": "Strassenbau"}}, m.Organization.account_id == account.id)
+        await session.commit()
+        return account.id
+
+
+# matches come in code point order of the folded names
+@pytest.mark.parametrize(
+    ("prefix", "names"),
+    [
+        pytest.param("ärz", ["Ärzte Zentrum", "ÄRZTEKAMMER"], id="umlaut"),
+        pytest.param("ÄRZTE Z", ["Ärzte Zentrum"], id="upper-umlaut"),
+        pytest.param("arz", [], id="no-accent-folding"),
+        pytest.param("STRAß", ["Straße AG", "Strassenbau"], id="sharp-s"),
+        pytest.param("ω", ["Ωmega"], id="greek"),
+        pytest.param("", ["Straße AG", "Strassenbau", "Ärzte Zentrum", "ÄRZTEKAMMER", "Ωmega"], id="empty"),
+    ],
+)
+async def test_typeahead_folds_case(engine: AsyncEngine, account_id: UUID, prefix: str, names: list[str]) -> None:
+    async with AsyncSession(bind=engine) as session:
+        found = await services.OrganizationService(session=session).names_starting_with(account_id, prefix, 10)
+    assert [name for _, name in found] == names